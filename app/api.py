@@ -4,68 +4,803 @@
 Business logic layer for the Phone Book application.
 """
 
-from difflib import get_close_matches
-from app.models import Contact
-from app.repository import ContactRepository
+import functools
+import heapq
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from itertools import islice
+from app.cache import QueryCache
+from app.dedupe import (
+    NAME_THRESHOLD,
+    DuplicateGroup,
+    MergeReport,
+    find_duplicates,
+    merged_fields,
+)
+from app.indexes import FieldIndex, FuzzyIndex, PhoneIndex
+from app.models import Contact, check_updates
+from app.repository import (
+    ChangeSet,
+    ConflictError,
+    ContactRepository,
+    ExternalChanges,
+    IncrementalRepository,
+    SharedRepository,
+)
 from app.logger import logger
+from app.metrics import measure, timed
+from app.query import Predicate, parse_query, scan
+from app.utils import is_valid_phone, normalize_phone, normalize_text
+
+INDEXED_FIELDS = ("last_name", "city", "job")
+SORTABLE_FIELDS = ("first_name", "last_name", "city", "job", "created_at")
+# Contact fields the secondary indexes are built from.
+INDEX_SOURCES = frozenset((*INDEXED_FIELDS, "phones"))
+# Cached search kinds and the contact fields their results depend on.
+CACHED_SEARCHES = {"last_name": "last_name", "phone": "phones"}
+
+IMPORT_BATCH_SIZE = 5000
+
+
+@dataclass
+class ImportReport:
+    """
+    Outcome of a bulk import.
+
+    Attributes:
+        added: Number of contacts added.
+        errors: (row number, reason) for every rejected row, rows counted from 1.
+    """
+
+    added: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+
+def _ordered(
+    contacts: Iterable[Contact],
+    sort_by: str | None,
+    reverse: bool = False,
+    stop: int | None = None,
+) -> Iterable[Contact]:
+    """
+    Contacts sorted case-insensitively by sort_by (one of SORTABLE_FIELDS),
+    keeping only the first stop in a heap. Without sort_by they are
+    returned as they are.
+    """
+    if sort_by is None:
+        return contacts
+    if sort_by not in SORTABLE_FIELDS:
+        raise ValueError(f"Cannot sort by {sort_by!r}")
+
+    def key(contact: Contact) -> str:
+        return (getattr(contact, sort_by) or "").lower()
+
+    if stop is None:
+        return sorted(contacts, key=key, reverse=reverse)
+    pick = heapq.nlargest if reverse else heapq.nsmallest
+    return pick(stop, contacts, key=key)
+
+
+def synchronized(method):
+    """Run a PhoneBook method under its lock (needed by write-behind flushing)."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def mutation(method):
+    """
+    Run a PhoneBook mutation under its lock. Unless persistence is deferred,
+    a shared repository's inter-process lock is held as well and changes made
+    by other processes are applied first, so no update is lost.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            if self._deferring() or not self._shared:
+                return method(self, *args, **kwargs)
+
+            with self.repository.lock():
+                self._apply_external(self.repository.changes())
+                return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _state(contact: Contact | None) -> dict | None:
+    """Comparable copy of a contact's persisted fields."""
+    if contact is None:
+        return None
+    return dict(contact.to_dict(), phones=dict(contact.phones))
 
 
 class PhoneBook:
     """
     Core business logic for managing contacts.
+
+    Contacts are kept in an id -> Contact mapping together with secondary
+    indexes on last name, city, job and phone numbers, so lookups do not
+    scan the book.
     """
 
-    def __init__(self, repository: ContactRepository):
+    def __init__(self, repository: ContactRepository, cache: QueryCache | None = None):
         """
         Initialize PhoneBook with injected repository.
+
+        Args:
+            repository (ContactRepository): Storage backend.
+            cache (QueryCache | None): Cache for search results, None - a default QueryCache.
         """
         self.repository = repository
-        self.contacts = repository.get_all()
+        self.cache = cache if cache is not None else QueryCache()
+        self._contacts: dict[str, Contact] = {}
+        self._indexes = {field: FieldIndex(field) for field in INDEXED_FIELDS}
+        self._indexes["last_name"] = FuzzyIndex("last_name")
+        self._phones = PhoneIndex()
+
+        # Deferred persistence: id -> "insert" / "update" / "delete".
+        self._lock = threading.RLock()
+        self._dirty: dict[str, str] = {}
+        self._undo: dict[str, tuple[Contact, dict] | None] | None = None
+        # Optimistic concurrency: state each dirty contact had when it was
+        # first changed, and external versions of dirty contacts seen since.
+        self._base: dict[str, dict | None] = {}
+        self._external: dict[str, Contact | None] = {}
+        self._write_behind: int | None = None
+        self._flush_timer: threading.Timer | None = None
+
+        with measure("phonebook.load"), self._phones.bulk():
+            for contact in repository.iter_all():
+                self._index(contact)
+
+    @property
+    def contacts(self) -> list[Contact]:
+        """Return all contacts in insertion order."""
+        return list(self._contacts.values())
+
+    def __iter__(self) -> Iterator[Contact]:
+        """Iterate contacts in insertion order without copying them into a list."""
+        return iter(self._contacts.values())
+
+    def __len__(self) -> int:
+        return len(self._contacts)
+
+    @synchronized
+    def read(self, func: Callable, *args):
+        """
+        Run func(*args) under the book's lock, so concurrent mutations cannot
+        change the contacts and indexes it walks. func must materialize its
+        result (e.g. into a list): lazy results outlive the lock.
+        """
+        return func(*args)
 
-    def _commit(self):
-        """Persist current state to repository."""
-        self.repository.save_all(self.contacts)
+    def page(
+        self,
+        offset: int = 0,
+        limit: int | None = None,
+        sort_by: str | None = None,
+        reverse: bool = False,
+    ) -> Iterator[Contact]:
+        """
+        Lazily yield a window of contacts.
+
+        Without sort_by contacts come in insertion order and only the
+        window is touched. With sort_by (one of SORTABLE_FIELDS,
+        case-insensitive) only offset + limit contacts are kept in a heap.
+        """
+        stop = None if limit is None else offset + limit
+        return islice(_ordered(self._contacts.values(), sort_by, reverse, stop), offset, stop)
+
+    def query(
+        self,
+        expression: str | list[Predicate],
+        sort_by: str | None = None,
+        reverse: bool = False,
+        limit: int | None = None,
+        workers: int = 0,
+    ) -> Iterator[Contact]:
+        """
+        Lazily yield contacts matching a query such as
+        "city=Kyiv AND job~engineer AND phone^380" (see app.query).
+
+        Predicates answerable from an index are evaluated first and their
+        ID sets intersected smallest-first; the rest are checked only on
+        the surviving candidates. If no predicate is indexed, the book is
+        scanned in chunks, in a pool of workers processes if workers > 0.
+
+        Args:
+            expression (str | list[Predicate]): Query text or parsed predicates.
+            sort_by (str | None): One of SORTABLE_FIELDS. Without it, results
+                of a scan come in insertion order, of an index plan unordered.
+            reverse (bool): Sort descending.
+            limit (int | None): Maximum number of results.
+            workers (int): Processes for an unindexed scan, 0 - scan inline.
+
+        Raises:
+            QueryError: If the expression cannot be parsed.
+            ValueError: If sort_by is not sortable.
+        """
+        predicates = parse_query(expression) if isinstance(expression, str) else list(expression)
+        with self._lock, measure("phonebook.query_plan"):
+            candidates, residual = self._plan(predicates)
+            if candidates is None:
+                pool = list(self._contacts.values())
+            else:
+                pool = [self._contacts[cid] for cid in candidates]
+
+        matches = scan(pool, residual, workers)
+        return islice(_ordered(matches, sort_by, reverse, limit), limit)
+
+    def _plan(self, predicates: list[Predicate]) -> tuple[set[str] | None, list[Predicate]]:
+        """
+        Split predicates into the intersection of indexed candidate IDs
+        (None if no predicate is indexed) and the ones left to check.
+        """
+        matched: list[frozenset[str] | set[str]] = []
+        residual = []
+        for predicate in predicates:
+            ids = self._candidates(predicate)
+            if ids is None:
+                residual.append(predicate)
+            else:
+                matched.append(ids)
+
+        if not matched:
+            return None, residual
+
+        matched.sort(key=len)
+        candidates = set(matched[0])
+        for ids in matched[1:]:
+            if not candidates:
+                break
+            candidates &= ids
+        return candidates, residual
+
+    def _candidates(self, predicate: Predicate) -> frozenset[str] | set[str] | None:
+        """IDs satisfying predicate from an index, None if it is not indexed."""
+        field, op, value = predicate.field, predicate.op, predicate.value
+        if field == "phone":
+            lookup = {"=": self._phones.get, "~": self._phones.search, "^": self._phones.prefix}
+            return lookup[op](value)
+        if op != "=":
+            return None
+        if field == "id":
+            return {value} if value in self._contacts else set()
+        if field in self._indexes:
+            return self._indexes[field].get(value)
+        return None
+
+    def _index(self, contact: Contact) -> None:
+        """Add a contact to the id map and all secondary indexes."""
+        previous = self._contacts.get(contact.id)
+        if previous is not None:
+            self._unindex_fields(previous)
+
+        self._contacts[contact.id] = contact
+        self._index_fields(contact)
+        self.cache.invalidate(*CACHED_SEARCHES)
+
+    def _unindex(self, contact: Contact) -> None:
+        """Remove a contact from the id map and all secondary indexes."""
+        self._contacts.pop(contact.id, None)
+        self._unindex_fields(contact)
+        self.cache.invalidate(*CACHED_SEARCHES)
+
+    def _index_fields(self, contact: Contact) -> None:
+        for index in self._indexes.values():
+            index.add(contact)
+        self._phones.add(contact)
+
+    def _unindex_fields(self, contact: Contact) -> None:
+        for index in self._indexes.values():
+            index.remove(contact)
+        self._phones.remove(contact)
+
+    def _lookup(self, field: str, value: str) -> list[Contact]:
+        """Return contacts whose indexed field equals value."""
+        return [self._contacts[cid] for cid in self._indexes[field].get(value)]
+
+    def _deferring(self) -> bool:
+        return self._undo is not None or self._write_behind is not None
+
+    @property
+    def _shared(self) -> bool:
+        return isinstance(self.repository, SharedRepository)
+
+    def _touch(self, contact_id: str) -> None:
+        """
+        Remember the state of a contact before a deferred change: for
+        conflict detection at flush and, in a transaction, for rollback.
+        """
+        if not self._deferring():
+            return
+
+        contact = self._contacts.get(contact_id)
+        state = _state(contact)
+        self._base.setdefault(contact_id, state)
+        if self._undo is not None and contact_id not in self._undo:
+            self._undo[contact_id] = None if contact is None else (contact, state)
+
+    def _apply_external(self, changes: ExternalChanges) -> None:
+        """
+        Apply changes made by other processes. Contacts with pending local
+        changes keep them; the external version is kept for the conflict
+        check at flush.
+        """
+        for contact_id, contact in changes.changed.items():
+            if contact_id in self._dirty:
+                self._external[contact_id] = contact
+                continue
+
+            current = self._contacts.get(contact_id)
+            if current is not None:
+                self._unindex(current)
+            if contact is not None:
+                self._index(contact)
+
+        if changes.reload:
+            for contact_id in list(self._contacts):
+                if contact_id in changes.changed:
+                    continue
+                if contact_id in self._dirty:
+                    self._external[contact_id] = None
+                else:
+                    self._unindex(self._contacts[contact_id])
+
+    @synchronized
+    def refresh(self) -> None:
+        """Pick up changes written to a shared repository by other processes."""
+        if self._shared:
+            with self.repository.lock(shared=True):
+                self._apply_external(self.repository.changes())
+
+    def _record(self, operation: str, contact_id: str) -> None:
+        """Collapse an operation into the pending change of a contact."""
+        previous = self._dirty.get(contact_id)
+        if operation == "insert":
+            self._dirty[contact_id] = "update" if previous == "delete" else "insert"
+        elif operation == "update":
+            self._dirty[contact_id] = previous or "update"
+        elif previous == "insert":
+            del self._dirty[contact_id]
+        else:
+            self._dirty[contact_id] = "delete"
+
+    @timed("phonebook.commit")
+    def _commit(self, operation: str, argument) -> None:
+        """
+        Record a single change in the change set and persist it.
 
+        Incremental repositories receive only the delta through
+        apply_changes() (operation is "insert", "update" or "delete");
+        others get the full list. Inside a transaction or in write-behind
+        mode the change is only recorded. A failed write stays in the
+        change set and is retried by the next commit or flush().
+        """
+        self._record(operation, argument if operation == "delete" else argument.id)
+        self._persist()
+
+    def _persist(self) -> None:
+        """Write the recorded changes, unless persistence is deferred."""
+        if not self._deferring():
+            self._write_dirty()
+            self._dirty.clear()
+        elif (
+            self._undo is None
+            and self._write_behind
+            and len(self._dirty) >= self._write_behind
+        ):
+            self.flush()
+
+    def pending_changes(self) -> ChangeSet:
+        """IDs added, modified and deleted since the last commit (not yet persisted)."""
+        changes = ChangeSet()
+        sets = {"insert": changes.added, "update": changes.modified, "delete": changes.deleted}
+        for contact_id, operation in self._dirty.items():
+            sets[operation].add(contact_id)
+        return changes
+
+    @timed("phonebook.flush")
+    @synchronized
+    def flush(self) -> None:
+        """
+        Persist all deferred changes with a single repository write.
+
+        With a shared repository a contact changed by another process since
+        it was changed here is a conflict. In a transaction nothing is written;
+        otherwise the conflicting contacts take the other process's version
+        and the rest is written. Either way ConflictError is raised.
+        """
+        if not self._dirty:
+            return
+
+        with self.repository.lock() if self._shared else nullcontext():
+            conflicts = []
+            if self._shared:
+                changes = self.repository.changes()
+                self._apply_external(changes)
+                conflicts = [
+                    cid for cid, contact in self._external.items()
+                    if cid in self._dirty and _state(contact) != self._base.get(cid)
+                ]
+
+            if conflicts:
+                if self._undo is not None:
+                    raise ConflictError(conflicts, changes)
+
+                resolved = ExternalChanges({cid: self._external.pop(cid) for cid in conflicts})
+                for contact_id in conflicts:
+                    del self._dirty[contact_id]
+                self._apply_external(resolved)
+
+            self._write_dirty()
+            self._dirty.clear()
+            self._base.clear()
+            self._external.clear()
+
+        if conflicts:
+            raise ConflictError(conflicts, changes)
+
+    def _write_dirty(self) -> None:
+        if not self._dirty:
+            return
+
+        written = [self._contacts[cid] for cid, op in self._dirty.items() if op != "delete"]
+        if isinstance(self.repository, IncrementalRepository):
+            inserts, updates, deletes = [], [], []
+            for contact_id, operation in self._dirty.items():
+                if operation == "delete":
+                    deletes.append(contact_id)
+                elif operation == "insert":
+                    inserts.append(self._contacts[contact_id])
+                else:
+                    updates.append(self._contacts[contact_id])
+            self.repository.apply_changes(inserts, updates, deletes)
+        else:
+            self.repository.save_all(self.contacts)
+
+        for contact in written:
+            contact.mark_clean()
+
+    def _rollback(self, dirty_before: dict[str, str], base_before: dict[str, dict | None]) -> None:
+        for contact_id, saved in self._undo.items():
+            current = self._contacts.get(contact_id)
+            if current is not None:
+                self._unindex(current)
+            if saved is not None:
+                contact, state = saved
+                for key, value in state.items():
+                    setattr(contact, key, value)
+                self._index(contact)
+        self._dirty = dirty_before
+        self._base = base_before
+
+        # External versions of contacts that are no longer dirty apply now.
+        released = {
+            cid: self._external.pop(cid)
+            for cid in list(self._external)
+            if cid not in self._dirty
+        }
+        self._apply_external(ExternalChanges(released))
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group mutations into one persistence commit.
+
+        Changes are flushed once when the block exits; if it raises (including
+        ConflictError from the flush), the in-memory state is rolled back and
+        nothing is persisted. Nested blocks join the outermost transaction.
+        """
+        with self._lock:
+            if self._undo is not None:
+                yield self
+                return
+
+            self._undo = {}
+            dirty_before, base_before = dict(self._dirty), dict(self._base)
+            try:
+                yield self
+                if self._write_behind is None:
+                    self.flush()
+            except BaseException:
+                self._rollback(dirty_before, base_before)
+                raise
+            finally:
+                self._undo = None
+
+    batch = transaction
+
+    @synchronized
+    def start_write_behind(self, max_dirty: int = 100, interval: float | None = 5.0) -> None:
+        """
+        Defer persistence for a long-running session. Pending changes are
+        flushed once max_dirty contacts are dirty (0 - only by flush()) and
+        every interval seconds (None disables the timer).
+        Call stop_write_behind() before exit.
+        """
+        self._write_behind = max_dirty
+        if interval:
+            self._schedule_flush(interval)
+
+    def _schedule_flush(self, interval: float) -> None:
+        def tick():
+            with self._lock:
+                if self._write_behind is None:
+                    return
+                try:
+                    if self._undo is None:
+                        self.flush()
+                except ConflictError as e:
+                    logger.warning("Write-behind flush: %s", e)
+                except Exception:
+                    # Changes stay pending; a dead timer would never retry them.
+                    logger.exception("Write-behind flush failed")
+                finally:
+                    self._schedule_flush(interval)
+
+        self._flush_timer = threading.Timer(interval, tick)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    @synchronized
+    def stop_write_behind(self) -> None:
+        """Leave write-behind mode and flush pending changes."""
+        self._write_behind = None
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        self.flush()
+
+    @mutation
     def add_contact(self, contact: Contact) -> bool:
-        if any(c.id == contact.id for c in self.contacts):
+        if contact.id in self._contacts:
             logger.warning("Contact with this ID already exists.")
             return False
 
-        self.contacts.append(contact)
-        self._commit()
+        self._touch(contact.id)
+        self._index(contact)
+        self._commit("insert", contact)
         return True
 
+    def _validate_new(self, contact: Contact, batch_phones: set[str]) -> str | None:
+        """Return why a contact cannot be added, or None if it can."""
+        if not contact.first_name or not contact.last_name:
+            return "first and last name are required"
+        if not contact.phones:
+            return "at least one phone is required"
+
+        for number in contact.phones.values():
+            digits = normalize_phone(number)
+            if not is_valid_phone(digits):
+                return f"invalid phone {number!r}"
+            if digits in batch_phones or self._phones.get(digits):
+                return f"duplicate phone {number!r}"
+        return None
+
+    @mutation
+    def add_many(self, contacts: Iterable[Contact]) -> ImportReport:
+        """
+        Validate and add contacts with a single persistence commit.
+
+        Contacts with an existing ID or phone number (in the book or earlier
+        in the batch) are rejected and reported.
+        """
+        report = ImportReport()
+        batch: list[Contact] = []
+        batch_phones: set[str] = set()
+        batch_ids: set[str] = set()
+
+        for row, contact in enumerate(contacts, start=1):
+            if contact.id in self._contacts or contact.id in batch_ids:
+                error = "duplicate id"
+            else:
+                error = self._validate_new(contact, batch_phones)
+
+            if error:
+                report.errors.append((row, error))
+                continue
+
+            batch.append(contact)
+            batch_ids.add(contact.id)
+            batch_phones.update(normalize_phone(p) for p in contact.phones.values())
+
+        for contact in batch:
+            self._touch(contact.id)
+            self._index(contact)
+            self._record("insert", contact.id)
+        if batch:
+            self._persist()
+
+        report.added = len(batch)
+        return report
+
+    def bulk_import(
+        self, rows: Iterable[dict], batch_size: int = IMPORT_BATCH_SIZE
+    ) -> ImportReport:
+        """
+        Import contact dicts (e.g. from utils.iter_csv) in batches,
+        committing once per batch of batch_size rows.
+        """
+        report = ImportReport()
+        rows = iter(rows)
+        offset = 0
+
+        while True:
+            chunk = list(islice(rows, batch_size))
+            if not chunk:
+                break
+
+            numbers, contacts = [], []
+            for number, row in enumerate(chunk, start=offset + 1):
+                try:
+                    contacts.append(Contact.from_dict(row))
+                except (AttributeError, TypeError, ValueError) as e:
+                    report.errors.append((number, f"malformed row: {e}"))
+                else:
+                    numbers.append(number)
+
+            result = self.add_many(contacts)
+            report.added += result.added
+            report.errors.extend((numbers[row - 1], error) for row, error in result.errors)
+            offset += len(chunk)
+
+        report.errors.sort()
+
+        for row, error in report.errors:
+            logger.warning("Import row %s skipped: %s", row, error)
+        logger.info("Imported %s contacts, %s rows skipped", report.added, len(report.errors))
+        return report
+
     def find_by_id(self, contact_id: str) -> Contact | None:
-        return next((c for c in self.contacts if c.id == contact_id), None)
+        return self._contacts.get(contact_id)
+
+    def find_by_lastname(self, last_name: str) -> list[Contact]:
+        """Exact (case-insensitive) last name lookup."""
+        return self._lookup("last_name", last_name)
+
+    def find_by_city(self, city: str) -> list[Contact]:
+        """Exact (case-insensitive) city lookup."""
+        return self._lookup("city", city)
 
+    def find_by_job(self, job: str) -> list[Contact]:
+        """Exact (case-insensitive) job lookup."""
+        return self._lookup("job", job)
+
+    @mutation
     def delete_contact(self, contact_id: str) -> bool:
         contact = self.find_by_id(contact_id)
         if not contact:
             return False
 
-        self.contacts.remove(contact)
-        self._commit()
+        self._touch(contact_id)
+        self._unindex(contact)
+        self._commit("delete", contact_id)
         return True
 
+    @mutation
     def update_contact(self, contact_id: str, updates: dict) -> bool:
+        """
+        Apply field updates to a contact. Only fields that actually change
+        are re-indexed, invalidate cached searches and get persisted; an
+        update that changes nothing writes nothing.
+
+        Raises:
+            TypeError: If a value has the wrong type (see models.check_updates);
+                the contact is left untouched.
+        """
+        check_updates(updates)
         contact = self.find_by_id(contact_id)
         if not contact:
             return False
 
-        for key, value in updates.items():
-            if hasattr(contact, key):
-                setattr(contact, key, value)
+        self._touch(contact_id)
+        reindex = not updates.keys().isdisjoint(INDEX_SOURCES)
+        if reindex:
+            self._unindex_fields(contact)
+        changed = contact.update(updates)
+        if reindex:
+            self._index_fields(contact)
+        if not changed:
+            return True
 
-        self._commit()
+        # Only searches over the changed fields can return different results.
+        stale = [kind for kind, field in CACHED_SEARCHES.items() if field in changed]
+        if stale:
+            self.cache.invalidate(*stale)
+
+        self._commit("update", contact)
         return True
 
-    def search_by_lastname(self, query: str) -> list[Contact]:
-        lastnames = [c.last_name for c in self.contacts]
-        matches = get_close_matches(query.capitalize(), lastnames, cutoff=0.6)
-        return [c for c in self.contacts if c.last_name in matches]
+    def _cached(self, kind: str, key: tuple, search) -> list[Contact]:
+        """
+        Return contacts for a search, computing the matching IDs with
+        search() only if no valid result is cached under (kind, key).
+        """
+        ids = self.cache.get(kind, key)
+        if ids is None:
+            generation = self.cache.generation(kind)
+            ids = tuple(search())
+            self.cache.put(kind, key, ids, generation)
+
+        contacts = self._contacts
+        return [contacts[cid] for cid in ids if cid in contacts]
+
+    @synchronized
+    def find_duplicates(self, name_threshold: float = NAME_THRESHOLD) -> list[DuplicateGroup]:
+        """
+        Groups of contacts sharing a phone number (compared by canonical
+        key, see app.dedupe) and a similar name. The contact to keep,
+        the oldest one, is first in each group.
+        """
+        return find_duplicates(self._contacts.values(), name_threshold)
+
+    def _merge(self, contact_ids: list[str]) -> Contact | None:
+        contacts = [self._contacts[cid] for cid in contact_ids if cid in self._contacts]
+        if len(contacts) < 2:
+            return None
+
+        primary, others = contacts[0], contacts[1:]
+        updates = merged_fields(primary, others)
+        for other in others:
+            self.delete_contact(other.id)
+        self.update_contact(primary.id, updates)
+        return primary
 
+    def merge_contacts(self, contact_ids: list[str]) -> Contact | None:
+        """
+        Merge contacts into the first of contact_ids in one commit: its
+        missing phones, city and job are taken from the others, which are
+        deleted. Returns the kept contact, or None if fewer than two exist.
+        """
+        with self.transaction():
+            return self._merge(contact_ids)
+
+    def auto_merge(self, name_threshold: float = NAME_THRESHOLD) -> MergeReport:
+        """Find duplicates and merge every group in one commit."""
+        report = MergeReport()
+        with self.transaction():
+            for group in self.find_duplicates(name_threshold):
+                if self._merge(group.contact_ids) is not None:
+                    report.merged.append((group.contact_ids[0], group.contact_ids[1:]))
+
+        logger.info("Merged %s duplicate groups, %s contacts removed", len(report.merged), report.removed)
+        return report
+
+    @timed("phonebook.search_by_lastname")
+    def search_by_lastname(
+        self, query: str, cutoff: float = 0.6, limit: int | None = 3
+    ) -> list[Contact]:
+        """
+        Fuzzy last name search. Contacts of up to limit closest last names
+        with similarity >= cutoff are returned, best matches first.
+        """
+        index = self._indexes["last_name"]
+        return self._cached(
+            "last_name",
+            (normalize_text(query), cutoff, limit),
+            lambda: (
+                cid for _, key in index.search(query, cutoff, limit) for cid in index.ids(key)
+            ),
+        )
+
+    @timed("phonebook.search_by_phone")
     def search_by_phone(self, query: str) -> list[Contact]:
-        return [
-            c for c in self.contacts
-            if any(query in str(p) for p in c.phones.values())
-        ]
+        """Contacts having a phone number that contains query (digits only)."""
+        return self._cached(
+            "phone", ("contains", normalize_phone(query)), lambda: self._phones.search(query)
+        )
+
+    @timed("phonebook.search_by_phone_prefix")
+    def search_by_phone_prefix(self, prefix: str) -> list[Contact]:
+        """Contacts having a phone number that starts with prefix (digits only)."""
+        return self._cached(
+            "phone", ("prefix", normalize_phone(prefix)), lambda: self._phones.prefix(prefix)
+        )
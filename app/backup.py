@@ -0,0 +1,230 @@
+# app/backup.py
+
+"""
+Backup policy subsystem for file-based storages.
+
+Backups are coalesced within a time window, pruned by count and age,
+and can be gzip-compressed or stored as incremental per-contact deltas
+against the previous backup, so backup I/O follows the volume of changes
+rather than the number of edits.
+"""
+
+import gzip
+import json
+import os
+import re
+import shutil
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass
+class BackupPolicy:
+    """
+    Configuration of backup retention and layout.
+
+    Attributes:
+        enabled: Make backups at all. Saves are atomic, so backups are
+            history rather than crash protection and can be turned off.
+        keep: Maximum number of backup files to retain (0 - unlimited).
+        max_age: Maximum backup age in seconds (None - unlimited).
+        coalesce_window: Skip a new backup if the latest one is younger
+            than this many seconds (0 - back up on every save).
+        compress: Store backups gzip-compressed.
+        incremental: Store deltas against the previous backup instead of
+            full copies.
+        full_every: In incremental mode, start a new chain with a full
+            backup after this many deltas.
+    """
+
+    enabled: bool = True
+    keep: int = 10
+    max_age: float | None = None
+    coalesce_window: float = 60.0
+    compress: bool = False
+    incremental: bool = False
+    full_every: int = 10
+
+
+class BackupManager:
+    """
+    Creates, prunes and restores backups of a single data file.
+
+    Example names:
+        phonebook.json.20260221_153000_123456.bak
+        phonebook.json.20260221_153500_654321.delta.gz
+    """
+
+    def __init__(self, filepath: str, policy: BackupPolicy | None = None):
+        """
+        Args:
+            filepath (str): Path to the file being backed up.
+            policy (BackupPolicy | None): Backup policy, defaults to BackupPolicy().
+        """
+        self.filepath = filepath
+        self.policy = policy or BackupPolicy()
+        self._pattern = re.compile(
+            rf"^{re.escape(os.path.basename(filepath))}"
+            r"\.(\d{8}_\d{6}(?:_\d{6})?)\.(bak|delta)(\.gz)?$"
+        )
+        self._last_state: dict[str, dict] | None = None
+        self._last_backup: str | None = None
+        self._chain_length = 0
+
+    def list_backups(self) -> list[str]:
+        """Return backup paths ordered from oldest to newest."""
+        directory = os.path.dirname(self.filepath) or "."
+        if not os.path.isdir(directory):
+            return []
+
+        names = [n for n in os.listdir(directory) if self._pattern.match(n)]
+        names.sort(key=lambda n: self._pattern.match(n).group(1))
+        return [os.path.join(directory, n) for n in names]
+
+    def _created_at(self, path: str) -> float:
+        """
+        Return the backup creation time encoded in its name.
+        File mtime is not used: shutil.copy2 preserves the source mtime.
+        """
+        stamp = self._pattern.match(os.path.basename(path)).group(1)
+        fmt = "%Y%m%d_%H%M%S_%f" if stamp.count("_") == 2 else "%Y%m%d_%H%M%S"
+        return datetime.strptime(stamp, fmt).timestamp()
+
+    def _is_delta(self, path: str) -> bool:
+        return self._pattern.match(os.path.basename(path)).group(2) == "delta"
+
+    def _open(self, path: str, mode: str):
+        if path.endswith(".gz"):
+            return gzip.open(path, mode + "t", encoding="utf-8")
+        return open(path, mode, encoding="utf-8")
+
+    def _new_path(self, kind: str) -> str:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        suffix = ".gz" if self.policy.compress else ""
+        return f"{self.filepath}.{timestamp}.{kind}{suffix}"
+
+    def backup(self) -> str | None:
+        """
+        Back up the data file according to the policy.
+
+        Returns:
+            str | None: Path of the created backup, or None if skipped.
+        """
+        if not self.policy.enabled:
+            return None
+        if not os.path.exists(self.filepath) or os.path.getsize(self.filepath) == 0:
+            return None
+
+        existing = self.list_backups()
+        window = self.policy.coalesce_window
+        if window and existing and time.time() - self._created_at(existing[-1]) < window:
+            return None
+
+        if self.policy.incremental:
+            path = self._backup_incremental(existing)
+        else:
+            path = self._backup_full()
+
+        self.prune()
+        return path
+
+    def _backup_full(self) -> str:
+        path = self._new_path("bak")
+        if self.policy.compress:
+            with open(self.filepath, "rb") as src, gzip.open(path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+        else:
+            shutil.copy2(self.filepath, path)
+        return path
+
+    def _backup_incremental(self, existing: list[str]) -> str:
+        with open(self.filepath, "r", encoding="utf-8") as f:
+            state = {item["id"]: item for item in json.load(f)}
+
+        chain_broken = (
+            self._last_state is None
+            or self._last_backup not in existing
+            or self._chain_length >= self.policy.full_every
+        )
+
+        if chain_broken:
+            path = self._new_path("bak")
+            with self._open(path, "w") as f:
+                json.dump(list(state.values()), f, ensure_ascii=False)
+            self._chain_length = 0
+        else:
+            path = self._new_path("delta")
+            delta = {
+                "base": os.path.basename(self._last_backup),
+                "upserts": [
+                    item for cid, item in state.items()
+                    if self._last_state.get(cid) != item
+                ],
+                "deletes": [cid for cid in self._last_state if cid not in state],
+            }
+            with self._open(path, "w") as f:
+                json.dump(delta, f, ensure_ascii=False)
+            self._chain_length += 1
+
+        self._last_state = state
+        self._last_backup = path
+        return path
+
+    def prune(self) -> list[str]:
+        """
+        Remove backups exceeding the retention count or age.
+        Full backups that a retained delta depends on are kept.
+
+        Returns:
+            list[str]: Paths of removed backups.
+        """
+        backups = self.list_backups()
+        now = time.time()
+        keep_from = max(len(backups) - self.policy.keep, 0) if self.policy.keep else 0
+
+        retained = set()
+        for i, path in enumerate(backups):
+            too_old = (
+                self.policy.max_age is not None
+                and now - self._created_at(path) > self.policy.max_age
+            )
+            if i >= keep_from and not too_old:
+                retained.add(path)
+
+        # Keep whole chains: walk back from every retained delta to its full base.
+        for i, path in enumerate(backups):
+            if path in retained and self._is_delta(path):
+                j = i
+                while j > 0 and self._is_delta(backups[j]):
+                    j -= 1
+                    retained.add(backups[j])
+
+        removed = [p for p in backups if p not in retained]
+        for path in removed:
+            os.remove(path)
+        return removed
+
+    def restore(self, backup_path: str) -> list[dict]:
+        """
+        Reconstruct contact records stored in a backup.
+
+        Args:
+            backup_path (str): Full or delta backup path.
+
+        Returns:
+            list[dict]: Contact records as they were at backup time.
+        """
+        with self._open(backup_path, "r") as f:
+            data = json.load(f)
+
+        if not self._is_delta(backup_path):
+            return data
+
+        base_path = os.path.join(os.path.dirname(backup_path), data["base"])
+        state = {item["id"]: item for item in self.restore(base_path)}
+        for cid in data["deletes"]:
+            state.pop(cid, None)
+        for item in data["upserts"]:
+            state[item["id"]] = item
+        return list(state.values())
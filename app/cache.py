@@ -0,0 +1,118 @@
+# app/cache.py
+
+"""
+Query result cache for PhoneBook searches.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass
+class CacheStats:
+    """Counters of a QueryCache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    cost: int = 0
+
+
+class QueryCache:
+    """
+    LRU cache with optional TTL for search results, grouped by kind
+    (e.g. "last_name", "phone").
+
+    Each kind has a generation counter. invalidate(kind) bumps it, which
+    makes every cached result of that kind stale in O(1); stale entries are
+    dropped lazily. Results are stored as tuples of contact IDs, and the
+    memory bound is expressed as the total number of stored IDs (max_cost)
+    plus a maximum number of entries.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_cost: int = 100_000, ttl: float | None = None):
+        """
+        Args:
+            max_entries (int): Maximum number of cached queries.
+            max_cost (int): Maximum total number of contact IDs held by the cache.
+            ttl (float | None): Seconds a result stays valid, None - until invalidated.
+        """
+        self.max_entries = max_entries
+        self.max_cost = max_cost
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple, tuple[int, float, tuple[str, ...]]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def generation(self, kind: str) -> int:
+        """Current generation of a kind; pass it to put() to avoid caching stale results."""
+        return self._generations.get(kind, 0)
+
+    def get(self, kind: str, key) -> tuple[str, ...] | None:
+        """Return cached contact IDs, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get((kind, key))
+            if entry is not None:
+                generation, expires, ids = entry
+                if generation == self.generation(kind) and expires >= time.monotonic():
+                    self._entries.move_to_end((kind, key))
+                    self._stats.hits += 1
+                    return ids
+                self._drop((kind, key))
+
+            self._stats.misses += 1
+            return None
+
+    def put(self, kind: str, key, ids, generation: int) -> None:
+        """
+        Cache contact IDs computed while the kind had the given generation.
+        Results computed before an invalidation are ignored.
+        """
+        ids = tuple(ids)
+        with self._lock:
+            if generation != self.generation(kind) or len(ids) + 1 > self.max_cost:
+                return
+
+            self._drop((kind, key))
+            expires = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+            self._entries[(kind, key)] = (generation, expires, ids)
+            self._stats.cost += len(ids) + 1
+
+            while len(self._entries) > self.max_entries or self._stats.cost > self.max_cost:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._stats.evictions += 1
+
+    def invalidate(self, *kinds: str) -> None:
+        """Make all cached results of the given kinds stale."""
+        with self._lock:
+            for kind in kinds:
+                self._generations[kind] = self.generation(kind) + 1
+                self._stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stats.cost = 0
+
+    def _drop(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._stats.cost -= len(entry[2]) + 1
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                invalidations=self._stats.invalidations,
+                entries=len(self._entries),
+                cost=self._stats.cost,
+            )
@@ -2,14 +2,27 @@
 
 """
 Command Line Interface for the Phone Book application.
+
+Startup is kept short: rarely used features (CSV, fuzzy search, the TCP
+service, parallel export) import their modules on first use, the book is
+loaded from a binary snapshot cache when it is fresh, and loading runs in
+the background while the menu is already shown.
 """
 
-from app.api import PhoneBook
+import argparse
+import sys
+import threading
+from app.api import PhoneBook, SORTABLE_FIELDS
+from app.dedupe import NAME_THRESHOLD
+from app.export import EXPORT_FORMATS, export_contacts
 from app.models import Contact
-from app.storage import JSONStorage
-from app.utils import is_valid_phone, format_contact
+from app.journal import JournalStorage
+from app.logger import setup_logging
+from app.metrics import metrics
+from app.utils import CONTACT_LABELS, is_valid_phone, format_contact, iter_csv, iter_formatted
 
 DATA_FILE = "data/phonebook.json"
+PAGE_SIZE = 20
 
 
 class PhoneBookCLI:
@@ -18,12 +31,31 @@ class PhoneBookCLI:
     """
 
     def __init__(self):
-        storage = JSONStorage(DATA_FILE)
-        self.phonebook = PhoneBook(storage)
+        self.storage = JournalStorage(DATA_FILE, snapshot_cache=True)
+        self._phonebook: PhoneBook | None = None
+        self._load_error: BaseException | None = None
+        self._loader = threading.Thread(target=self._load, name="phonebook-load", daemon=True)
+        self._loader.start()
+
+    def _load(self) -> None:
+        try:
+            self._phonebook = PhoneBook(self.storage)
+        except BaseException as e:
+            self._load_error = e
+
+    @property
+    def phonebook(self) -> PhoneBook:
+        """The loaded PhoneBook; waits for background loading to finish."""
+        if self._phonebook is None:
+            self._loader.join()
+            if self._load_error is not None:
+                raise self._load_error
+        return self._phonebook
 
     def run(self):
         while True:
             choice = self.menu()
+            self.phonebook.refresh()
 
             match choice:
                 case "1":
@@ -36,9 +68,14 @@ class PhoneBookCLI:
                     self.search_phone()
                 case "5":
                     self.delete_contact()
+                case "6":
+                    self.import_csv()
+                case "7":
+                    self.export()
                 case "8":
                     self.update_contact()
                 case "q":
+                    self.storage.compact()
                     break
 
     def menu(self):
@@ -48,13 +85,38 @@ class PhoneBookCLI:
         print("3. Search by last name")
         print("4. Search by phone")
         print("5. Delete contact")
+        print("6. Import from CSV")
+        print("7. Export contacts")
         print("8. Update contact")
         print("q. Exit")
         return input("👉 Choose action: ").strip()
 
     def show_contacts(self):
-        for c in self.phonebook.contacts:
-            print(format_contact(c.to_dict()))
+        sort_by = input(f"Sort by ({', '.join(SORTABLE_FIELDS)}) [none]: ").strip() or None
+        if sort_by and sort_by not in SORTABLE_FIELDS:
+            print("Unknown sort field")
+            return
+
+        fields = [f.strip() for f in input("Fields (comma-separated) [all]: ").split(",") if f.strip()]
+        if any(f not in CONTACT_LABELS for f in fields):
+            print("Unknown field")
+            return
+
+        total = len(self.phonebook)
+        offset = 0
+        try:
+            while offset < total:
+                page = self.phonebook.page(offset, PAGE_SIZE, sort_by)
+                sys.stdout.writelines(iter_formatted(page, fields))
+                sys.stdout.flush()
+
+                offset += PAGE_SIZE
+                if offset < total:
+                    answer = input(f"-- {offset}/{total} -- Enter: next page, q: stop ")
+                    if answer.strip().lower() == "q":
+                        break
+        except KeyboardInterrupt:
+            print()
 
     def add_contact(self):
         first = input("First name: ")
@@ -68,6 +130,68 @@ class PhoneBookCLI:
         contact = Contact(first, last, {"mobile": phone})
         self.phonebook.add_contact(contact)
 
+    def import_csv(self, path: str | None = None) -> int:
+        """Import contacts from a CSV file and print a report. Returns the error count."""
+        import csv
+
+        path = path or input("CSV file: ").strip()
+        try:
+            report = self.phonebook.bulk_import(iter_csv(path))
+        except (OSError, csv.Error, UnicodeDecodeError) as e:
+            # Batches before the bad spot are already imported.
+            print(f"Cannot read {path}: {e}")
+            return 1
+
+        print(f"Imported: {report.added}, skipped: {len(report.errors)}")
+        for row, error in report.errors:
+            print(f"  row {row}: {error}")
+        return len(report.errors)
+
+    def export(self):
+        path = input("Output file (.gz to compress): ").strip()
+        fmt = input(f"Format ({', '.join(EXPORT_FORMATS)}) [csv]: ").strip() or "csv"
+        if fmt not in EXPORT_FORMATS:
+            print("Unknown format")
+            return
+
+        try:
+            count = export_contacts(self.phonebook, path, fmt)
+        except OSError as e:
+            print(f"Cannot write {path}: {e}")
+            return
+        print(f"Exported: {count}")
+
+    def dedupe(self, threshold: float = NAME_THRESHOLD, apply: bool = False) -> int:
+        """Print duplicate groups and merge them if apply is set."""
+        groups = self.phonebook.find_duplicates(threshold)
+        for group in groups:
+            print(f"Phones {', '.join(sorted(group.phones))}:")
+            for cid in group.contact_ids:
+                c = self.phonebook.find_by_id(cid)
+                phones = ", ".join(c.phones.values())
+                print(f"  {cid}: {c.first_name} {c.last_name} ({phones}) {c.city}")
+
+        if apply:
+            report = self.phonebook.auto_merge(threshold)
+            print(f"Merged groups: {len(report.merged)}, removed contacts: {report.removed}")
+        else:
+            print(f"Duplicate groups: {len(groups)} (use --apply to merge)")
+        return 0
+
+    def query(
+        self, expression: str, sort_by: str | None = None, reverse: bool = False, limit: int | None = None
+    ) -> int:
+        """Print contacts matching a query such as "city=Kyiv AND job~engineer"."""
+        from app.query import QueryError
+
+        try:
+            results = self.phonebook.query(expression, sort_by, reverse, limit)
+        except QueryError as e:
+            print(f"Invalid query: {e}")
+            return 1
+        sys.stdout.writelines(iter_formatted(results))
+        return 0
+
     def delete_contact(self):
         cid = input("Contact ID: ")
         self.phonebook.delete_contact(cid)
@@ -97,3 +221,124 @@ class PhoneBookCLI:
         q = input("Phone: ")
         for c in self.phonebook.search_by_phone(q):
             print(format_contact(c.to_dict()))
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Entry point. Without arguments starts the interactive menu,
+    otherwise runs a single non-interactive command.
+    """
+    parser = argparse.ArgumentParser(prog="phonebook")
+    commands = parser.add_subparsers(dest="command")
+    import_parser = commands.add_parser("import", help="Import contacts from a CSV file")
+    import_parser.add_argument("path")
+    export_parser = commands.add_parser("export", help="Export contacts to a file")
+    export_parser.add_argument("path", help="Output file, gzip-compressed if it ends with .gz")
+    export_parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    export_parser.add_argument("--workers", type=int, default=0, help="Serialization processes")
+    serve_parser = commands.add_parser("serve", help="Serve the phone book over JSON-over-TCP")
+    serve_parser.add_argument("--host", help="Default: 127.0.0.1")
+    serve_parser.add_argument("--port", type=int, help="Default: 8765")
+    dedupe_parser = commands.add_parser("dedupe", help="Find (and merge) duplicate contacts")
+    dedupe_parser.add_argument("--apply", action="store_true", help="Merge every group found")
+    dedupe_parser.add_argument(
+        "--threshold", type=float, default=NAME_THRESHOLD, help="Name similarity, 0..1"
+    )
+    query_parser = commands.add_parser(
+        "query", help='Print contacts matching e.g. "city=Kyiv AND job~engineer AND phone^380"'
+    )
+    query_parser.add_argument("expression", help="field=value (equals), ~ (contains), ^ (starts with)")
+    query_parser.add_argument("--sort", choices=SORTABLE_FIELDS)
+    query_parser.add_argument("--reverse", action="store_true")
+    query_parser.add_argument("--limit", type=int)
+    convert_parser = commands.add_parser(
+        "convert", help="Convert between the JSON and the compact binary (.pbk) file format"
+    )
+    convert_parser.add_argument("source", help="Book to read, .json or .pbk")
+    convert_parser.add_argument("target", help="File to write, the other format")
+    parser.add_argument(
+        "--metrics",
+        metavar="FILE",
+        help="Collect timing metrics, log summaries and write them to FILE (Prometheus text format)",
+    )
+    parser.add_argument("--metrics-interval", type=float, default=60.0, help="Seconds between reports")
+    parser.add_argument(
+        "--log-level", default="INFO", choices=("DEBUG", "INFO", "WARNING", "ERROR"), type=str.upper
+    )
+    parser.add_argument("--log-json", action="store_true", help="Write log records as JSON lines")
+
+    args = parser.parse_args(argv)
+    setup_logging(args.log_level, json_format=args.log_json)
+
+    if not args.metrics:
+        return _run(args)
+
+    metrics.start_reporter(args.metrics_interval, args.metrics)
+    try:
+        return _run(args)
+    finally:
+        metrics.stop_reporter()
+        metrics.report(args.metrics)
+
+
+def _run(args: argparse.Namespace) -> int:
+    """Run the parsed command and return the exit status."""
+    if args.command == "export":
+        # Streams straight from storage, without building a PhoneBook.
+        contacts = JournalStorage(DATA_FILE).iter_all()
+        count = export_contacts(contacts, args.path, args.format, workers=args.workers)
+        print(f"Exported: {count}")
+        return 0
+
+    if args.command == "convert":
+        return _convert(args.source, args.target)
+
+    if args.command == "serve":
+        from app.service import DEFAULT_HOST, DEFAULT_PORT, run_service
+
+        storage = JournalStorage(DATA_FILE, snapshot_cache=True)
+        run_service(PhoneBook(storage), args.host or DEFAULT_HOST, args.port or DEFAULT_PORT)
+        storage.compact()
+        return 0
+
+    cli = PhoneBookCLI()
+
+    match args.command:
+        case "import":
+            status = 1 if cli.import_csv(args.path) else 0
+            mutated = True
+        case "dedupe":
+            status = cli.dedupe(args.threshold, args.apply)
+            mutated = args.apply
+        case "query":
+            status = cli.query(args.expression, args.sort, args.reverse, args.limit)
+            mutated = False
+        case _:
+            cli.run()
+            return 0
+
+    # Reads leave the journal alone; compacting rewrites the whole book.
+    if mutated:
+        cli.storage.compact()
+    return status
+
+
+def _convert(source: str, target: str) -> int:
+    """Convert a book between the JSON and the binary format by file suffix."""
+    from app.binary_storage import SUFFIX, binary_to_json, json_to_binary
+
+    if source.endswith(".json") and target.endswith(SUFFIX):
+        # Fold pending journal records into the JSON file first.
+        try:
+            JournalStorage(source).compact()
+        except (ValueError, OSError) as e:
+            print(f"Cannot read {source}: {e}")
+            return 1
+        count = json_to_binary(source, target)
+    elif source.endswith(SUFFIX) and target.endswith(".json"):
+        count = binary_to_json(source, target)
+    else:
+        print(f"Expected a .json and a {SUFFIX} file")
+        return 1
+    print(f"Converted: {count}")
+    return 0
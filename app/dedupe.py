@@ -0,0 +1,182 @@
+# app/dedupe.py
+
+"""
+Duplicate contact detection and merging.
+
+Phone numbers are reduced to canonical keys, and contacts are bucketed by
+key in one pass, so only contacts sharing a number are ever compared. Within
+a bucket, names are fuzzy-matched, and matching contacts are joined with
+union-find. This way, contacts linked through different numbers end up in
+one group. The cost is linear in the number of phones plus the (small)
+bucket sizes, with no pairwise comparison of the whole book.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from app.models import Contact
+from app.utils import normalize_phone, normalize_text
+
+# Length of a national significant number (Ukraine). "+380 67 123 45 67",
+# "067 123 45 67" and "671234567" all share the key "671234567".
+SIGNIFICANT_DIGITS = 9
+NAME_THRESHOLD = 0.8
+# Buckets bigger than this (e.g. a shared office number) are not compared pairwise.
+MAX_BUCKET = 50
+
+
+@dataclass
+class DuplicateGroup:
+    """
+    Contacts that look like one person.
+
+    Attributes:
+        contact_ids: IDs in the group, the one to keep first.
+        phones: Canonical phone keys that linked the group.
+    """
+
+    contact_ids: list[str]
+    phones: set[str] = field(default_factory=set)
+
+
+@dataclass
+class MergeReport:
+    """
+    Outcome of a merge.
+
+    Attributes:
+        merged: (kept ID, IDs merged into it and deleted) for every group.
+    """
+
+    merged: list[tuple[str, list[str]]] = field(default_factory=list)
+
+    @property
+    def removed(self) -> int:
+        return sum(len(ids) for _, ids in self.merged)
+
+
+def canonical_phone(number) -> str:
+    """Canonical key of a phone number: its last SIGNIFICANT_DIGITS digits."""
+    digits = normalize_phone(number)
+    return digits[-SIGNIFICANT_DIGITS:]
+
+
+def _name(contact: Contact) -> str:
+    return normalize_text(f"{contact.first_name} {contact.last_name}")
+
+
+def name_similarity(a: Contact, b: Contact) -> float:
+    """Similarity of full names in [0, 1], tolerant to swapped first/last names."""
+    from difflib import SequenceMatcher
+
+    left = _name(a)
+    right = _name(b)
+    if left == right:
+        return 1.0
+
+    swapped = normalize_text(f"{b.last_name} {b.first_name}")
+    best = 0.0
+    for candidate in (right, swapped):
+        matcher = SequenceMatcher(None, left, candidate)
+        if matcher.real_quick_ratio() > best and matcher.quick_ratio() > best:
+            best = max(best, matcher.ratio())
+    return best
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent: dict[str, str] = {}
+
+    def find(self, item: str) -> str:
+        root = self.parent.setdefault(item, item)
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while item != root:
+            item, self.parent[item] = self.parent[item], root
+        return root
+
+    def union(self, a: str, b: str) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[root_b] = root_a
+
+
+def _keep_order(contact: Contact) -> tuple:
+    """The oldest contact of a group is kept."""
+    return (contact.created_at or "", contact.id)
+
+
+def find_duplicates(
+    contacts: Iterable[Contact], name_threshold: float = NAME_THRESHOLD
+) -> list[DuplicateGroup]:
+    """
+    Group contacts sharing a canonical phone number and a similar name.
+
+    Args:
+        contacts (Iterable[Contact]): Contacts to check, consumed once.
+        name_threshold (float): Minimum name_similarity() to treat two
+            contacts with a common number as the same person.
+
+    Returns:
+        list[DuplicateGroup]: Groups of two or more contacts.
+    """
+    by_id: dict[str, Contact] = {}
+    buckets: dict[str, list[str]] = {}
+    for contact in contacts:
+        by_id[contact.id] = contact
+        for key in {canonical_phone(p) for p in contact.phones.values()}:
+            if key:
+                buckets.setdefault(key, []).append(contact.id)
+
+    links = _UnionFind()
+    linked_by: dict[str, set[str]] = {}
+    for key, ids in buckets.items():
+        if len(ids) < 2 or len(ids) > MAX_BUCKET:
+            continue
+        for i, first in enumerate(ids):
+            for second in ids[i + 1:]:
+                if links.find(first) == links.find(second):
+                    linked_by.setdefault(first, set()).add(key)
+                    continue
+                if name_similarity(by_id[first], by_id[second]) >= name_threshold:
+                    links.union(first, second)
+                    linked_by.setdefault(first, set()).add(key)
+
+    groups: dict[str, DuplicateGroup] = {}
+    for contact_id in links.parent:
+        group = groups.setdefault(links.find(contact_id), DuplicateGroup([]))
+        group.contact_ids.append(contact_id)
+        group.phones |= linked_by.get(contact_id, set())
+
+    result = []
+    for group in groups.values():
+        if len(group.contact_ids) > 1:
+            group.contact_ids.sort(key=lambda cid: _keep_order(by_id[cid]))
+            result.append(group)
+    return result
+
+
+def merged_fields(primary: Contact, others: list[Contact]) -> dict:
+    """
+    Return updates that fold others into primary: phones not yet present
+    (by canonical key) are added, and empty city/job are filled in.
+    """
+    phones = dict(primary.phones)
+    keys = {canonical_phone(p) for p in phones.values()}
+    for other in others:
+        for kind, number in other.phones.items():
+            key = canonical_phone(number)
+            if key in keys:
+                continue
+            keys.add(key)
+            name, suffix = kind, 2
+            while name in phones:
+                name, suffix = f"{kind}{suffix}", suffix + 1
+            phones[name] = number
+
+    updates = {"phones": phones}
+    for attribute in ("city", "job"):
+        if not getattr(primary, attribute):
+            value = next((getattr(o, attribute) for o in others if getattr(o, attribute)), "")
+            if value:
+                updates[attribute] = value
+    return updates
@@ -0,0 +1,152 @@
+# app/export.py
+
+"""
+Streaming export of contacts to CSV, CSV with one row per phone, and JSON Lines.
+
+Contacts are consumed from any iterable (e.g. a repository's iter_all())
+in fixed-size chunks. Each chunk is serialized to text, optionally in a
+process pool, and written through one buffered (optionally gzip) writer,
+so memory stays bounded by the chunk size rather than the book size.
+"""
+
+import io
+import json
+from collections import deque
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from app.models import Contact
+
+CSV_FIELDS = ("id", "first_name", "last_name", "phones", "city", "job", "created_at")
+EXPLODED_FIELDS = (
+    "id", "first_name", "last_name", "phone_type", "phone", "city", "job", "created_at",
+)
+EXPORT_FORMATS = ("csv", "csv-exploded", "jsonl")
+CHUNK_SIZE = 10_000
+BUFFER_SIZE = 1024 * 1024
+
+Row = tuple[str, str, str, dict, str, str, str]
+
+# csv, gzip and the process pool are imported where used, so that importing
+# this module (e.g. for EXPORT_FORMATS) does not slow down startup.
+
+
+def _to_row(contact: Contact) -> Row:
+    """Picklable, dict-free snapshot of a contact."""
+    return (
+        contact.id,
+        contact.first_name,
+        contact.last_name,
+        contact.phones,
+        contact.city,
+        contact.job,
+        contact.created_at,
+    )
+
+
+def _format_chunk(fmt: str, rows: list[Row]) -> str:
+    """Serialize a chunk of rows to text in the given format."""
+    if fmt == "jsonl":
+        return "".join(
+            json.dumps(dict(zip(CSV_FIELDS, row)), ensure_ascii=False) + "\n"
+            for row in rows
+        )
+
+    import csv
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == "csv":
+        for cid, first, last, phones, city, job, created in rows:
+            phones_text = "; ".join(f"{k}:{v}" for k, v in phones.items())
+            writer.writerow((cid, first, last, phones_text, city, job, created))
+    else:
+        for cid, first, last, phones, city, job, created in rows:
+            # A contact without phones still gets a row, with empty phone columns.
+            for kind, number in phones.items() or [("", "")]:
+                writer.writerow((cid, first, last, kind, number, city, job, created))
+    return buffer.getvalue()
+
+
+def _header(fmt: str) -> str:
+    if fmt == "jsonl":
+        return ""
+
+    import csv
+
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(CSV_FIELDS if fmt == "csv" else EXPLODED_FIELDS)
+    return buffer.getvalue()
+
+
+def _chunks(contacts: Iterable[Contact], size: int) -> Iterator[list[Row]]:
+    contacts = iter(contacts)
+    while chunk := [_to_row(c) for c in islice(contacts, size)]:
+        yield chunk
+
+
+def _serialize(fmt: str, chunks: Iterator[list[Row]], workers: int) -> Iterator[tuple[int, str]]:
+    """
+    Yield (contacts in chunk, text) in input order. With workers > 0 chunks
+    are formatted in a process pool, with at most 2 * workers chunks in flight.
+    """
+    if workers <= 0:
+        for chunk in chunks:
+            yield len(chunk), _format_chunk(fmt, chunk)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((len(chunk), pool.submit(_format_chunk, fmt, chunk)))
+            if len(pending) >= 2 * workers:
+                count, future = pending.popleft()
+                yield count, future.result()
+        while pending:
+            count, future = pending.popleft()
+            yield count, future.result()
+
+
+def export_contacts(
+    contacts: Iterable[Contact],
+    path: str,
+    fmt: str = "csv",
+    compress: bool | None = None,
+    workers: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+) -> int:
+    """
+    Stream contacts into a file.
+
+    Args:
+        contacts (Iterable[Contact]): Contacts to export, consumed lazily.
+        path (str): Output file path.
+        fmt (str): One of EXPORT_FORMATS.
+        compress (bool | None): Gzip the output. None - only if path ends with ".gz".
+        workers (int): Size of the process pool for serialization, 0 - serialize inline.
+        chunk_size (int): Number of contacts serialized at a time.
+
+    Returns:
+        int: Number of exported contacts.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}, expected one of {EXPORT_FORMATS}")
+
+    if compress is None:
+        compress = path.endswith(".gz")
+
+    if compress:
+        import gzip
+
+        out = gzip.open(path, "wt", encoding="utf-8", newline="")
+    else:
+        out = open(path, "w", encoding="utf-8", newline="", buffering=BUFFER_SIZE)
+
+    exported = 0
+    with out:
+        out.write(_header(fmt))
+        for count, text in _serialize(fmt, _chunks(contacts, chunk_size), workers):
+            out.write(text)
+            exported += count
+    return exported
@@ -0,0 +1,278 @@
+# app/indexes.py
+
+"""
+In-memory secondary indexes for the Phone Book business logic layer.
+"""
+
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from app.models import Contact
+from app.utils import normalize_phone, normalize_text
+
+_EMPTY: frozenset[str] = frozenset()
+
+
+class FieldIndex:
+    """
+    Hash index mapping a normalized attribute value to contact IDs.
+    """
+
+    def __init__(self, attribute: str):
+        """
+        Initialize an empty index over a Contact attribute.
+
+        Args:
+            attribute (str): Name of the Contact attribute to index.
+        """
+        self.attribute = attribute
+        self._buckets: dict[str, set[str]] = {}
+
+    @staticmethod
+    def key(value: str | None) -> str:
+        """Return the normalized lookup key for a value."""
+        return normalize_text(value or "")
+
+    def add(self, contact: Contact) -> None:
+        """Register a contact under its current attribute value."""
+        key = self.key(getattr(contact, self.attribute))
+        self._buckets.setdefault(key, set()).add(contact.id)
+
+    def remove(self, contact: Contact) -> None:
+        """
+        Unregister a contact. Must be called before the attribute changes,
+        so the contact is removed from the bucket it was stored in.
+        """
+        key = self.key(getattr(contact, self.attribute))
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return
+
+        bucket.discard(contact.id)
+        if not bucket:
+            del self._buckets[key]
+
+    def get(self, value: str) -> frozenset[str] | set[str]:
+        """Return IDs of contacts whose attribute equals value (case-insensitive)."""
+        return self._buckets.get(self.key(value), _EMPTY)
+
+    def __len__(self) -> int:
+        """Return the number of distinct indexed values."""
+        return len(self._buckets)
+
+
+class FuzzyIndex(FieldIndex):
+    """
+    FieldIndex with a trigram index over its distinct values for fuzzy search.
+
+    Only values sharing at least one trigram with the query are scored,
+    with the SequenceMatcher ratio difflib.get_close_matches uses, so a
+    fraction of the values is compared instead of the whole book.
+
+    The pre-filter is an approximation: a value can reach the cutoff
+    without sharing a trigram when all its matching blocks are at most two
+    characters long (e.g. "abxcdy" and "zabwcdv", ratio 0.62), and such a
+    value is missed. Misspelled surnames keep longer runs, and on
+    realistic books the results equal get_close_matches (see the tests).
+    """
+
+    def __init__(self, attribute: str):
+        super().__init__(attribute)
+        self._grams: dict[str, set[str]] = {}
+
+    @staticmethod
+    def grams(key: str) -> set[str]:
+        """Return padded trigrams of a normalized value."""
+        padded = f"  {key} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def add(self, contact: Contact) -> None:
+        key = self.key(getattr(contact, self.attribute))
+        if key not in self._buckets:
+            for gram in self.grams(key):
+                self._grams.setdefault(gram, set()).add(key)
+        super().add(contact)
+
+    def remove(self, contact: Contact) -> None:
+        super().remove(contact)
+        key = self.key(getattr(contact, self.attribute))
+        if key in self._buckets:
+            return
+
+        for gram in self.grams(key):
+            keys = self._grams.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._grams[gram]
+
+    def search(
+        self, query: str, cutoff: float = 0.6, limit: int | None = 3
+    ) -> list[tuple[float, str]]:
+        """
+        Return up to limit (score, value) pairs with score >= cutoff,
+        best matches first.
+        """
+        query = self.key(query)
+        if not query:
+            return []
+
+        candidates: set[str] = set()
+        for gram in self.grams(query):
+            candidates |= self._grams.get(gram, _EMPTY)
+
+        # Imported on first search to keep startup fast.
+        from difflib import SequenceMatcher
+
+        matcher = SequenceMatcher()
+        matcher.set_seq2(query)
+        scored = []
+        for key in candidates:
+            matcher.set_seq1(key)
+            if (
+                matcher.real_quick_ratio() >= cutoff
+                and matcher.quick_ratio() >= cutoff
+                and matcher.ratio() >= cutoff
+            ):
+                scored.append((matcher.ratio(), key))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return scored[:limit] if limit is not None else scored
+
+    def ids(self, key: str) -> frozenset[str] | set[str]:
+        """Return IDs stored under an already normalized key."""
+        return self._buckets.get(key, _EMPTY)
+
+
+class PhoneIndex:
+    """
+    Phone number index supporting prefix and substring lookups.
+
+    Numbers are normalized to digits. Distinct numbers are kept in a sorted
+    list for prefix search with bisect, and in n-gram posting lists for
+    substring search, so a query only verifies a few candidate numbers.
+    """
+
+    def __init__(self, gram: int = 3):
+        """
+        Initialize an empty phone index.
+
+        Args:
+            gram (int): Length of the n-grams used for substring search.
+        """
+        self.gram = gram
+        self._owners: dict[str, set[str]] = {}
+        # Numbers each contact is registered under, so remove() does not
+        # depend on the contact's phones being unchanged.
+        self._registered: dict[str, set[str]] = {}
+        self._sorted: list[str] = []
+        self._postings: dict[str, set[str]] = {}
+        self._short: set[str] = set()
+        self._bulk = False
+
+    @contextmanager
+    def bulk(self):
+        """
+        Add many contacts at once: new numbers are appended and the sorted
+        list is sorted once when the block exits, instead of an insort each.
+        """
+        self._bulk = True
+        try:
+            yield self
+        finally:
+            self._bulk = False
+            self._sorted.sort()
+
+    def _grams(self, number: str) -> set[str]:
+        n = self.gram
+        return {number[i:i + n] for i in range(len(number) - n + 1)}
+
+    def _numbers(self, contact: Contact) -> set[str]:
+        numbers = {normalize_phone(p) for p in contact.phones.values()}
+        numbers.discard("")
+        return numbers
+
+    def add(self, contact: Contact) -> None:
+        """Register all phone numbers of a contact."""
+        numbers = self._numbers(contact)
+        if numbers:
+            self._registered.setdefault(contact.id, set()).update(numbers)
+        for number in numbers:
+            owners = self._owners.get(number)
+            if owners is None:
+                owners = self._owners[number] = set()
+                if self._bulk:
+                    self._sorted.append(number)
+                else:
+                    insort(self._sorted, number)
+                if len(number) < self.gram:
+                    self._short.add(number)
+                for gram in self._grams(number):
+                    self._postings.setdefault(gram, set()).add(number)
+            owners.add(contact.id)
+
+    def remove(self, contact: Contact) -> None:
+        """Unregister a contact from every number it was added under."""
+        for number in self._registered.pop(contact.id, ()):
+            owners = self._owners.get(number)
+            if owners is None:
+                continue
+
+            owners.discard(contact.id)
+            if owners:
+                continue
+
+            del self._owners[number]
+            if self._bulk:
+                self._sorted.remove(number)
+            else:
+                del self._sorted[bisect_left(self._sorted, number)]
+            self._short.discard(number)
+            for gram in self._grams(number):
+                posting = self._postings[gram]
+                posting.discard(number)
+                if not posting:
+                    del self._postings[gram]
+
+    def _collect(self, numbers) -> set[str]:
+        ids: set[str] = set()
+        for number in numbers:
+            ids |= self._owners[number]
+        return ids
+
+    def get(self, number: str) -> frozenset[str] | set[str]:
+        """Return IDs of contacts having exactly this (normalized) number."""
+        return self._owners.get(normalize_phone(number), _EMPTY)
+
+    def prefix(self, query: str) -> set[str]:
+        """Return IDs of contacts having a number that starts with query."""
+        query = normalize_phone(query)
+        if not query:
+            return set()
+
+        start = bisect_left(self._sorted, query)
+        end = bisect_left(self._sorted, query[:-1] + chr(ord(query[-1]) + 1), start)
+        return self._collect(self._sorted[start:end])
+
+    def search(self, query: str) -> set[str]:
+        """Return IDs of contacts having a number that contains query."""
+        query = normalize_phone(query)
+        if not query:
+            return set()
+
+        if len(query) < self.gram:
+            # Every longer match contains query inside one of its n-grams.
+            candidates = set(self._short)
+            for gram, numbers in self._postings.items():
+                if query in gram:
+                    candidates |= numbers
+        else:
+            postings = sorted(
+                (self._postings.get(g, _EMPTY) for g in self._grams(query)), key=len
+            )
+            candidates = set(postings[0]).intersection(*postings[1:])
+
+        return self._collect(n for n in candidates if query in n)
+
+    def __len__(self) -> int:
+        """Return the number of distinct indexed numbers."""
+        return len(self._owners)
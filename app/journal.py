@@ -0,0 +1,277 @@
+# app/journal.py
+
+"""
+Journaled JSON persistence.
+
+Mutations are appended as compact one-line records to a write-ahead
+journal next to the JSON snapshot, so the cost of an edit is proportional
+to the size of the change rather than to the size of the whole book.
+
+Several processes may share one book: writes take an advisory file lock,
+and changes made by others are picked up by reading only the journal tail
+written since the last sync. A full reload is needed only after the
+snapshot was rewritten (compaction).
+"""
+
+import json
+import os
+from collections.abc import Iterator
+from app.backup import BackupPolicy
+from app.locking import FileLock
+from app.logger import logger
+from app.metrics import metrics, timed
+from app.models import Contact
+from app.repository import ExternalChanges, SharedRepository
+from app.storage import JSONStorage, fsync_directory
+
+
+def _fold(records: list[dict], into: dict[str, Contact | None]) -> dict[str, Contact | None]:
+    """Fold journal records into id -> latest Contact (None if deleted)."""
+    for record in records:
+        op = record.get("op")
+        if op in ("add", "update"):
+            contact = Contact.from_storage(record["contact"])
+            into[contact.id] = contact
+        elif op == "delete":
+            into[record.get("id")] = None
+    return into
+
+
+class JournalStorage(JSONStorage, SharedRepository):
+    """
+    JSONStorage with an append-only journal of add/update/delete records.
+
+    The journal is folded into the base JSON file by compact(), which runs
+    automatically once compact_every records have been appended.
+    """
+
+    def __init__(
+        self,
+        filepath: str,
+        compact_every: int = 1000,
+        backup_policy: BackupPolicy | None = None,
+        durability: str = "fsync",
+        snapshot_cache: bool = False,
+    ):
+        """
+        Initialize journaled storage.
+
+        Args:
+            filepath (str): Path to the base JSON snapshot.
+            compact_every (int): Number of journal records that triggers
+                an automatic compaction. 0 disables auto-compaction.
+            backup_policy (BackupPolicy | None): Backup policy for the snapshot.
+            durability (str): One of DURABILITY_LEVELS, applied to the
+                snapshot and to every journal append.
+            snapshot_cache (bool): Keep a binary cache of the parsed snapshot.
+        """
+        super().__init__(filepath, backup_policy, durability, snapshot_cache)
+        self.journal_path = f"{filepath}.journal"
+        self.compact_every = compact_every
+        self._file_lock = FileLock(f"{filepath}.lock")
+
+        # What this instance has seen: snapshot identity and journal bytes read.
+        self._stamp: tuple | None = None
+        self._offset = 0
+
+        with self._file_lock():
+            self._records = self._recover_journal()
+
+    def _recover_journal(self) -> int:
+        """
+        Drop a torn trailing record left by a crash mid-append, so the next
+        append starts on a fresh line, and return the number of records.
+        """
+        if not os.path.exists(self.journal_path):
+            return 0
+
+        with open(self.journal_path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                data = data[: data.rfind(b"\n") + 1]
+                f.truncate(len(data))
+
+        return data.count(b"\n")
+
+    def _snapshot_stamp(self) -> tuple | None:
+        """Identity of the snapshot file; changes whenever it is rewritten."""
+        try:
+            st = os.stat(self.filepath)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _journal_size(self) -> int:
+        try:
+            return os.path.getsize(self.journal_path)
+        except FileNotFoundError:
+            return 0
+
+    def _read_journal(self, offset: int = 0) -> tuple[list[dict], int]:
+        """
+        Read complete records starting at a byte offset.
+        A torn last line (e.g. after a crash mid-append) is ignored.
+
+        Returns:
+            tuple[list[dict], int]: Records and the offset after the last complete one.
+        """
+        try:
+            with open(self.journal_path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], 0
+
+        data = data[: data.rfind(b"\n") + 1]
+        metrics.add_bytes("read", "journal", len(data))
+        records = []
+        for line in data.splitlines():
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return records, offset + len(data)
+
+    def lock(self, shared: bool = False):
+        """Hold the inter-process lock of this book."""
+        return self._file_lock(shared)
+
+    @timed("journal.append")
+    def _append(self, *records: dict) -> None:
+        """Append compact records to the journal in a single write."""
+        data = "".join(
+            json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for record in records
+        ).encode("utf-8")
+
+        with self._file_lock():
+            size = self._journal_size()
+            caught_up = self._offset == size and self._stamp == self._snapshot_stamp()
+
+            with open(self.journal_path, "ab") as f:
+                f.write(data)
+                metrics.add_bytes("written", "journal", len(data))
+                if self.durability != "none":
+                    f.flush()
+                    os.fsync(f.fileno())
+            if not size and self.durability == "full":
+                fsync_directory(os.path.dirname(self.journal_path) or ".")
+
+            if caught_up:
+                self._offset = size + len(data)
+            self._records += len(records)
+            if self.compact_every and self._records >= self.compact_every:
+                try:
+                    self.compact()
+                except (json.JSONDecodeError, OSError) as e:
+                    # The records are safely in the journal; keep it until compaction can succeed.
+                    logger.error("Journal compaction of %s failed: %s", self.filepath, e)
+
+    def _truncate_journal(self) -> None:
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._records = 0
+
+    def _pending(self) -> dict[str, Contact | None]:
+        """Fold the whole journal into id -> latest Contact (None if deleted)."""
+        return _fold(self._read_journal()[0], {})
+
+    def iter_all(self) -> Iterator[Contact]:
+        """
+        Stream the JSON snapshot with journal records applied on the fly.
+        Only the journal, not the snapshot, is held in memory.
+        """
+        with self._file_lock(shared=True):
+            self._stamp = self._snapshot_stamp()
+            records, self._offset = self._read_journal()
+            pending = _fold(records, {})
+
+            for contact in super().iter_all():
+                if contact.id in pending:
+                    contact = pending.pop(contact.id)
+                    if contact is None:
+                        continue
+                yield contact
+
+            for contact in pending.values():
+                if contact is not None:
+                    yield contact
+
+    def get_all(self) -> list[Contact]:
+        """
+        Load the JSON snapshot and replay the journal on top of it.
+
+        Returns:
+            list[Contact]: Current list of contacts.
+        """
+        try:
+            return list(self.iter_all())
+        except (json.JSONDecodeError, OSError):
+            return [c for c in self._pending().values() if c is not None]
+
+    @timed("journal.changes")
+    def changes(self) -> ExternalChanges:
+        """
+        Return changes written by other processes since the last load or sync.
+        Only the new journal tail is read unless the snapshot was rewritten.
+        """
+        with self._file_lock(shared=True):
+            if self._stamp != self._snapshot_stamp() or self._journal_size() < self._offset:
+                return ExternalChanges({c.id: c for c in self.get_all()}, reload=True)
+
+            records, self._offset = self._read_journal(self._offset)
+            self._records += len(records)
+            return ExternalChanges(_fold(records, {}))
+
+    def save_all(self, contacts: list[Contact]) -> None:
+        """
+        Rewrite the base snapshot and discard the now redundant journal.
+
+        Args:
+            contacts (list[Contact]): The list of contacts to save.
+        """
+        with self._file_lock():
+            super().save_all(contacts)
+            self._truncate_journal()
+            self._stamp = self._snapshot_stamp()
+            self._offset = 0
+
+    @timed("journal.compact")
+    def compact(self) -> None:
+        """
+        Fold the journal into the base JSON file.
+
+        Unlike get_all(), an unreadable snapshot is an error here: writing
+        the journal-only fallback would replace the snapshot's contacts.
+
+        Raises:
+            json.JSONDecodeError: If the snapshot cannot be parsed.
+            OSError: If the snapshot cannot be read.
+        """
+        with self._file_lock():
+            if self._records or os.path.exists(self.journal_path):
+                self.save_all(list(self.iter_all()))
+
+    def insert(self, contact: Contact) -> None:
+        self._append({"op": "add", "contact": contact.to_dict()})
+
+    def insert_many(self, contacts: list[Contact]) -> None:
+        self._append(*({"op": "add", "contact": c.to_dict()} for c in contacts))
+
+    def apply_changes(
+        self,
+        inserts: list[Contact],
+        updates: list[Contact],
+        deletes: list[str],
+    ) -> None:
+        self._append(
+            *({"op": "add", "contact": c.to_dict()} for c in inserts),
+            *({"op": "update", "contact": c.to_dict()} for c in updates),
+            *({"op": "delete", "id": cid} for cid in deletes),
+        )
+
+    def update(self, contact: Contact) -> None:
+        self._append({"op": "update", "contact": contact.to_dict()})
+
+    def delete(self, contact_id: str) -> None:
+        self._append({"op": "delete", "id": contact_id})
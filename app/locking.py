@@ -0,0 +1,92 @@
+# app/locking.py
+
+"""
+Advisory inter-process file locks.
+
+Uses fcntl.flock where available (Linux, macOS). On platforms without
+fcntl the lock only serializes threads of the current process.
+"""
+
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - e.g. Windows
+    fcntl = None
+
+
+class FileLock:
+    """
+    Reentrant advisory lock on a lock file.
+
+    Nested acquisitions from the same thread keep the mode of the outermost
+    one, so a shared lock cannot be upgraded to an exclusive one.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Path of the lock file, created on first use.
+        """
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._fd: int | None = None
+        self._depth = 0
+        self._shared = False
+
+    def acquire(self, shared: bool = False) -> None:
+        self._thread_lock.acquire()
+        if self._depth:
+            if self._shared and not shared:
+                self._thread_lock.release()
+                raise RuntimeError("Cannot upgrade a shared lock to an exclusive one")
+            self._depth += 1
+            return
+
+        try:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        except BaseException:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            self._thread_lock.release()
+            raise
+
+        self._depth = 1
+        self._shared = shared
+
+    def release(self) -> None:
+        self._depth -= 1
+        if not self._depth:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+    def __call__(self, shared: bool = False) -> "_Held":
+        """Return a context manager holding the lock in the given mode."""
+        return _Held(self, shared)
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+
+class _Held:
+    def __init__(self, lock: FileLock, shared: bool):
+        self._lock = lock
+        self._shared = shared
+
+    def __enter__(self) -> FileLock:
+        self._lock.acquire(self._shared)
+        return self._lock
+
+    def __exit__(self, *exc) -> None:
+        self._lock.release()
@@ -3,27 +3,148 @@
 """
 Конфігурація логування для застосунку Phone Book CLI.
 
-Цей модуль налаштовує:
-- логування в консоль
-- логування у файл (data/phonebook.log)
+Цей модуль надає:
 - єдиний логер, який використовується в усьому застосунку
+- setup_logging() для явного налаштування обробників (консоль,
+  файл data/phonebook.log з ротацією за розміром, опційно JSON-формат)
+
+Імпорт модуля нічого не налаштовує і не створює файлів. Записи
+потрапляють у чергу (QueueHandler), а в консоль і файл їх пише окремий
+потік (QueueListener), тож виклик логера не блокується на дисковому I/O.
 
 Логер слід імпортувати в інші модулі, а не налаштовувати заново.
 """
 
+import atexit
+import json
 import logging
 import os
+import queue
 
-if not os.path.exists('data'):
-    os.makedirs('data')
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(name)s | %(levelname)s | %(message)s",
-    handlers=[
-        logging.FileHandler("data/phonebook.log", encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+LOG_FILE = "data/phonebook.log"
+LOG_FORMAT = "%(asctime)s | %(name)s | %(levelname)s | %(message)s"
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 3
 
 logger = logging.getLogger("PhoneBookApp")
+
+_listener = None
+_queue_handler: logging.Handler | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Форматує запис як один JSON-об'єкт у рядку (для збирачів логів).
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _Handoff(logging.Handler):
+    """
+    Кладе записи в чергу, лише підставивши аргументи в повідомлення:
+    форматування (час, JSON) і запис виконує потік слухача, а не викликач.
+    """
+
+    def __init__(self, records: queue.SimpleQueue):
+        super().__init__()
+        self.records = records
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.records.put_nowait(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Трасування не можна передати між потоками після виходу з except.
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(
+    level: str | int = "INFO",
+    log_file: str | None = LOG_FILE,
+    console: bool = True,
+    json_format: bool = False,
+    max_bytes: int = MAX_BYTES,
+    backup_count: int = BACKUP_COUNT,
+) -> "logging.handlers.QueueListener":
+    """
+    Налаштовує асинхронне логування кореневого логера.
+
+    Повторний виклик замінює попереднє налаштування.
+
+    :param level: рівень логування ("DEBUG", "INFO", ... або число)
+    :param log_file: шлях до файлу логів; None — без файлу
+    :param console: чи писати логи в консоль (stderr)
+    :param json_format: писати записи як JSON-рядки
+    :param max_bytes: розмір файлу, після якого він ротується
+    :param backup_count: скільки ротованих файлів зберігати
+    :return: запущений QueueListener
+    """
+    # logging.handlers тягне socket, pickle тощо — імпортуємо лише при налаштуванні.
+    from logging.handlers import QueueListener, RotatingFileHandler
+
+    global _listener, _queue_handler
+    shutdown_logging()
+
+    formatter = JsonFormatter() if json_format else logging.Formatter(LOG_FORMAT)
+    handlers: list[logging.Handler] = []
+    if log_file:
+        directory = os.path.dirname(log_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handlers.append(
+            RotatingFileHandler(
+                log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+            )
+        )
+    if console:
+        handlers.append(logging.StreamHandler())
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = _Handoff(records)
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+
+    _listener = QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """
+    Дописує записи, що залишились у черзі, і зупиняє потік логування.
+    """
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
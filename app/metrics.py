@@ -0,0 +1,255 @@
+# app/metrics.py
+
+"""
+Lightweight instrumentation of hot paths: operation counts, latency
+histograms, errors and bytes read/written by storages.
+
+Metrics are disabled by default. While disabled, an instrumented call
+costs one attribute check, and nothing is recorded. Collected metrics can
+be logged as a summary or written in the Prometheus text format, once or
+periodically.
+"""
+
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from app.logger import logger
+
+# Upper bounds of latency buckets in seconds; the last bucket is +Inf.
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+_DISABLED = nullcontext()
+
+
+class Histogram:
+    """Latency histogram with fixed buckets."""
+
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (inf if above all buckets)."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Metrics:
+    """
+    Registry of operation timings and counters.
+
+    Operation names are dotted, e.g. "phonebook.commit" or "json.save_all".
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._timings: dict[str, Histogram] = {}
+        self._errors: dict[str, int] = {}
+        # (direction, source) -> bytes, direction is "read" or "written".
+        self._bytes: dict[tuple[str, str], int] = {}
+        self._reporter: threading.Timer | None = None
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._timings.clear()
+            self._errors.clear()
+            self._bytes.clear()
+
+    def observe(self, operation: str, seconds: float, failed: bool = False) -> None:
+        """Record one call of an operation."""
+        with self._lock:
+            histogram = self._timings.get(operation)
+            if histogram is None:
+                histogram = self._timings[operation] = Histogram()
+            histogram.observe(seconds)
+            if failed:
+                self._errors[operation] = self._errors.get(operation, 0) + 1
+
+    def add_bytes(self, direction: str, source: str, amount: int) -> None:
+        """Count bytes read or written by a storage."""
+        if not self.enabled:
+            return
+        with self._lock:
+            key = (direction, source)
+            self._bytes[key] = self._bytes.get(key, 0) + amount
+
+    def snapshot(self) -> dict:
+        """
+        Return collected metrics as plain data:
+        {"operations": {name: {"count", "errors", "total", "p50", "p99", "buckets"}},
+         "bytes": {"read": {source: n}, "written": {source: n}}}
+        """
+        with self._lock:
+            operations = {
+                name: {
+                    "count": h.count,
+                    "errors": self._errors.get(name, 0),
+                    "total": h.total,
+                    "p50": h.quantile(0.5),
+                    "p99": h.quantile(0.99),
+                    "buckets": list(h.counts),
+                }
+                for name, h in sorted(self._timings.items())
+            }
+            transferred: dict[str, dict[str, int]] = {"read": {}, "written": {}}
+            for (direction, source), amount in sorted(self._bytes.items()):
+                transferred.setdefault(direction, {})[source] = amount
+        return {"operations": operations, "bytes": transferred}
+
+    def summary(self) -> str:
+        """Human-readable one-line-per-operation summary."""
+        data = self.snapshot()
+        lines = []
+        for name, op in data["operations"].items():
+            average = op["total"] / op["count"] * 1e3
+            lines.append(
+                f"{name}: {op['count']} calls, {op['errors']} errors, avg {average:.3f} ms, "
+                f"p50 <= {op['p50'] * 1e3:g} ms, p99 <= {op['p99'] * 1e3:g} ms"
+            )
+        for direction, sources in data["bytes"].items():
+            for source, amount in sources.items():
+                lines.append(f"{source} bytes {direction}: {amount}")
+        return "\n".join(lines)
+
+    def log_summary(self) -> None:
+        summary = self.summary()
+        if summary:
+            logger.info("Metrics:\n%s", summary)
+
+    def render_prometheus(self) -> str:
+        """Collected metrics in the Prometheus text exposition format."""
+        data = self.snapshot()
+        lines = [
+            "# HELP phonebook_operation_seconds Latency of instrumented operations.",
+            "# TYPE phonebook_operation_seconds histogram",
+        ]
+        for name, op in data["operations"].items():
+            cumulative = 0
+            for bound, count in zip((*BUCKETS, "+Inf"), op["buckets"]):
+                cumulative += count
+                lines.append(
+                    f'phonebook_operation_seconds_bucket{{operation="{name}",le="{bound}"}} {cumulative}'
+                )
+            lines.append(f'phonebook_operation_seconds_sum{{operation="{name}"}} {op["total"]:.6f}')
+            lines.append(f'phonebook_operation_seconds_count{{operation="{name}"}} {op["count"]}')
+
+        lines += [
+            "# HELP phonebook_operation_errors_total Instrumented operations that raised.",
+            "# TYPE phonebook_operation_errors_total counter",
+        ]
+        for name, op in data["operations"].items():
+            lines.append(f'phonebook_operation_errors_total{{operation="{name}"}} {op["errors"]}')
+
+        lines += [
+            "# HELP phonebook_storage_bytes_total Bytes read and written by storages.",
+            "# TYPE phonebook_storage_bytes_total counter",
+        ]
+        for direction, sources in data["bytes"].items():
+            for source, amount in sources.items():
+                lines.append(
+                    f'phonebook_storage_bytes_total{{direction="{direction}",source="{source}"}} {amount}'
+                )
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        """Write the Prometheus text file atomically (for node_exporter's textfile collector)."""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp, path)
+
+    def start_reporter(self, interval: float = 60.0, path: str | None = None) -> None:
+        """
+        Enable metrics and every interval seconds log a summary and,
+        if path is given, rewrite the Prometheus text file.
+        """
+        self.enable()
+        self.stop_reporter()
+
+        def tick():
+            self.report(path)
+            self.start_reporter(interval, path)
+
+        self._reporter = threading.Timer(interval, tick)
+        self._reporter.daemon = True
+        self._reporter.start()
+
+    def stop_reporter(self) -> None:
+        if self._reporter is not None:
+            self._reporter.cancel()
+            self._reporter = None
+
+    def report(self, path: str | None = None) -> None:
+        self.log_summary()
+        if path:
+            try:
+                self.write_prometheus(path)
+            except OSError as e:
+                logger.error("Cannot write metrics to %s: %s", path, e)
+
+
+metrics = Metrics()
+
+
+def timed(operation: str):
+    """Decorator recording latency and failures of each call when metrics are enabled."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                metrics.observe(operation, time.perf_counter() - start, failed)
+
+        return wrapper
+
+    return decorator
+
+
+def measure(operation: str):
+    """Context manager form of timed() for code blocks."""
+    if not metrics.enabled:
+        return _DISABLED
+    return _measure(operation)
+
+
+@contextmanager
+def _measure(operation: str):
+    start = time.perf_counter()
+    failed = True
+    try:
+        yield
+        failed = False
+    finally:
+        metrics.observe(operation, time.perf_counter() - start, failed)
@@ -3,15 +3,76 @@
 Моделі даних для Phone Book CLI.
 """
 
-from uuid import uuid4
+import sys
 from datetime import datetime, UTC
 
 
+def _new_id() -> str:
+    """Генерує новий ID; uuid імпортується лише тут, щоб не сповільнювати запуск."""
+    from uuid import uuid4
+
+    return str(uuid4())
+
+
+# Поля, які можна змінити через Contact.update() (усі, крім id).
+UPDATABLE_FIELDS = ("first_name", "last_name", "phones", "city", "job", "created_at")
+_CLEAN: frozenset[str] = frozenset()
+
+
+def _intern(value: str) -> str:
+    """Інтернує короткі рядки, що часто повторюються (місто, професія)."""
+    return sys.intern(value) if value else ""
+
+
+def check_updates(updates: dict) -> None:
+    """
+    Перевіряє типи значень для Contact.update(), щоб некоректні дані
+    (наприклад, JSON від клієнта) не потрапили в контакт.
+
+    :param updates: нові значення полів
+    :raises TypeError: якщо updates не словник, телефони не словник рядків
+        або текстове поле не рядок
+    """
+    if not isinstance(updates, dict):
+        raise TypeError("Updates must be a dict")
+    for field, value in updates.items():
+        if field not in UPDATABLE_FIELDS:
+            continue
+        if field == "phones":
+            if not isinstance(value, dict) or not all(
+                isinstance(k, str) and isinstance(v, str) for k, v in value.items()
+            ):
+                raise TypeError("phones must map labels to number strings")
+        elif not isinstance(value, str):
+            raise TypeError(f"{field} must be a string")
+
+
+def _differs(current, value) -> bool:
+    """
+    Чи змінює value поле. Той самий змінюваний об'єкт (словник телефонів,
+    відредагований на місці) вважається зміною: порівняти його з попереднім
+    станом уже неможливо.
+    """
+    return current is value and isinstance(value, dict) or current != value
+
+
 class Contact:
     """
     Клас, що представляє контакт телефонної книги.
+
+    __slots__ прибирає __dict__ у кожного екземпляра, а місто й професія
+    інтернуються, тож однакові значення зберігаються в пам'яті один раз.
+
+    Зміни, зроблені через update(), відстежуються: dirty_fields містить
+    поля, змінені після останнього збереження (mark_clean()), а version
+    зростає з кожною зміною. Пряме присвоєння атрибутів не відстежується.
     """
 
+    __slots__ = (
+        "id", "first_name", "last_name", "phones", "city", "job", "created_at",
+        "version", "_dirty",
+    )
+
     def __init__(
         self,
         first_name: str,
@@ -22,13 +83,47 @@ class Contact:
         contact_id: str | None = None,
         created_at: str | None = None,
     ):
-        self.id = contact_id or str(uuid4())
+        self.id = contact_id or _new_id()
         self.first_name = first_name.capitalize()
         self.last_name = last_name.capitalize()
         self.phones = phones
-        self.city = city.capitalize() if city else ""
-        self.job = job.capitalize() if job else ""
+        self.city = _intern(city.capitalize()) if city else ""
+        self.job = _intern(job.capitalize()) if job else ""
         self.created_at = created_at or datetime.now(UTC).isoformat()
+        self.version = 0
+        self._dirty = _CLEAN
+
+    @property
+    def dirty_fields(self) -> frozenset[str]:
+        """Поля, змінені через update() після останнього mark_clean()."""
+        return self._dirty
+
+    def update(self, updates: dict) -> frozenset[str]:
+        """
+        Застосовує зміни полів і запам'ятовує, які з них справді змінились.
+        Невідомі поля та id ігноруються.
+
+        :param updates: нові значення полів
+        :return: змінені поля (порожня множина, якщо нічого не змінилось)
+        :raises TypeError: див. check_updates()
+        """
+        check_updates(updates)
+        changed = frozenset(
+            field for field, value in updates.items()
+            if field in UPDATABLE_FIELDS and _differs(getattr(self, field), value)
+        )
+        if changed:
+            for field in changed:
+                value = updates[field]
+                # Копія, щоб подальші зміни словника викликачем не минали update().
+                setattr(self, field, dict(value) if isinstance(value, dict) else value)
+            self._dirty |= changed
+            self.version += 1
+        return changed
+
+    def mark_clean(self) -> None:
+        """Позначає контакт збереженим: dirty_fields очищується."""
+        self._dirty = _CLEAN
 
     def to_dict(self) -> dict:
         """Перетворює Contact у словник (для JSON / CSV)."""
@@ -42,6 +137,46 @@ class Contact:
             "created_at": self.created_at,
         }
 
+    @classmethod
+    def from_trusted(
+        cls,
+        contact_id: str,
+        first_name: str,
+        last_name: str,
+        phones: dict,
+        city: str = "",
+        job: str = "",
+        created_at: str | None = None,
+    ) -> "Contact":
+        """
+        Створює Contact з уже нормалізованих даних (напр. зі сховища),
+        не викликаючи __init__ і не повторюючи capitalize().
+        """
+        contact = cls.__new__(cls)
+        contact.id = contact_id
+        contact.first_name = first_name
+        contact.last_name = last_name
+        contact.phones = phones
+        contact.city = _intern(city)
+        contact.job = _intern(job)
+        contact.created_at = created_at
+        contact.version = 0
+        contact._dirty = _CLEAN
+        return contact
+
+    @classmethod
+    def from_storage(cls, data: dict) -> "Contact":
+        """Створює Contact зі словника, збереженого самим застосунком."""
+        return cls.from_trusted(
+            data.get("id") or _new_id(),
+            data.get("first_name", ""),
+            data.get("last_name", ""),
+            data.get("phones", {}),
+            data.get("city", ""),
+            data.get("job", ""),
+            data.get("created_at") or datetime.now(UTC).isoformat(),
+        )
+
     @classmethod
     def from_dict(cls, data: dict) -> "Contact":
         """Створює Contact зі словника."""
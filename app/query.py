@@ -0,0 +1,196 @@
+# app/query.py
+
+"""
+Multi-criteria contact queries.
+
+A query is a conjunction of predicates, e.g.
+
+    city=Kyiv AND job~engineer AND phone^380
+
+Each predicate is <field><operator><value>:
+    =   equals (case-insensitive; for phone: the same digits)
+    ~   contains
+    ^   starts with
+Fields: id, first_name, last_name, city, job, phone. Values containing
+spaces can be quoted: city="Ivano-Frankivsk" AND first_name='Lesya'.
+
+PhoneBook.query() plans a query: predicates answerable from an index are
+evaluated first and their ID sets intersected smallest-first, and only the
+remaining predicates are checked contact by contact. Without any indexed
+predicate the whole book is scanned in chunks, optionally in a process pool.
+"""
+
+import re
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
+from app.models import Contact
+from app.utils import normalize_phone, normalize_text
+
+FIELDS = ("id", "first_name", "last_name", "city", "job", "phone")
+OPERATORS = ("=", "~", "^")
+SCAN_CHUNK_SIZE = 20_000
+
+_AND = re.compile(r"\s+AND\s+(?=(?:[^\"']*[\"'][^\"']*[\"'])*[^\"']*$)", re.IGNORECASE)
+_PREDICATE = re.compile(r"^\s*(\w+)\s*([=~^])\s*(.*?)\s*$", re.DOTALL)
+
+
+class QueryError(ValueError):
+    """Raised for a query that cannot be parsed."""
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """One condition of a query; value is stored normalized."""
+
+    field: str
+    op: str
+    value: str
+
+    def matches(self, contact: Contact) -> bool:
+        return _test(self)(contact)
+
+
+def _text_test(field: str, op: str, value: str) -> Callable[[Contact], bool]:
+    get = attrgetter(field)
+    if op == "=":
+        return lambda c: (get(c) or "").strip().lower() == value
+    if op == "~":
+        return lambda c: value in (get(c) or "").lower()
+    return lambda c: (get(c) or "").lstrip().lower().startswith(value)
+
+
+def _id_test(op: str, value: str) -> Callable[[Contact], bool]:
+    if op == "=":
+        return lambda c: c.id == value
+    if op == "~":
+        return lambda c: value in c.id
+    return lambda c: c.id.startswith(value)
+
+
+def _phone_test(op: str, value: str) -> Callable[[Contact], bool]:
+    if op == "=":
+        return lambda c: any(normalize_phone(p) == value for p in c.phones.values())
+    if op == "~":
+        return lambda c: any(value in normalize_phone(p) for p in c.phones.values())
+    return lambda c: any(normalize_phone(p).startswith(value) for p in c.phones.values())
+
+
+@lru_cache(maxsize=256)
+def _test(predicate: Predicate) -> Callable[[Contact], bool]:
+    """The check of one predicate, built once per distinct predicate."""
+    field, op, value = predicate.field, predicate.op, predicate.value
+    if field not in FIELDS or op not in OPERATORS:
+        raise QueryError(f"Invalid predicate {predicate!r}")
+    if field == "id":
+        return _id_test(op, value)
+    if field == "phone":
+        return _phone_test(op, value)
+    return _text_test(field, op, value)
+
+
+def matcher(predicates: list[Predicate]) -> Callable[[Contact], bool]:
+    """
+    Return a function telling whether a contact satisfies all predicates.
+
+    Every predicate becomes a closure over its value; a single predicate
+    is returned as is, several are checked in order until one fails.
+    """
+    tests = [_test(p) for p in predicates]
+    if not tests:
+        return lambda c: True
+    if len(tests) == 1:
+        return tests[0]
+
+    def match(contact: Contact) -> bool:
+        for test in tests:
+            if not test(contact):
+                return False
+        return True
+
+    return match
+
+
+def parse_query(text: str) -> list[Predicate]:
+    """
+    Parse "field<op>value AND ..." into predicates.
+
+    Raises:
+        QueryError: On an unknown field, operator or an empty value.
+    """
+    predicates = []
+    for clause in _AND.split(text.strip()):
+        match = _PREDICATE.match(clause)
+        if not match:
+            raise QueryError(f"Cannot parse {clause!r}, expected field<op>value with op in {OPERATORS}")
+
+        field, op, value = match.groups()
+        field = field.lower()
+        if field not in FIELDS:
+            raise QueryError(f"Unknown field {field!r}, expected one of {FIELDS}")
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+
+        if field == "phone":
+            value = normalize_phone(value)
+        elif field != "id":
+            value = normalize_text(value)
+        if not value:
+            raise QueryError(f"Empty value in {clause!r}")
+
+        predicates.append(Predicate(field, op, value))
+    return predicates
+
+
+# Contacts being scanned, as seen by pool workers.
+_shared: list[Contact] = []
+
+
+def _share(contacts: list[Contact]) -> None:
+    global _shared
+    _shared = contacts
+
+
+def _match_range(predicates: list[Predicate], start: int, stop: int) -> list[int]:
+    """Positions of matching shared contacts in [start, stop) (runs in pool workers)."""
+    match = matcher(predicates)
+    contacts = _shared
+    return [i for i in range(start, stop) if match(contacts[i])]
+
+
+def scan(
+    contacts: list[Contact],
+    predicates: list[Predicate],
+    workers: int = 0,
+    chunk_size: int = SCAN_CHUNK_SIZE,
+) -> Iterator[Contact]:
+    """
+    Yield contacts matching all predicates, in input order.
+
+    With workers > 0 and more than one chunk, chunks are matched in a
+    process pool and results are yielded chunk by chunk as they complete
+    in order. Where fork is available, workers inherit contacts instead
+    of receiving a pickled copy, which would cost more than the matching.
+    """
+    if not predicates:
+        yield from contacts
+        return
+
+    if workers <= 0 or len(contacts) <= chunk_size:
+        yield from filter(matcher(predicates), contacts)
+        return
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    with ProcessPoolExecutor(workers, context, initializer=_share, initargs=(contacts,)) as pool:
+        futures = [
+            pool.submit(_match_range, predicates, start, min(start + chunk_size, len(contacts)))
+            for start in range(0, len(contacts), chunk_size)
+        ]
+        for future in futures:
+            for i in future.result():
+                yield contacts[i]
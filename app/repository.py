@@ -5,9 +5,59 @@ Repository abstractions for the Phone Book application.
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import AbstractContextManager
+from dataclasses import dataclass, field
 from app.models import Contact
 
 
+class ConflictError(Exception):
+    """
+    Raised when deferred changes conflict with changes written
+    by another process in the meantime.
+    """
+
+    def __init__(self, contact_ids: list[str], changes: "ExternalChanges"):
+        super().__init__(f"Contacts changed by another process: {', '.join(contact_ids)}")
+        self.contact_ids = contact_ids
+        self.changes = changes
+
+
+@dataclass
+class ExternalChanges:
+    """
+    Changes made by other processes since the last sync.
+
+    Attributes:
+        changed: id -> current Contact, or None if it was deleted.
+        reload: True if changed holds the whole book (the storage was
+            rewritten and could not be followed incrementally); contacts
+            missing from it no longer exist.
+    """
+
+    changed: dict[str, Contact | None] = field(default_factory=dict)
+    reload: bool = False
+
+
+@dataclass
+class ChangeSet:
+    """
+    Contacts changed since the last commit.
+
+    Attributes:
+        added: IDs of contacts added.
+        modified: IDs of existing contacts changed.
+        deleted: IDs of existing contacts deleted.
+    """
+
+    added: set[str] = field(default_factory=set)
+    modified: set[str] = field(default_factory=set)
+    deleted: set[str] = field(default_factory=set)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.deleted)
+
+
 class ContactRepository(ABC):
     """
     Abstract repository interface for managing contacts.
@@ -22,3 +72,72 @@ class ContactRepository(ABC):
     def save_all(self, contacts: list[Contact]) -> None:
         """Persist all contacts."""
         pass
+
+    def iter_all(self) -> Iterator[Contact]:
+        """
+        Yield contacts one at a time.
+
+        Storages that can stream from disk override this, so callers
+        do not hold the whole dataset in memory.
+        """
+        yield from self.get_all()
+
+
+class IncrementalRepository(ContactRepository):
+    """
+    Repository that can persist single-contact changes
+    without rewriting the whole collection.
+    """
+
+    @abstractmethod
+    def insert(self, contact: Contact) -> None:
+        """Persist a newly added contact."""
+        pass
+
+    def insert_many(self, contacts: list[Contact]) -> None:
+        """Persist a batch of newly added contacts."""
+        for contact in contacts:
+            self.insert(contact)
+
+    @abstractmethod
+    def update(self, contact: Contact) -> None:
+        """Persist the current state of an existing contact."""
+        pass
+
+    @abstractmethod
+    def delete(self, contact_id: str) -> None:
+        """Remove a contact by its ID."""
+        pass
+
+    def apply_changes(
+        self,
+        inserts: list[Contact],
+        updates: list[Contact],
+        deletes: list[str],
+    ) -> None:
+        """Persist a set of collected changes, ideally as one write."""
+        if inserts:
+            self.insert_many(inserts)
+        for contact in updates:
+            self.update(contact)
+        for contact_id in deletes:
+            self.delete(contact_id)
+
+
+class SharedRepository(IncrementalRepository):
+    """
+    Incremental repository that several processes may use at once.
+    """
+
+    @abstractmethod
+    def lock(self, shared: bool = False) -> AbstractContextManager:
+        """Return a context manager holding the inter-process lock."""
+        pass
+
+    @abstractmethod
+    def changes(self) -> ExternalChanges:
+        """
+        Return changes written by others since the last load or sync and
+        mark them as seen. Call while holding lock().
+        """
+        pass
@@ -0,0 +1,172 @@
+# app/service.py
+
+"""
+Asyncio JSON-over-TCP service exposing PhoneBook to concurrent clients.
+
+Protocol: one JSON object per line in each direction.
+    request:  {"id": 1, "op": "search_by_phone", "args": {"query": "067"}}
+    response: {"id": 1, "ok": true, "result": [...]}
+              {"id": 1, "ok": false, "error": "..."}
+
+PhoneBook calls run in a thread pool so the event loop never waits on
+storage; reads run under the book's lock and are materialized inside it. Mutations are applied in memory with persistence deferred and are
+group-committed: every flush persists all mutations finished before it
+started, and a write is acknowledged only after the flush that covers it.
+"""
+
+import asyncio
+import functools
+import json
+from concurrent.futures import ThreadPoolExecutor
+from app.api import PhoneBook
+from app.logger import logger
+from app.models import Contact
+from app.repository import ConflictError
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def _contacts(contacts) -> list[dict]:
+    return [c.to_dict() for c in contacts]
+
+
+class PhoneBookService:
+    """
+    Serves a PhoneBook over TCP with group-committed writes.
+    """
+
+    def __init__(self, phonebook: PhoneBook, workers: int = 4):
+        """
+        Args:
+            phonebook (PhoneBook): Book to serve. It is put into write-behind
+                mode while the service runs.
+            workers (int): Threads running PhoneBook calls.
+        """
+        self.phonebook = phonebook
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="phonebook")
+        self._waiters: list[asyncio.Future] = []
+        self._flusher: asyncio.Task | None = None
+        self._server: asyncio.Server | None = None
+
+        self._reads = {
+            "get": lambda a: self._one(phonebook.find_by_id(a["id"])),
+            "find_by_lastname": lambda a: _contacts(phonebook.find_by_lastname(a["value"])),
+            "find_by_city": lambda a: _contacts(phonebook.find_by_city(a["value"])),
+            "find_by_job": lambda a: _contacts(phonebook.find_by_job(a["value"])),
+            "search_by_lastname": lambda a: _contacts(
+                phonebook.search_by_lastname(a["query"], a.get("cutoff", 0.6), a.get("limit", 3))
+            ),
+            "search_by_phone": lambda a: _contacts(phonebook.search_by_phone(a["query"])),
+            "search_by_phone_prefix": lambda a: _contacts(
+                phonebook.search_by_phone_prefix(a["prefix"])
+            ),
+            "list": lambda a: _contacts(
+                phonebook.page(a.get("offset", 0), a.get("limit", 100), a.get("sort_by"))
+            ),
+        }
+        self._writes = {
+            "add": lambda a: phonebook.add_contact(Contact.from_dict(a["contact"])),
+            "update": lambda a: phonebook.update_contact(a["id"], a["updates"]),
+            "delete": lambda a: phonebook.delete_contact(a["id"]),
+        }
+
+    @staticmethod
+    def _one(contact: Contact | None) -> dict | None:
+        return contact.to_dict() if contact else None
+
+    async def _call(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    async def _flush_loop(self) -> None:
+        # Yield once so that a burst of concurrent writes joins the first flush.
+        await asyncio.sleep(0)
+        while self._waiters:
+            waiters, self._waiters = self._waiters, []
+            try:
+                await self._call(self.phonebook.flush)
+            except Exception as e:
+                for waiter in waiters:
+                    waiter.set_exception(e)
+            else:
+                for waiter in waiters:
+                    waiter.set_result(None)
+        self._flusher = None
+
+    def _durable(self) -> asyncio.Future:
+        """Return a future resolved once a flush covers all mutations done so far."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+        return waiter
+
+    async def dispatch(self, op: str, args: dict):
+        """Execute one request and return its JSON-serializable result."""
+        if op in self._reads:
+            return await self._call(self.phonebook.read, self._reads[op], args)
+        if op in self._writes:
+            changed = await self._call(self._writes[op], args)
+            if changed:
+                await self._durable()
+            return changed
+        raise ValueError(f"Unknown op {op!r}")
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                request_id = None
+                try:
+                    request = json.loads(line)
+                    request_id = request.get("id")
+                    result = await self.dispatch(request.get("op"), request.get("args") or {})
+                    response = {"id": request_id, "ok": True, "result": result}
+                except (ValueError, KeyError, TypeError, AttributeError, ConflictError) as e:
+                    response = {"id": request_id, "ok": False, "error": str(e)}
+                except Exception:
+                    # A failing request must not take the connection down with it.
+                    logger.exception("Request %r failed", request_id)
+                    response = {"id": request_id, "ok": False, "error": "Internal error"}
+
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # Client went away or sent a line longer than the stream limit.
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.Server:
+        """Start listening; port 0 picks a free port (see server.sockets)."""
+        self.phonebook.start_write_behind(max_dirty=0, interval=None)
+        self._server = await asyncio.start_server(self._handle, host, port)
+        logger.info("Service listening on %s", self._server.sockets[0].getsockname())
+        return self._server
+
+    async def close(self) -> None:
+        """Stop accepting requests and persist everything still pending."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._flusher is not None:
+            await self._flusher
+        await self._call(self.phonebook.stop_write_behind)
+        self._executor.shutdown()
+
+
+def run_service(phonebook: PhoneBook, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+    """Serve until interrupted (Ctrl+C)."""
+
+    async def main():
+        service = PhoneBookService(phonebook)
+        server = await service.start(host, port)
+        try:
+            await server.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
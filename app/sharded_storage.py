@@ -0,0 +1,292 @@
+# app/sharded_storage.py
+
+"""
+Sharded JSON persistence for very large phone books.
+
+Contacts are partitioned across N JSON files in one directory, by a hash
+of the contact ID or by the initial of the last name. A change rewrites
+only the shards it touched, shards are loaded and written by a thread
+pool, and searches run over every shard (or only the one a predicate
+pins down) and merge the results in shard order.
+
+The storage does not keep contacts in memory, only a fingerprint (hash)
+of every stored contact, which is enough to find the shard holding an ID
+and to tell which shards save_all() must rewrite. Reads and incremental
+changes therefore read the shards they touch from disk.
+
+The shard count and partition scheme are recorded in a manifest, because
+contacts would be looked up in the wrong shard under different settings.
+"""
+
+import json
+import os
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from app.backup import BackupPolicy
+from app.metrics import timed
+from app.models import Contact
+from app.query import Predicate, matcher, parse_query
+from app.repository import IncrementalRepository
+from app.snapshot import to_row
+from app.storage import JSONStorage, atomic_write
+from app.utils import normalize_phone, normalize_text
+
+PARTITIONS = ("hash", "initial")
+MANIFEST = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def _fingerprint(contact: Contact) -> int:
+    """Hash of everything persisted about a contact."""
+    row = to_row(contact)
+    return hash((*row[:3], tuple(row[3].items()), *row[4:]))
+
+
+class ShardedStorage(IncrementalRepository):
+    """
+    IncrementalRepository spreading contacts over several JSONStorage files.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        shards: int = 16,
+        partition: str = "hash",
+        backup_policy: BackupPolicy | None = None,
+        durability: str = "fsync",
+        workers: int = 4,
+        snapshot_cache: bool = False,
+    ):
+        """
+        Open (and create if needed) a sharded book.
+
+        Args:
+            directory (str): Directory holding the shards and the manifest.
+            shards (int): Number of shard files.
+            partition (str): "hash" (of the contact ID, even spread) or
+                "initial" (of the last name, so last name lookups read one shard).
+            backup_policy (BackupPolicy | None): Backup policy of every shard.
+            durability (str): One of DURABILITY_LEVELS.
+            workers (int): Threads loading and writing shards, 1 - sequential.
+            snapshot_cache (bool): Keep a binary cache of every parsed shard.
+
+        Raises:
+            ValueError: On invalid settings, or settings that differ from
+                the manifest of an existing book.
+        """
+        if partition not in PARTITIONS:
+            raise ValueError(f"Unknown partition {partition!r}, expected one of {PARTITIONS}")
+        if shards < 1:
+            raise ValueError("At least one shard is required")
+
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.partition = partition
+        self.workers = workers
+        self._check_manifest(shards, partition, durability)
+
+        self.shards = [
+            JSONStorage(
+                os.path.join(directory, f"shard-{i:03d}.json"), backup_policy, durability, snapshot_cache
+            )
+            for i in range(shards)
+        ]
+        # Persisted contents of shards read so far: id -> fingerprint.
+        self._fingerprints: list[dict[str, int] | None] = [None] * shards
+
+    def _check_manifest(self, shards: int, partition: str, durability: str) -> None:
+        path = os.path.join(self.directory, MANIFEST)
+        expected = {"version": MANIFEST_VERSION, "shards": shards, "partition": partition}
+        try:
+            with open(path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            atomic_write(path, lambda f: json.dump(expected, f), durability)
+            return
+
+        if manifest != expected:
+            raise ValueError(f"{self.directory} holds a book sharded as {manifest}, not {expected}")
+
+    def _shard_key(self, value: str) -> int:
+        return zlib.crc32(value.encode("utf-8")) % len(self.shards)
+
+    def shard_of(self, contact: Contact) -> int:
+        """Index of the shard a contact belongs to."""
+        if self.partition == "hash":
+            return self._shard_key(contact.id)
+        return self._shard_key(normalize_text(contact.last_name)[:1])
+
+    def _map(self, func: Callable, indices: Iterable[int]) -> list:
+        """Run func(index) for shards, in a thread pool if workers > 1."""
+        indices = list(indices)
+        if self.workers <= 1 or len(indices) <= 1:
+            return [func(i) for i in indices]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(min(self.workers, len(indices))) as pool:
+            return list(pool.map(func, indices))
+
+    def _read(self, i: int) -> list[Contact]:
+        """
+        Read a shard from disk, refreshing its fingerprints. Unlike
+        JSONStorage.get_all(), an unreadable shard is an error: reading it
+        as empty would let the next write replace its contacts.
+
+        Raises:
+            json.JSONDecodeError: If the shard cannot be parsed.
+            OSError: If the shard cannot be read.
+        """
+        contacts = list(self.shards[i].iter_all())
+        self._fingerprints[i] = {c.id: _fingerprint(c) for c in contacts}
+        return contacts
+
+    def _known(self, i: int) -> dict[str, int]:
+        """Fingerprints of a shard, read from disk only the first time."""
+        if self._fingerprints[i] is None:
+            self._read(i)
+        return self._fingerprints[i]
+
+    def _know(self, indices: Iterable[int]) -> None:
+        self._map(self._read, [i for i in indices if self._fingerprints[i] is None])
+
+    def _locate(self, contact_id: str) -> int | None:
+        """Shard currently holding contact_id, None if there is none."""
+        if self.partition == "hash":
+            i = self._shard_key(contact_id)
+            return i if contact_id in self._known(i) else None
+
+        self._know(range(len(self.shards)))
+        return next((i for i, known in enumerate(self._fingerprints) if contact_id in known), None)
+
+    def iter_all(self) -> Iterator[Contact]:
+        """Load all shards in parallel and yield their contacts in shard order."""
+        for contacts in self._map(self._read, range(len(self.shards))):
+            yield from contacts
+
+    @timed("sharded.get_all")
+    def get_all(self) -> list[Contact]:
+        """
+        Load all contacts.
+
+        Returns:
+            list[Contact]: A list of Contact objects or an empty list if a shard cannot be read.
+        """
+        try:
+            return list(self.iter_all())
+        except (json.JSONDecodeError, OSError):
+            return []
+
+    @timed("sharded.save_all")
+    def save_all(self, contacts: list[Contact]) -> None:
+        """
+        Persist the full list, rewriting only shards whose contents changed.
+
+        Args:
+            contacts (list[Contact]): The list of contacts to save.
+        """
+        self._know(range(len(self.shards)))
+        grouped: list[list[Contact]] = [[] for _ in self.shards]
+        for contact in contacts:
+            grouped[self.shard_of(contact)].append(contact)
+
+        dirty = {}
+        for i, shard in enumerate(grouped):
+            known = {c.id: _fingerprint(c) for c in shard}
+            if known != self._fingerprints[i]:
+                dirty[i] = (shard, known)
+
+        def write(i: int) -> None:
+            shard, known = dirty[i]
+            self.shards[i].save_all(shard)
+            self._fingerprints[i] = known
+
+        self._map(write, sorted(dirty))
+
+    def insert(self, contact: Contact) -> None:
+        self.apply_changes([contact], [], [])
+
+    def insert_many(self, contacts: list[Contact]) -> None:
+        self.apply_changes(contacts, [], [])
+
+    def update(self, contact: Contact) -> None:
+        self.apply_changes([], [contact], [])
+
+    def delete(self, contact_id: str) -> None:
+        self.apply_changes([], [], [contact_id])
+
+    @timed("sharded.apply_changes")
+    def apply_changes(
+        self,
+        inserts: list[Contact],
+        updates: list[Contact],
+        deletes: list[str],
+    ) -> None:
+        """
+        Apply a batch of changes. Every touched shard is read from disk,
+        changed and rewritten once.
+        """
+        puts: dict[int, list[Contact]] = {}
+        removals: dict[int, set[str]] = {}
+        for contact in [*inserts, *updates]:
+            current = self._locate(contact.id)
+            target = self.shard_of(contact)
+            if current is not None and current != target:
+                removals.setdefault(current, set()).add(contact.id)
+            puts.setdefault(target, []).append(contact)
+        for contact_id in deletes:
+            current = self._locate(contact_id)
+            if current is not None:
+                removals.setdefault(current, set()).add(contact_id)
+
+        def write(i: int) -> None:
+            contents = {c.id: c for c in self._read(i)}
+            for contact in puts.get(i, ()):
+                contents[contact.id] = contact
+            for contact_id in removals.get(i, ()):
+                contents.pop(contact_id, None)
+            self.shards[i].save_all(list(contents.values()))
+            self._fingerprints[i] = {cid: _fingerprint(c) for cid, c in contents.items()}
+
+        self._map(write, sorted(puts.keys() | removals.keys()))
+
+    def _targets(self, predicates: list[Predicate]) -> range | list[int]:
+        """Shards that can hold matches: one if a predicate pins the partition key."""
+        for p in predicates:
+            if self.partition == "hash" and p.field == "id" and p.op == "=":
+                return [self._shard_key(p.value)]
+            if self.partition == "initial" and p.field == "last_name" and p.op in "=^":
+                return [self._shard_key(p.value[:1])]
+        return range(len(self.shards))
+
+    def query(self, expression: str | list[Predicate]) -> list[Contact]:
+        """
+        Contacts matching a query (see app.query), searched in every shard
+        that can hold matches and merged in shard order.
+        """
+        predicates = parse_query(expression) if isinstance(expression, str) else list(expression)
+        match = matcher(predicates)
+        found = self._map(
+            lambda i: [c for c in self._read(i) if match(c)], self._targets(predicates)
+        )
+        return [contact for shard in found for contact in shard]
+
+    def get_by_id(self, contact_id: str) -> Contact | None:
+        """Return the contact with the given ID, or None."""
+        i = self._locate(contact_id)
+        if i is None:
+            return None
+        return next((c for c in self._read(i) if c.id == contact_id), None)
+
+    def find_by_lastname(self, last_name: str) -> list[Contact]:
+        """Exact (case-insensitive) last name lookup."""
+        return self.query([Predicate("last_name", "=", normalize_text(last_name))])
+
+    def find_by_city(self, city: str) -> list[Contact]:
+        """Exact (case-insensitive) city lookup."""
+        return self.query([Predicate("city", "=", normalize_text(city))])
+
+    def find_by_phone(self, prefix: str) -> list[Contact]:
+        """Return contacts having a phone number that starts with prefix."""
+        prefix = normalize_phone(prefix)
+        return self.query([Predicate("phone", "^", prefix)]) if prefix else []
@@ -0,0 +1,71 @@
+# app/snapshot.py
+
+"""
+Binary snapshot cache of a JSON contacts file for fast startup.
+
+The cache holds the parsed contacts as marshal-encoded tuples next to the
+JSON file (phonebook.json -> phonebook.json.snapshot). It is keyed by the
+JSON file's inode, mtime and size, so any rewrite of the JSON file makes
+it stale, and a stale, corrupt or missing cache simply means the JSON file
+is parsed again. The cache is as trusted as the JSON file it mirrors.
+"""
+
+import marshal
+import os
+from collections.abc import Iterable
+from app.models import Contact
+
+# Bump when the cached row layout changes.
+SNAPSHOT_VERSION = 1
+SUFFIX = ".snapshot"
+
+Row = tuple[str, str, str, dict, str, str, str]
+
+
+def snapshot_path(json_path: str) -> str:
+    return json_path + SUFFIX
+
+
+def file_key(json_path: str) -> tuple[int, int, int] | None:
+    """Identity of the JSON file's current version, None if it does not exist."""
+    try:
+        st = os.stat(json_path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def to_row(contact: Contact) -> Row:
+    return (
+        contact.id,
+        contact.first_name,
+        contact.last_name,
+        contact.phones,
+        contact.city,
+        contact.job,
+        contact.created_at,
+    )
+
+
+def load_snapshot(json_path: str) -> list[Contact] | None:
+    """
+    Return contacts from the cache if it matches the JSON file, else None.
+    """
+    key = file_key(json_path)
+    if key is None:
+        return None
+
+    try:
+        with open(snapshot_path(json_path), "rb") as f:
+            # marshal.load() on a file reads in small pieces; loads() is much faster.
+            version, cached_key, rows = marshal.loads(f.read())
+        if version != SNAPSHOT_VERSION or tuple(cached_key) != key:
+            return None
+        return [Contact.from_trusted(*row) for row in rows]
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def encode_snapshot(key: tuple[int, int, int], rows: Iterable[Row]) -> bytes:
+    """Serialize rows parsed from the JSON file version identified by key."""
+    return marshal.dumps((SNAPSHOT_VERSION, key, list(rows)))
@@ -0,0 +1,304 @@
+# app/sqlite_storage.py
+
+"""
+SQLite persistence for the Phone Book application.
+
+Every mutation touches only the rows of the changed contact inside its own
+transaction, and lookups by last name, city and phone use database indexes
+instead of loading the whole book. The indexed columns hold the values
+normalized the way PhoneBook's indexes normalize them (normalize_text,
+normalize_phone), because SQLite's NOCASE only folds ASCII letters.
+
+The connection is shared by every thread using the storage (the
+write-behind timer, the service's worker pool, the CLI's background
+loader) and serialized by a lock.
+"""
+
+import sqlite3
+import threading
+from collections.abc import Iterator
+from app.metrics import timed
+from app.models import Contact
+from app.repository import IncrementalRepository
+from app.utils import normalize_phone, normalize_text
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id            TEXT PRIMARY KEY,
+    first_name    TEXT NOT NULL,
+    last_name     TEXT NOT NULL COLLATE NOCASE,
+    city          TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    job           TEXT NOT NULL DEFAULT '' COLLATE NOCASE,
+    created_at    TEXT NOT NULL,
+    last_name_key TEXT NOT NULL DEFAULT '',
+    city_key      TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS phones (
+    contact_id TEXT NOT NULL REFERENCES contacts(id) ON DELETE CASCADE,
+    label      TEXT NOT NULL,
+    number     TEXT NOT NULL,
+    number_key TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (contact_id, label)
+);
+"""
+
+INDEXES = """
+DROP INDEX IF EXISTS idx_contacts_last_name;
+DROP INDEX IF EXISTS idx_contacts_city;
+DROP INDEX IF EXISTS idx_phones_number;
+CREATE INDEX IF NOT EXISTS idx_contacts_last_name_key ON contacts(last_name_key);
+CREATE INDEX IF NOT EXISTS idx_contacts_city_key ON contacts(city_key);
+CREATE INDEX IF NOT EXISTS idx_phones_number_key ON phones(number_key);
+"""
+
+# Lookup columns added after the first release: table -> columns.
+KEY_COLUMNS = {"contacts": ("last_name_key", "city_key"), "phones": ("number_key",)}
+
+CONTACT_COLUMNS = "id, first_name, last_name, city, job, created_at"
+WRITE_COLUMNS = f"{CONTACT_COLUMNS}, last_name_key, city_key"
+FETCH_SIZE = 1000
+
+
+class SQLiteStorage(IncrementalRepository):
+    """
+    SQLite-based implementation of IncrementalRepository.
+    """
+
+    def __init__(self, filepath: str):
+        """
+        Open (and create if needed) the database.
+
+        Args:
+            filepath (str): Path to the SQLite database file, or ":memory:".
+        """
+        self.filepath = filepath
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(filepath, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(SCHEMA)
+        self._add_key_columns()
+        self._conn.executescript(INDEXES)
+
+    def _add_key_columns(self) -> None:
+        """Add and fill the lookup columns in a database created without them."""
+        missing = {
+            table: [c for c in columns if c not in self._columns(table)]
+            for table, columns in KEY_COLUMNS.items()
+        }
+        if not any(missing.values()):
+            return
+
+        with self._conn:
+            for table, columns in missing.items():
+                for column in columns:
+                    self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} TEXT NOT NULL DEFAULT ''")
+            self._conn.executemany(
+                "UPDATE contacts SET last_name_key = ?, city_key = ? WHERE id = ?",
+                [
+                    (normalize_text(last_name), normalize_text(city), cid)
+                    for cid, last_name, city in self._conn.execute("SELECT id, last_name, city FROM contacts")
+                ],
+            )
+            self._conn.executemany(
+                "UPDATE phones SET number_key = ? WHERE rowid = ?",
+                [
+                    (normalize_phone(number), rowid)
+                    for rowid, number in self._conn.execute("SELECT rowid, number FROM phones")
+                ],
+            )
+
+    def _columns(self, table: str) -> set[str]:
+        return {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _load(self, where: str = "", params: tuple = ()) -> list[Contact]:
+        """Load contacts matching a WHERE clause together with their phones."""
+        with self._lock:
+            return self._load_rows(where, params)
+
+    def _load_rows(self, where: str, params: tuple) -> list[Contact]:
+        rows = self._conn.execute(
+            f"SELECT {CONTACT_COLUMNS} FROM contacts {where} ORDER BY rowid", params
+        ).fetchall()
+        if not rows:
+            return []
+
+        phones: dict[str, dict] = {row[0]: {} for row in rows}
+        phone_rows = self._conn.execute(
+            "SELECT contact_id, label, number FROM phones "
+            f"WHERE contact_id IN (SELECT id FROM contacts {where}) ORDER BY rowid",
+            params,
+        )
+        for contact_id, label, number in phone_rows:
+            phones[contact_id][label] = number
+
+        return [
+            Contact.from_trusted(cid, first_name, last_name, phones[cid], city, job, created_at)
+            for cid, first_name, last_name, city, job, created_at in rows
+        ]
+
+    def _write_phones(self, contact: Contact) -> None:
+        self._conn.execute("DELETE FROM phones WHERE contact_id = ?", (contact.id,))
+        self._conn.executemany(
+            "INSERT INTO phones (contact_id, label, number, number_key) VALUES (?, ?, ?, ?)",
+            [self._phone_row(contact.id, label, number) for label, number in contact.phones.items()],
+        )
+
+    @staticmethod
+    def _row(contact: Contact) -> tuple:
+        return (
+            contact.id,
+            contact.first_name,
+            contact.last_name,
+            contact.city,
+            contact.job,
+            contact.created_at,
+            normalize_text(contact.last_name),
+            normalize_text(contact.city or ""),
+        )
+
+    @staticmethod
+    def _phone_row(contact_id: str, label: str, number) -> tuple:
+        return contact_id, label, str(number), normalize_phone(number)
+
+    def get_all(self) -> list[Contact]:
+        """
+        Load all contacts in insertion order.
+
+        Returns:
+            list[Contact]: A list of Contact objects.
+        """
+        return self._load()
+
+    def iter_all(self) -> Iterator[Contact]:
+        """
+        Stream contacts in insertion order straight from a database cursor.
+        Rows are fetched in batches under the lock, which is released while
+        the caller consumes them.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                f"SELECT c.{CONTACT_COLUMNS.replace(', ', ', c.')}, p.label, p.number "
+                "FROM contacts c LEFT JOIN phones p ON p.contact_id = c.id "
+                "ORDER BY c.rowid, p.rowid"
+            )
+
+        def rows() -> Iterator[tuple]:
+            while True:
+                with self._lock:
+                    batch = cursor.fetchmany(FETCH_SIZE)
+                if not batch:
+                    return
+                yield from batch
+
+        current = None
+        for cid, first_name, last_name, city, job, created_at, label, number in rows():
+            if current is None or current.id != cid:
+                if current is not None:
+                    yield current
+                current = Contact.from_trusted(
+                    cid, first_name, last_name, {}, city, job, created_at
+                )
+            if label is not None:
+                current.phones[label] = number
+
+        if current is not None:
+            yield current
+
+    @timed("sqlite.save_all")
+    def save_all(self, contacts: list[Contact]) -> None:
+        """
+        Replace the stored contacts with the given list in one transaction.
+
+        Args:
+            contacts (list[Contact]): The list of contacts to save.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM contacts")
+            self._insert_rows(contacts)
+
+    def _insert_rows(self, contacts: list[Contact]) -> None:
+        self._conn.executemany(
+            f"INSERT INTO contacts ({WRITE_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [self._row(c) for c in contacts],
+        )
+        self._conn.executemany(
+            "INSERT INTO phones (contact_id, label, number, number_key) VALUES (?, ?, ?, ?)",
+            [self._phone_row(c.id, label, number) for c in contacts for label, number in c.phones.items()],
+        )
+
+    def _update_row(self, contact: Contact) -> None:
+        """
+        Write a changed contact. With dirty_fields known, only the changed
+        table is touched; without them (untracked changes) both are.
+        """
+        dirty = contact.dirty_fields
+        if not dirty or dirty - {"phones"}:
+            self._conn.execute(
+                "UPDATE contacts SET first_name = ?, last_name = ?, city = ?, "
+                "job = ?, created_at = ?, last_name_key = ?, city_key = ? WHERE id = ?",
+                self._row(contact)[1:] + (contact.id,),
+            )
+        if not dirty or "phones" in dirty:
+            self._write_phones(contact)
+
+    def insert(self, contact: Contact) -> None:
+        with self._lock, self._conn:
+            self._insert_rows([contact])
+
+    def insert_many(self, contacts: list[Contact]) -> None:
+        with self._lock, self._conn:
+            self._insert_rows(contacts)
+
+    def update(self, contact: Contact) -> None:
+        with self._lock, self._conn:
+            self._update_row(contact)
+
+    def delete(self, contact_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM contacts WHERE id = ?", (contact_id,))
+
+    @timed("sqlite.apply_changes")
+    def apply_changes(
+        self,
+        inserts: list[Contact],
+        updates: list[Contact],
+        deletes: list[str],
+    ) -> None:
+        with self._lock, self._conn:
+            self._insert_rows(inserts)
+            for contact in updates:
+                self._update_row(contact)
+            self._conn.executemany(
+                "DELETE FROM contacts WHERE id = ?", [(cid,) for cid in deletes]
+            )
+
+    def get_by_id(self, contact_id: str) -> Contact | None:
+        """Return the contact with the given ID, or None."""
+        found = self._load("WHERE id = ?", (contact_id,))
+        return found[0] if found else None
+
+    def find_by_lastname(self, last_name: str) -> list[Contact]:
+        """Exact (case-insensitive) last name lookup."""
+        return self._load("WHERE last_name_key = ?", (normalize_text(last_name),))
+
+    def find_by_city(self, city: str) -> list[Contact]:
+        """Exact (case-insensitive) city lookup."""
+        return self._load("WHERE city_key = ?", (normalize_text(city),))
+
+    def find_by_phone(self, prefix: str) -> list[Contact]:
+        """Return contacts having a phone number that starts with prefix."""
+        prefix = normalize_phone(prefix)
+        if not prefix:
+            return []
+
+        # Half-open range scan, so the lookup uses idx_phones_number_key.
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return self._load(
+            "WHERE id IN (SELECT contact_id FROM phones WHERE number_key >= ? AND number_key < ?)",
+            (prefix, upper),
+        )
@@ -1,14 +1,162 @@
 """
 Persistence layer for saving and loading contacts using JSON.
-Provides automated backup functionality before data modifications.
+Saves are atomic (temp file + os.replace) with a configurable durability
+level, and backups are made according to a backup policy.
 """
 
 import json
 import os
-import shutil
-from datetime import datetime
+import tempfile
+from collections.abc import Callable, Iterator
+from app.backup import BackupManager, BackupPolicy
+from app.metrics import metrics, timed
 from app.models import Contact
 from app.repository import ContactRepository
+from app import snapshot
+
+
+CHUNK_SIZE = 64 * 1024
+
+# none  - atomic rename only, survives process crashes;
+# fsync - also fsync the data before the rename;
+# full  - also fsync the directory, so the rename itself survives power loss.
+DURABILITY_LEVELS = ("none", "fsync", "full")
+
+_decoder = json.JSONDecoder()
+
+
+def iter_json_array(f, chunk_size: int = CHUNK_SIZE) -> Iterator:
+    """
+    Incrementally parse a top-level JSON array from a text file,
+    yielding its items one by one without loading the whole document.
+
+    Raises:
+        json.JSONDecodeError: If the document is not a valid JSON array.
+    """
+    buf = f.read(chunk_size)
+    eof = not buf
+    pos = 0
+
+    def skip(chars: str) -> None:
+        nonlocal pos
+        while pos < len(buf) and buf[pos] in chars:
+            pos += 1
+
+    def refill() -> bool:
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size) if not eof else ""
+        eof = not chunk
+        buf = buf[pos:] + chunk
+        pos = 0
+        return not eof
+
+    skip(" \t\r\n")
+    while pos >= len(buf) and refill():
+        skip(" \t\r\n")
+    if buf[pos:pos + 1] != "[":
+        raise json.JSONDecodeError("Expecting '['", buf, pos)
+    pos += 1
+
+    expect_item = True
+    empty = True
+    while True:
+        skip(" \t\r\n")
+        if pos >= len(buf):
+            if not refill():
+                raise json.JSONDecodeError("Unterminated array", buf, pos)
+            continue
+
+        if buf[pos] == "]":
+            if expect_item and not empty:
+                raise json.JSONDecodeError("Trailing comma", buf, pos)
+            return
+        if not expect_item:
+            if buf[pos] != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+            pos += 1
+            expect_item = True
+            continue
+
+        try:
+            item, end = _decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if refill():
+                continue
+            raise
+
+        if end == len(buf) and not eof and not isinstance(item, (dict, list, str)):
+            # A number or literal may continue in the next chunk.
+            if refill():
+                continue
+
+        pos = end
+        expect_item = empty = False
+        yield item
+
+
+def fsync_directory(path: str) -> None:
+    """Flush a directory entry (e.g. after os.replace) to disk, where supported."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _read_umask() -> int:
+    # The only portable way to read the umask is to set it; done once, at
+    # import, so no thread can create a file while it is changed.
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Mode of a newly created file, as open(path, "w") would create it.
+NEW_FILE_MODE = 0o666 & ~_read_umask()
+
+
+def atomic_write(
+    path: str, write: Callable, durability: str = "fsync", binary: bool = False
+) -> None:
+    """
+    Replace path with content produced by write(file) so readers and crashes
+    only ever see the old or the new version, never a truncated file.
+
+    Args:
+        path (str): Target file path.
+        write (Callable): Receives the open file and writes the content.
+        durability (str): One of DURABILITY_LEVELS.
+        binary (bool): Open the file in binary instead of UTF-8 text mode.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        # mkstemp() creates the file as 0600; keep the mode a plain write would give.
+        if os.path.exists(path):
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        else:
+            os.chmod(tmp_path, NEW_FILE_MODE)
+        with os.fdopen(fd, "wb") if binary else os.fdopen(fd, "w", encoding="utf-8") as f:
+            write(f)
+            if durability != "none":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if durability == "full":
+        fsync_directory(directory)
 
 
 class JSONStorage(ContactRepository):
@@ -16,25 +164,88 @@ class JSONStorage(ContactRepository):
     JSON-based implementation of ContactRepository with automated safety backups.
     """
 
-    def __init__(self, filepath: str):
+    def __init__(
+        self,
+        filepath: str,
+        backup_policy: BackupPolicy | None = None,
+        durability: str = "fsync",
+        snapshot_cache: bool = False,
+    ):
         """
         Initialize storage with a specific file path.
         
         Args:
             filepath (str): Path to the JSON storage file.
+            backup_policy (BackupPolicy | None): Retention, coalescing and
+                layout of backups, defaults to BackupPolicy().
+            durability (str): One of DURABILITY_LEVELS.
+            snapshot_cache (bool): Keep a binary cache of the parsed file
+                (see app.snapshot) so later loads skip JSON parsing.
         """
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability {durability!r}, expected one of {DURABILITY_LEVELS}")
+
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
         self.filepath = filepath
+        self.durability = durability
+        self.snapshot_cache = snapshot_cache
+        self.backups = BackupManager(filepath, backup_policy)
 
+    @timed("json.backup")
     def _create_backup(self) -> None:
         """
-        Creates a timestamped backup of the current data file if it exists and is not empty.
-        Example: phonebook.json -> phonebook.json.20260221_153000.bak
+        Backs up the current data file according to the backup policy.
+        Example: phonebook.json -> phonebook.json.20260221_153000_123456.bak
+        """
+        self.backups.backup()
+
+    def iter_all(self) -> Iterator[Contact]:
+        """
+        Stream contacts from the JSON file one at a time.
+
+        Raises:
+            json.JSONDecodeError: If the file is not a valid JSON array.
+            OSError: If the file cannot be read.
         """
-        if os.path.exists(self.filepath) and os.path.getsize(self.filepath) > 0:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_path = f"{self.filepath}.{timestamp}.bak"
-            shutil.copy2(self.filepath, backup_path)
+        if not os.path.exists(self.filepath) or os.path.getsize(self.filepath) == 0:
+            return
+
+        if not self.snapshot_cache:
+            metrics.add_bytes("read", "json", os.path.getsize(self.filepath))
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                for item in iter_json_array(f):
+                    yield Contact.from_storage(item)
+            return
+
+        cached = snapshot.load_snapshot(self.filepath)
+        if cached is not None:
+            yield from cached
+            return
+
+        # Cache miss: parse the JSON file and cache it if it did not change meanwhile.
+        key = snapshot.file_key(self.filepath)
+        rows = []
+        metrics.add_bytes("read", "json", key[2])
+        with open(self.filepath, "r", encoding="utf-8") as f:
+            for item in iter_json_array(f):
+                contact = Contact.from_storage(item)
+                rows.append(snapshot.to_row(contact))
+                yield contact
+        if snapshot.file_key(self.filepath) == key:
+            self._write_snapshot(key, rows)
+
+    def _write_snapshot(self, key: tuple[int, int, int], rows: list) -> None:
+        """Write the snapshot cache; it is only an optimization, so errors are ignored."""
+        data = snapshot.encode_snapshot(key, rows)
+        try:
+            atomic_write(snapshot.snapshot_path(self.filepath), lambda f: f.write(data), "none", True)
+        except OSError:
+            pass
 
+    @timed("json.get_all")
     def get_all(self) -> list[Contact]:
         """
         Load all contacts from the JSON file.
@@ -42,23 +253,15 @@ class JSONStorage(ContactRepository):
         Returns:
             list[Contact]: A list of Contact objects or an empty list if file error occurs.
         """
-        if not os.path.exists(self.filepath):
-            return []
-
         try:
-            if os.path.getsize(self.filepath) == 0:
-                return []
-
-            with open(self.filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return [Contact.from_dict(item) for item in data]
-
+            return list(self.iter_all())
         except (json.JSONDecodeError, OSError):
             return []
 
+    @timed("json.save_all")
     def save_all(self, contacts: list[Contact]) -> None:
         """
-        Persist contacts to a JSON file. 
+        Atomically persist contacts to a JSON file.
         Creates a backup before saving, provided the contact list is not empty.
         
         Args:
@@ -67,10 +270,19 @@ class JSONStorage(ContactRepository):
         if contacts:
             self._create_backup()
 
-        with open(self.filepath, "w", encoding="utf-8") as f:
-            json.dump(
+        atomic_write(
+            self.filepath,
+            lambda f: json.dump(
                 [c.to_dict() for c in contacts],
                 f,
                 ensure_ascii=False,
                 indent=2,
+            ),
+            self.durability,
+        )
+        if metrics.enabled:
+            metrics.add_bytes("written", "json", os.path.getsize(self.filepath))
+        if self.snapshot_cache:
+            self._write_snapshot(
+                snapshot.file_key(self.filepath), [snapshot.to_row(c) for c in contacts]
             )
\ No newline at end of file
@@ -11,8 +11,18 @@
 Тут не повинні виконуватися операції вводу/виводу (input/output).
 """
 
-import csv
-from typing import Dict, List
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List
+
+CONTACT_LABELS = {
+    "first_name": "Ім'я",
+    "last_name": "Прізвище",
+    "phones": "Телефони",
+    "city": "Місто",
+    "job": "Професія",
+    "id": "ID",
+    "created_at": "Створено",
+}
 
 
 def is_valid_phone(number: str) -> bool:
@@ -26,6 +36,21 @@ def is_valid_phone(number: str) -> bool:
     return number.isdigit() and len(number) >= 5
 
 
+def normalize_phone(number) -> str:
+    """
+    Нормалізує номер телефону: залишає лише цифри,
+    як того вимагає is_valid_phone ("+38 (050) 123" -> "38050123").
+
+    :param number: номер телефону
+    :return: рядок із цифр (може бути порожнім)
+    """
+    number = str(number)
+    if number.isdigit():
+        # Збережені номери вже нормалізовані — це найчастіший випадок.
+        return number
+    return "".join(ch for ch in number if ch.isdigit())
+
+
 def normalize_text(text: str) -> str:
     """
     Нормалізує текст для порівняння (lowercase + strip).
@@ -57,6 +82,27 @@ def format_contact(contact: Dict) -> str:
     )
 
 
+def iter_formatted(contacts: Iterable, fields: Iterable[str] | None = None) -> Iterator[str]:
+    """
+    Генератор, що по одному форматує контакти для CLI.
+    Поля читаються напряму з об'єктів Contact, без побудови словника.
+
+    :param contacts: ітерабельний об'єкт із Contact
+    :param fields: поля для відображення (за замовчуванням - усі з CONTACT_LABELS)
+    :return: відформатовані блоки, кожен завершується порожнім рядком
+    """
+    fields = tuple(fields or CONTACT_LABELS)
+    for contact in contacts:
+        lines = []
+        for field in fields:
+            value = getattr(contact, field)
+            if field == "phones":
+                value = ", ".join(f"{k}: {v}" for k, v in value.items())
+            lines.append(f"{CONTACT_LABELS[field]}: {value}\n")
+        lines.append("\n")
+        yield "".join(lines)
+
+
 def fuzzy_match(query: str, text: str) -> bool:
     """
     Виконує нечітке (fuzzy) порівняння рядків.
@@ -68,14 +114,18 @@ def fuzzy_match(query: str, text: str) -> bool:
     return normalize_text(query) in normalize_text(text)
 
 
-def export_to_csv(phonebook: List[Dict], filename: str) -> None:
+def export_to_csv(phonebook: Iterable[Dict], filename: str) -> None:
     """
     Експортує телефонну книгу у CSV-файл.
+    Контакти обробляються по одному, тож можна передати генератор
+    (наприклад, з JSONStorage.iter_all) замість повного списку.
 
-    :param phonebook: список контактів
+    :param phonebook: контакти (список або будь-який ітерабельний об'єкт)
     :param filename: шлях до CSV-файлу
     """
-    if not phonebook:
+    contacts = iter(phonebook)
+    first = next(contacts, None)
+    if first is None:
         return
 
     fieldnames = [
@@ -88,11 +138,14 @@ def export_to_csv(phonebook: List[Dict], filename: str) -> None:
         "created_at",
     ]
 
+    # csv потрібен лише для імпорту/експорту, тож не сповільнює запуск.
+    import csv
+
     with open(filename, "w", newline="", encoding="utf-8") as file:
         writer = csv.DictWriter(file, fieldnames=fieldnames)
         writer.writeheader()
 
-        for contact in phonebook:
+        for contact in chain((first,), contacts):
             row = contact.copy()
             row["phones"] = "; ".join(
                 f"{k}:{v}" for k, v in contact.get("phones", {}).items()
@@ -100,14 +153,14 @@ def export_to_csv(phonebook: List[Dict], filename: str) -> None:
             writer.writerow(row)
 
 
-def import_from_csv(filename: str) -> List[Dict]:
+def iter_csv(filename: str) -> Iterator[Dict]:
     """
-    Імпортує контакти з CSV-файлу.
+    Потоково читає контакти з CSV-файлу, повертаючи їх по одному.
 
     :param filename: шлях до CSV-файлу
-    :return: список контактів
+    :return: генератор словників контактів
     """
-    contacts: List[Dict] = []
+    import csv
 
     with open(filename, newline="", encoding="utf-8") as file:
         reader = csv.DictReader(file)
@@ -120,16 +173,23 @@ def import_from_csv(filename: str) -> List[Dict]:
                         k, v = item.split(":", 1)
                         phones[k.strip()] = v.strip()
 
-            contacts.append(
-                {
-                    "id": row.get("id", ""),
-                    "first_name": row.get("first_name", ""),
-                    "last_name": row.get("last_name", ""),
-                    "phones": phones,
-                    "city": row.get("city", ""),
-                    "job": row.get("job", ""),
-                    "created_at": row.get("created_at", ""),
-                }
-            )
+            # DictReader fills the missing fields of a short row with None.
+            yield {
+                "id": row.get("id") or "",
+                "first_name": row.get("first_name") or "",
+                "last_name": row.get("last_name") or "",
+                "phones": phones,
+                "city": row.get("city") or "",
+                "job": row.get("job") or "",
+                "created_at": row.get("created_at") or "",
+            }
+
+
+def import_from_csv(filename: str) -> List[Dict]:
+    """
+    Імпортує контакти з CSV-файлу.
 
-    return contacts
+    :param filename: шлях до CSV-файлу
+    :return: список контактів
+    """
+    return list(iter_csv(filename))
@@ -0,0 +1,5 @@
+"""
+Performance benchmarks for the Phone Book application.
+
+Each module is runnable on its own, e.g. ``python -m benchmarks.bench_indexes``.
+"""
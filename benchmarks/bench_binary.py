@@ -0,0 +1,56 @@
+# benchmarks/bench_binary.py
+
+"""
+Compares file size, save and load time of the pretty-printed JSONStorage
+file with the compact BinaryStorage file, and random access by id.
+
+Run: python -m benchmarks.bench_binary [contacts]   (default: 200_000)
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from app.binary_storage import BinaryStorage
+from app.storage import JSONStorage
+from benchmarks.suite import NO_BACKUPS
+from benchmarks.synthetic import make_contacts
+
+DEFAULT_SIZE = 200_000
+LOOKUPS = 1000
+
+
+def seconds(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE
+    contacts = make_contacts(size)
+    ids = [c.id for c in random.Random(0).sample(contacts, min(LOOKUPS, size))]
+
+    print(f"{size} contacts\n{'':>8} {'size, MiB':>10} {'save, s':>9} {'load, s':>9} {'by id, us':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        json_storage = JSONStorage(os.path.join(directory, "book.json"), NO_BACKUPS, "none")
+        save = seconds(lambda: json_storage.save_all(contacts))
+        load = seconds(json_storage.get_all)
+        # JSON has no random access: a lookup loads the whole file.
+        lookup = seconds(lambda: next(c for c in json_storage.iter_all() if c.id == ids[0]))
+        megabytes = os.path.getsize(json_storage.filepath) / 2**20
+        print(f"{'json':>8} {megabytes:>10.1f} {save:>9.2f} {load:>9.2f} {lookup * 1e6:>10.0f}")
+
+        binary_storage = BinaryStorage(os.path.join(directory, "book.pbk"), NO_BACKUPS, "none")
+        save = seconds(lambda: binary_storage.save_all(contacts))
+        load = seconds(binary_storage.get_all)
+        lookup = seconds(lambda: [binary_storage.get_by_id(cid) for cid in ids]) / len(ids)
+        megabytes = os.path.getsize(binary_storage.filepath) / 2**20
+        print(f"{'binary':>8} {megabytes:>10.1f} {save:>9.2f} {load:>9.2f} {lookup * 1e6:>10.1f}")
+        binary_storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/bench_durability.py
+
+"""
+Compares the cost of JSONStorage.save_all and JournalStorage appends
+at each durability level.
+
+Run: python -m benchmarks.bench_durability [contacts] [saves]   (default: 10_000 20)
+"""
+
+import sys
+import tempfile
+import time
+
+from app.backup import BackupPolicy
+from app.journal import JournalStorage
+from app.models import Contact
+from app.storage import DURABILITY_LEVELS, JSONStorage
+
+NO_BACKUPS = BackupPolicy(enabled=False)
+
+
+def make_contacts(count: int) -> list[Contact]:
+    return [
+        Contact(f"Name{i}", f"Surname{i}", {"mobile": f"380{i:09d}"}, contact_id=str(i))
+        for i in range(count)
+    ]
+
+
+def per_call_ms(func, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - start) / calls * 1e3
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    saves = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    contacts = make_contacts(size)
+
+    print(f"{'durability':>10} {'save_all, ms':>14} {'journal append, ms':>20}")
+    for durability in DURABILITY_LEVELS:
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = JSONStorage(f"{tmp}/book.json", NO_BACKUPS, durability)
+            journal = JournalStorage(f"{tmp}/journal.json", 0, NO_BACKUPS, durability)
+            save_ms = per_call_ms(lambda _: storage.save_all(contacts), saves)
+            append_ms = per_call_ms(lambda i: journal.update(contacts[i % size]), saves * 10)
+
+        print(f"{durability:>10} {save_ms:>14.2f} {append_ms:>20.3f}")
+
+
+if __name__ == "__main__":
+    main()
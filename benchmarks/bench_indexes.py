@@ -0,0 +1,74 @@
+# benchmarks/bench_indexes.py
+
+"""
+Shows that PhoneBook lookups stay (near) constant-time as the book grows.
+
+Run: python -m benchmarks.bench_indexes
+"""
+
+import random
+import time
+
+from app.api import PhoneBook
+from app.models import Contact
+from app.repository import ContactRepository
+
+SIZES = (1_000, 10_000, 100_000)
+LOOKUPS = 10_000
+CITIES = ("Kyiv", "Lviv", "Odesa", "Kharkiv", "Dnipro")
+
+
+class MemoryRepository(ContactRepository):
+    """Repository that keeps contacts in memory and never touches disk."""
+
+    def __init__(self, contacts):
+        self._contacts = contacts
+
+    def get_all(self):
+        return list(self._contacts)
+
+    def save_all(self, contacts):
+        self._contacts = contacts
+
+
+def make_contacts(count: int) -> list[Contact]:
+    return [
+        Contact(
+            f"Name{i}",
+            f"Surname{i // 10}",
+            {"mobile": f"380{i:09d}"},
+            city=CITIES[i % len(CITIES)],
+            contact_id=str(i),
+        )
+        for i in range(count)
+    ]
+
+
+def per_call_us(func, args) -> float:
+    start = time.perf_counter()
+    for arg in args:
+        func(arg)
+    return (time.perf_counter() - start) / len(args) * 1e6
+
+
+def main() -> None:
+    print(
+        f"{'contacts':>10} {'find_by_id, us':>16} {'find_by_lastname, us':>22} "
+        f"{'search_by_phone, us':>21}"
+    )
+    for size in SIZES:
+        phonebook = PhoneBook(MemoryRepository(make_contacts(size)))
+        ids = [str(random.randrange(size)) for _ in range(LOOKUPS)]
+        names = [f"Surname{random.randrange(size // 10)}" for _ in range(LOOKUPS)]
+        phones = [f"{random.randrange(size):09d}"[-6:] for _ in range(LOOKUPS)]
+
+        print(
+            f"{size:>10} "
+            f"{per_call_us(phonebook.find_by_id, ids):>16.2f} "
+            f"{per_call_us(phonebook.find_by_lastname, names):>22.2f} "
+            f"{per_call_us(phonebook.search_by_phone, phones):>21.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
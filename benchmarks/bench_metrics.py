@@ -0,0 +1,45 @@
+# benchmarks/bench_metrics.py
+
+"""
+Overhead of instrumentation on a hot path (cached phone search) with
+metrics disabled and enabled, compared to the undecorated method.
+
+Run: python -m benchmarks.bench_metrics
+"""
+
+import time
+
+from app.api import PhoneBook
+from app.metrics import metrics
+from benchmarks.bench_indexes import MemoryRepository, make_contacts
+
+CALLS = 200_000
+
+
+def per_call_ns(func, calls: int = CALLS) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        func("0000999")
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def main() -> None:
+    phonebook = PhoneBook(MemoryRepository(make_contacts(1_000)))
+    search = phonebook.search_by_phone
+    raw = PhoneBook.search_by_phone.__wrapped__.__get__(phonebook)
+    search("0000999")
+
+    baseline = per_call_ns(raw)
+    disabled = per_call_ns(search)
+    metrics.enable()
+    enabled = per_call_ns(search)
+    metrics.disable()
+
+    print(f"{'mode':>14} {'per call, ns':>14} {'overhead, ns':>14}")
+    print(f"{'undecorated':>14} {baseline:>14.0f} {0:>14}")
+    print(f"{'disabled':>14} {disabled:>14.0f} {disabled - baseline:>14.0f}")
+    print(f"{'enabled':>14} {enabled:>14.0f} {enabled - baseline:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/bench_models.py
+
+"""
+Measures memory per Contact and the cost of loading contacts from stored
+dicts with Contact.from_dict (normalizing) versus Contact.from_storage (trusted).
+
+Run: python -m benchmarks.bench_models [contacts]   (default: 200_000)
+"""
+
+import sys
+import time
+import tracemalloc
+
+from app.models import Contact
+
+DEFAULT_SIZE = 200_000
+CITIES = ("Kyiv", "Lviv", "Odesa", "Kharkiv", "Dnipro")
+JOBS = ("Qa", "Developer", "Manager")
+
+
+def make_records(count: int) -> list[dict]:
+    # City and job strings are built per record, as json.load would do.
+    return [
+        {
+            "id": f"{i:032x}",
+            "first_name": f"Name{i}",
+            "last_name": f"Surname{i // 10}",
+            "phones": {"mobile": f"380{i:09d}"},
+            "city": "".join(CITIES[i % len(CITIES)]),
+            "job": "".join(JOBS[i % len(JOBS)]),
+            "created_at": "2026-01-01T00:00:00+00:00",
+        }
+        for i in range(count)
+    ]
+
+
+def measure(label: str, loader, records: list[dict]) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    contacts = [loader(item) for item in records]
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_contact = current / len(contacts)
+    print(f"{label:>22} {elapsed:>9.2f}s {per_contact:>14.0f} B")
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE
+    records = make_records(size)
+
+    print(f"{'loader':>22} {'time':>10} {'new memory/contact':>20}")
+    measure("Contact.from_dict", Contact.from_dict, records)
+    measure("Contact.from_storage", Contact.from_storage, records)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# benchmarks/bench_query.py
+
+"""
+Compares PhoneBook.query() with the ad-hoc list comprehension over
+phonebook.contacts it replaces, for an indexed multi-criteria query and
+for an unindexed scan run inline and in process pools.
+
+Run: python -m benchmarks.bench_query [contacts]   (default: 200_000)
+"""
+
+import os
+import sys
+import time
+
+from app.api import PhoneBook
+from benchmarks.suite import MemoryRepository
+from benchmarks.synthetic import make_contacts
+
+DEFAULT_SIZE = 200_000
+INDEXED = "city=Lviv AND job~eng AND phone^38067"
+UNINDEXED = "first_name^a AND job~eer"
+
+
+def measure(label: str, func) -> None:
+    start = time.perf_counter()
+    count = func()
+    print(f"{label:>30} {count:>8} {(time.perf_counter() - start) * 1000:>10.1f} ms")
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE
+    phonebook = PhoneBook(MemoryRepository(make_contacts(size)))
+    print(f"{size} contacts, {os.cpu_count()} CPUs\n{'':>30} {'matches':>8} {'time':>13}")
+
+    measure("ad-hoc scan, indexed query", lambda: len([
+        c for c in phonebook.contacts
+        if c.city.lower() == "lviv" and "eng" in c.job.lower()
+        and any(p.startswith("38067") for p in c.phones.values())
+    ]))
+    measure("query(), indexed", lambda: len(list(phonebook.query(INDEXED))))
+
+    measure("ad-hoc scan, unindexed", lambda: len([
+        c for c in phonebook.contacts
+        if c.first_name.lower().startswith("a") and "eer" in c.job.lower()
+    ]))
+    for workers in (0, 2, 4):
+        measure(f"query(), workers={workers}",
+                lambda: len(list(phonebook.query(UNINDEXED, workers=workers))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/bench_service.py
+
+"""
+Load generator for the JSON-over-TCP service: reports requests/sec and
+latency percentiles for a read/write mix from many concurrent clients.
+
+Run: python -m benchmarks.bench_service [--clients 50] [--requests 200] [--writes 0.2]
+     [--port PORT]   (target a running 'main.py serve' instead of an in-process one)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+from app.api import PhoneBook
+from app.backup import BackupPolicy
+from app.journal import JournalStorage
+from app.service import PhoneBookService
+
+
+async def client(port: int, number: int, requests: int, writes: float, latencies: list) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=2**24)
+    for i in range(requests):
+        if random.random() < writes:
+            contact = {
+                "id": f"{number}-{i}",
+                "first_name": f"Name{i}",
+                "last_name": f"Surname{number}",
+                "phones": {"mobile": f"380{number:04d}{i:05d}"},
+            }
+            request = {"op": "add", "args": {"contact": contact}}
+        else:
+            query = f"{number:04d}{random.randrange(max(i, 1)):05d}"
+            request = {"op": "search_by_phone_prefix", "args": {"prefix": f"380{query}"}}
+
+        start = time.perf_counter()
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        await reader.readline()
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+
+async def run(args) -> None:
+    service = None
+    port = args.port
+    tmp = tempfile.TemporaryDirectory()
+    if port is None:
+        storage = JournalStorage(
+            os.path.join(tmp.name, "book.json"), backup_policy=BackupPolicy(enabled=False)
+        )
+        service = PhoneBookService(PhoneBook(storage))
+        server = await service.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+    latencies: list[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(port, n, args.requests, args.writes, latencies) for n in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - start
+
+    if service is not None:
+        await service.close()
+    tmp.cleanup()
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1e3
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e3
+    print(f"clients: {args.clients}, requests: {len(latencies)}, writes: {args.writes:.0%}")
+    print(f"throughput: {len(latencies) / elapsed:,.0f} req/s")
+    print(f"latency: p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--writes", type=float, default=0.2)
+    parser.add_argument("--port", type=int)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# benchmarks/bench_sharded.py
+
+"""
+Compares a single JSONStorage file with ShardedStorage: loading the book
+(sequential and with a thread pool) and the cost of one committed update,
+which rewrites the whole file vs one shard.
+
+Run: python -m benchmarks.bench_sharded [contacts] [shards]   (default: 200_000 16)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from app.api import PhoneBook
+from app.sharded_storage import ShardedStorage
+from app.storage import JSONStorage
+from benchmarks.suite import NO_BACKUPS
+from benchmarks.synthetic import make_contacts
+
+DEFAULT_SIZE = 200_000
+DEFAULT_SHARDS = 16
+UPDATES = 5
+
+
+def seconds(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def update(phonebook: PhoneBook) -> float:
+    ids = [c.id for c in phonebook.page(0, UPDATES)]
+    return seconds(lambda: [phonebook.update_contact(cid, {"city": "Kyiv"}) for cid in ids]) / len(ids)
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE
+    shards = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_SHARDS
+    contacts = make_contacts(size)
+
+    print(f"{size} contacts, {shards} shards, {os.cpu_count()} CPUs")
+    print(f"{'':>20} {'load, s':>9} {'update, ms':>11}")
+    with tempfile.TemporaryDirectory() as directory:
+        single = JSONStorage(os.path.join(directory, "book.json"), NO_BACKUPS, "none")
+        single.save_all(contacts)
+        load = seconds(lambda: PhoneBook(single))
+        print(f"{'single file':>20} {load:>9.2f} {update(PhoneBook(single)) * 1000:>11.1f}")
+
+        path = os.path.join(directory, "shards")
+        ShardedStorage(path, shards, backup_policy=NO_BACKUPS, durability="none").save_all(contacts)
+        for workers in (1, 4):
+            def open_book():
+                return PhoneBook(ShardedStorage(path, shards, backup_policy=NO_BACKUPS,
+                                                durability="none", workers=workers))
+
+            load = seconds(open_book)
+            print(f"{f'sharded, workers={workers}':>20} {load:>9.2f} {update(open_book()) * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/bench_startup.py
+
+"""
+Startup cost: importing the CLI in a fresh interpreter, loading a book
+from JSON vs from the binary snapshot cache, and time until the menu can
+be shown with background loading.
+
+Run: python -m benchmarks.bench_startup [contacts ...]   (default: 10_000 100_000)
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from app import cli
+from app.api import PhoneBook
+from app.backup import BackupPolicy
+from app.journal import JournalStorage
+from benchmarks.synthetic import make_contacts
+
+IMPORT_RUNS = 10
+
+
+def import_ms() -> float:
+    """Median wall time of 'import app.cli' in a new interpreter, minus a bare interpreter."""
+
+    def run(code: str) -> float:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        return time.perf_counter() - start
+
+    bare = statistics.median(run("pass") for _ in range(IMPORT_RUNS))
+    full = statistics.median(run("import app.cli") for _ in range(IMPORT_RUNS))
+    return (full - bare) * 1e3
+
+
+def load_ms(path: str, snapshot_cache: bool) -> float:
+    start = time.perf_counter()
+    PhoneBook(JournalStorage(path, snapshot_cache=snapshot_cache))
+    return (time.perf_counter() - start) * 1e3
+
+
+def menu_ms(path: str) -> float:
+    """Time until PhoneBookCLI is ready to show the menu, and until the book is loaded."""
+    cli.DATA_FILE = path
+    start = time.perf_counter()
+    app = cli.PhoneBookCLI()
+    ready = time.perf_counter() - start
+    app.phonebook
+    return ready * 1e3
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    print(f"import app.cli: {import_ms():.1f} ms\n")
+
+    print(f"{'contacts':>10} {'JSON load, ms':>14} {'snapshot load, ms':>18} {'menu ready, ms':>15}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "book.json")
+            JournalStorage(path, backup_policy=BackupPolicy(enabled=False)).save_all(
+                make_contacts(size)
+            )
+            json_ms = load_ms(path, snapshot_cache=False)
+            load_ms(path, snapshot_cache=True)  # writes the cache
+            cached_ms = load_ms(path, snapshot_cache=True)
+            ready_ms = menu_ms(path)
+
+        print(f"{size:>10} {json_ms:>14.1f} {cached_ms:>18.1f} {ready_ms:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_streaming.py
+
+"""
+Compares peak memory of json.load against the streaming JSONStorage.iter_all
+when iterating a large phone book.
+
+Run: python -m benchmarks.bench_streaming [contacts]   (default: 1_000_000)
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from app.storage import JSONStorage
+
+DEFAULT_SIZE = 1_000_000
+
+
+def write_book(path: str, count: int) -> None:
+    """Write count contacts in the JSONStorage layout without building them in memory."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i in range(count):
+            item = {
+                "id": f"{i:032x}",
+                "first_name": f"Name{i}",
+                "last_name": f"Surname{i // 10}",
+                "phones": {"mobile": f"380{i:09d}"},
+                "city": "Kyiv",
+                "job": "Qa",
+                "created_at": "2026-01-01T00:00:00+00:00",
+            }
+            f.write(("  " if i == 0 else ",\n  ") + json.dumps(item, ensure_ascii=False))
+        f.write("\n]")
+
+
+def measure(label: str, func) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:>24} {count:>10} {elapsed:>9.2f}s {peak / 2**20:>10.1f} MiB")
+
+
+def load_whole(path: str) -> int:
+    with open(path, "r", encoding="utf-8") as f:
+        return len(json.load(f))
+
+
+def stream(path: str) -> int:
+    return sum(1 for _ in JSONStorage(path).iter_all())
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "phonebook.json")
+        write_book(path, size)
+        print(f"file size: {os.path.getsize(path) / 2**20:.1f} MiB")
+        print(f"{'loader':>24} {'contacts':>10} {'time':>10} {'peak':>14}")
+        measure("json.load (raw dicts)", lambda: load_whole(path))
+        measure("JSONStorage.get_all", lambda: len(JSONStorage(path).get_all()))
+        measure("JSONStorage.iter_all", lambda: stream(path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+# benchmarks/suite.py
+
+"""
+Benchmark suite for the phone book core: loading, saving, mutations,
+searches, CSV import/export and backups on synthetic books of several sizes.
+
+Results are printed as a table and can be written as JSON. Comparing with a
+stored baseline exits with status 1 if any scenario got slower than the
+tolerance allows, so the suite can gate performance changes.
+
+Run: python -m benchmarks.suite [--sizes 1000,100000,1000000] [--scenarios load,save]
+     [--output results.json] [--baseline benchmarks/baseline.json] [--save-baseline]
+     [--tolerance 0.25] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from app.api import PhoneBook
+from app.backup import BackupPolicy
+from app.binary_storage import BinaryStorage
+from app.cache import QueryCache
+from app.export import export_contacts
+from app.journal import JournalStorage
+from app.models import Contact
+from app.repository import ContactRepository
+from app.storage import JSONStorage
+from app.utils import iter_csv
+from benchmarks.synthetic import make_contacts, misspell
+
+DEFAULT_SIZES = (1_000, 100_000)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_TOLERANCE = 0.25
+SEARCHES = 200
+NO_BACKUPS = BackupPolicy(enabled=False)
+# fsync cost depends on the disk rather than on our code, so it is left out.
+DURABILITY = "none"
+
+
+class MemoryRepository(ContactRepository):
+    """Repository that keeps contacts in memory and never touches disk."""
+
+    def __init__(self, contacts=None):
+        self._contacts = contacts or []
+
+    def get_all(self):
+        return list(self._contacts)
+
+    def save_all(self, contacts):
+        self._contacts = contacts
+
+
+@dataclass
+class Workload:
+    """Data shared by the scenarios of one book size."""
+
+    size: int
+    contacts: list
+    directory: str
+    rng: random.Random
+
+    @property
+    def book_path(self) -> str:
+        """JSON file holding all contacts, written once per size."""
+        return os.path.join(self.directory, "book.json")
+
+    def storage(self, name: str = "book.json", policy: BackupPolicy = NO_BACKUPS) -> JSONStorage:
+        return JSONStorage(os.path.join(self.directory, name), policy, DURABILITY)
+
+    def phonebook(self) -> PhoneBook:
+        """In-memory book without a search cache, so searches are measured uncached."""
+        return PhoneBook(MemoryRepository(self.contacts), QueryCache(max_entries=0))
+
+    def journal(self, name: str) -> JournalStorage:
+        """Journaled storage set up like the CLI's."""
+        return JournalStorage(
+            os.path.join(self.directory, name),
+            backup_policy=NO_BACKUPS,
+            durability=DURABILITY,
+            snapshot_cache=True,
+        )
+
+    @property
+    def mutations(self) -> int:
+        """Mutations are journal appends; stay below the compaction threshold."""
+        return 100
+
+
+def timed(func: Callable[[], object], ops: int = 1) -> tuple[int, float]:
+    start = time.perf_counter()
+    func()
+    return ops, time.perf_counter() - start
+
+
+def bench_load(w: Workload) -> tuple[int, float]:
+    storage = JSONStorage(w.book_path, NO_BACKUPS, DURABILITY)
+    return timed(lambda: PhoneBook(storage))
+
+
+def bench_save(w: Workload) -> tuple[int, float]:
+    storage = w.storage("save.json")
+    return timed(lambda: storage.save_all(w.contacts))
+
+
+def bench_binary_load(w: Workload) -> tuple[int, float]:
+    storage = BinaryStorage(os.path.join(w.directory, "book.pbk"), NO_BACKUPS, DURABILITY)
+    storage.save_all(w.contacts)
+    return timed(lambda: PhoneBook(storage))
+
+
+def bench_binary_save(w: Workload) -> tuple[int, float]:
+    storage = BinaryStorage(os.path.join(w.directory, "save.pbk"), NO_BACKUPS, DURABILITY)
+    return timed(lambda: storage.save_all(w.contacts))
+
+
+def _mutations(w: Workload, run: Callable[[PhoneBook, list], None]) -> tuple[int, float]:
+    storage = w.journal("mutations.json")
+    storage.save_all(w.contacts)
+    phonebook = PhoneBook(storage)
+    targets = w.rng.sample(w.contacts, w.mutations)
+    return timed(lambda: run(phonebook, targets), len(targets))
+
+
+def bench_add(w: Workload) -> tuple[int, float]:
+    def run(phonebook, targets):
+        for i, target in enumerate(targets):
+            phonebook.add_contact(
+                Contact(target.first_name, target.last_name, {"mobile": f"38099{i:09d}"},
+                        target.city, target.job, contact_id=f"new{i}")
+            )
+
+    return _mutations(w, run)
+
+
+def bench_update(w: Workload) -> tuple[int, float]:
+    def run(phonebook, targets):
+        for target in targets:
+            phonebook.update_contact(target.id, {"city": "Kyiv", "job": "Engineer"})
+
+    return _mutations(w, run)
+
+
+def bench_delete(w: Workload) -> tuple[int, float]:
+    def run(phonebook, targets):
+        for target in targets:
+            phonebook.delete_contact(target.id)
+
+    return _mutations(w, run)
+
+
+def bench_fuzzy_search(w: Workload) -> tuple[int, float]:
+    phonebook = w.phonebook()
+    queries = [misspell(c.last_name, w.rng) for c in w.rng.choices(w.contacts, k=SEARCHES)]
+    return timed(lambda: [phonebook.search_by_lastname(q) for q in queries], len(queries))
+
+
+def bench_phone_search(w: Workload) -> tuple[int, float]:
+    phonebook = w.phonebook()
+    numbers = [c.phones["mobile"] for c in w.rng.choices(w.contacts, k=SEARCHES)]
+    queries = [number[-7:-1] for number in numbers]
+    return timed(lambda: [phonebook.search_by_phone(q) for q in queries], len(queries))
+
+
+def bench_phone_prefix(w: Workload) -> tuple[int, float]:
+    phonebook = w.phonebook()
+    numbers = [c.phones["mobile"] for c in w.rng.choices(w.contacts, k=SEARCHES)]
+    queries = [number[:-2] for number in numbers]
+    return timed(lambda: [phonebook.search_by_phone_prefix(q) for q in queries], len(queries))
+
+
+def bench_dedupe(w: Workload) -> tuple[int, float]:
+    # About 1% duplicates: same number in another format, slightly different name.
+    duplicates = [
+        Contact(c.first_name, misspell(c.last_name, w.rng), {"mobile": "0" + c.phones["mobile"][-9:]},
+                contact_id=f"dup{i}")
+        for i, c in enumerate(w.rng.sample(w.contacts, max(1, w.size // 100)))
+    ]
+    phonebook = PhoneBook(MemoryRepository(w.contacts + duplicates), QueryCache(max_entries=0))
+    return timed(phonebook.find_duplicates, w.size)
+
+
+def bench_query(w: Workload) -> tuple[int, float]:
+    phonebook = w.phonebook()
+    queries = [
+        f"city={c.city} AND job~{c.job[:3] or 'e'} AND phone^{c.phones['mobile'][:5]}"
+        for c in w.rng.choices(w.contacts, k=SEARCHES)
+    ]
+    return timed(lambda: [list(phonebook.query(q, limit=20)) for q in queries], len(queries))
+
+
+def bench_query_scan(w: Workload) -> tuple[int, float]:
+    # No indexed predicate: a full scan of the book.
+    phonebook = w.phonebook()
+    return timed(lambda: list(phonebook.query("first_name^a AND job~eer")))
+
+
+def bench_csv_export(w: Workload) -> tuple[int, float]:
+    path = os.path.join(w.directory, "export.csv")
+    return timed(lambda: export_contacts(w.contacts, path, "csv"), w.size)
+
+
+def bench_csv_import(w: Workload) -> tuple[int, float]:
+    path = os.path.join(w.directory, "import.csv")
+    export_contacts(w.contacts, path, "csv")
+    phonebook = PhoneBook(MemoryRepository())
+    return timed(lambda: phonebook.bulk_import(iter_csv(path)), w.size)
+
+
+def _backup(w: Workload, compress: bool) -> tuple[int, float]:
+    policy = BackupPolicy(keep=3, coalesce_window=0, compress=compress)
+    storage = w.storage("backed_up.json", policy)
+    storage.save_all(w.contacts)
+    return timed(storage.backups.backup)
+
+
+def bench_backup(w: Workload) -> tuple[int, float]:
+    return _backup(w, compress=False)
+
+
+def bench_backup_gz(w: Workload) -> tuple[int, float]:
+    return _backup(w, compress=True)
+
+
+SCENARIOS: dict[str, Callable[[Workload], tuple[int, float]]] = {
+    "load": bench_load,
+    "save": bench_save,
+    "binary_load": bench_binary_load,
+    "binary_save": bench_binary_save,
+    "add": bench_add,
+    "update": bench_update,
+    "delete": bench_delete,
+    "fuzzy_search": bench_fuzzy_search,
+    "phone_search": bench_phone_search,
+    "phone_prefix": bench_phone_prefix,
+    "dedupe": bench_dedupe,
+    "query": bench_query,
+    "query_scan": bench_query_scan,
+    "csv_export": bench_csv_export,
+    "csv_import": bench_csv_import,
+    "backup": bench_backup,
+    "backup_gz": bench_backup_gz,
+}
+
+
+def run(sizes, scenarios, repeat: int, seed: int) -> dict:
+    """
+    Run scenarios for every size and return {"meta": ..., "results": ...}
+    where results maps "scenario@size" to the best of repeat runs.
+    """
+    results = {}
+    for size in sizes:
+        contacts = make_contacts(size, seed)
+        with tempfile.TemporaryDirectory() as directory:
+            workload = Workload(size, contacts, directory, random.Random(seed))
+            JSONStorage(workload.book_path, NO_BACKUPS, DURABILITY).save_all(contacts)
+
+            for name in scenarios:
+                best = None
+                for _ in range(repeat):
+                    ops, seconds = SCENARIOS[name](workload)
+                    if best is None or seconds / ops < best[1] / best[0]:
+                        best = (ops, seconds)
+
+                ops, seconds = best
+                results[f"{name}@{size}"] = {
+                    "scenario": name,
+                    "size": size,
+                    "ops": ops,
+                    "seconds": round(seconds, 6),
+                    "us_per_op": round(seconds / ops * 1e6, 3),
+                }
+                print(f"{name:>14} {size:>10} {ops:>8} {seconds / ops * 1e6:>16.1f}", flush=True)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Print current vs baseline per-op times and return the keys of
+    scenarios slower than baseline * (1 + tolerance).
+    """
+    regressions = []
+    print(f"\n{'scenario@size':>24} {'baseline, us':>14} {'current, us':>14} {'ratio':>8}")
+    for key, result in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+
+        ratio = result["us_per_op"] / base["us_per_op"] if base["us_per_op"] else 1.0
+        mark = ""
+        if ratio > 1 + tolerance:
+            regressions.append(key)
+            mark = "  REGRESSION"
+        print(f"{key:>24} {base['us_per_op']:>14.1f} {result['us_per_op']:>14.1f} {ratio:>8.2f}{mark}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(map(str, DEFAULT_SIZES)),
+        help="comma-separated book sizes, e.g. 1000,100000,1000000",
+    )
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated scenarios")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per scenario, best is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="store results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown vs baseline, 0.25 = 25%%")
+    args = parser.parse_args(argv)
+
+    scenarios = args.scenarios.split(",")
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    print(f"{'scenario':>14} {'contacts':>10} {'ops':>8} {'per op, us':>16}")
+    current = run(sizes, scenarios, args.repeat, args.seed)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.tolerance:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# benchmarks/synthetic.py
+
+"""
+Deterministic generator of realistic-looking contacts for benchmarks.
+"""
+
+import random
+from collections.abc import Iterator
+
+from app.models import Contact
+
+FIRST_NAMES = (
+    "Olena", "Oksana", "Iryna", "Nataliia", "Tetiana", "Yuliia", "Mariia", "Anna",
+    "Kateryna", "Sofiia", "Lesya", "Halyna", "Andrii", "Oleksandr", "Serhii", "Dmytro",
+    "Ivan", "Mykola", "Volodymyr", "Taras", "Bohdan", "Yurii", "Petro", "Maksym",
+)
+SURNAME_ROOTS = (
+    "Koval", "Shevch", "Bond", "Tkach", "Kravch", "Melnyk", "Oliin", "Moroz", "Lysen",
+    "Marchen", "Savch", "Rudn", "Hrytsen", "Pavl", "Kuzm", "Levch", "Dmytr", "Symon",
+    "Ostap", "Hnat", "Vasyl", "Bilous", "Zaporozh", "Kosach", "Franc", "Stus", "Zhuk",
+    "Prokop", "Yatsen", "Lutsen",
+)
+SURNAME_SUFFIXES = ("enko", "uk", "chuk", "ak", "yshyn", "ets", "iv", "ko", "ovych", "ii")
+CITIES = (
+    "Kyiv", "Lviv", "Odesa", "Kharkiv", "Dnipro", "Zaporizhzhia", "Vinnytsia",
+    "Poltava", "Chernihiv", "Uzhhorod", "Ivano-Frankivsk", "Ternopil", "Lutsk", "Rivne",
+)
+JOBS = ("Engineer", "Teacher", "Doctor", "QA", "Designer", "Accountant", "Driver", "Manager", "")
+MOBILE_CODES = ("50", "63", "66", "67", "68", "73", "93", "95", "96", "97", "98", "99")
+
+
+def surnames() -> list[str]:
+    """All surnames the generator can produce (roots x suffixes)."""
+    return [root + suffix for root in SURNAME_ROOTS for suffix in SURNAME_SUFFIXES]
+
+
+def iter_contacts(count: int, seed: int = 0) -> Iterator[Contact]:
+    """
+    Yield count contacts with unique IDs and phone numbers.
+
+    Every contact has a mobile number; some also have a home or work one.
+    The same seed always yields the same contacts.
+    """
+    rng = random.Random(seed)
+    names = surnames()
+    for i in range(count):
+        phones = {"mobile": f"380{rng.choice(MOBILE_CODES)}{i:07d}"}
+        if rng.random() < 0.3:
+            phones["home"] = f"044{i:07d}"
+        if rng.random() < 0.1:
+            phones["work"] = f"0800{i:07d}"
+
+        yield Contact(
+            rng.choice(FIRST_NAMES),
+            rng.choice(names),
+            phones,
+            city=rng.choice(CITIES),
+            job=rng.choice(JOBS),
+            contact_id=f"c{i:07d}",
+            created_at=f"2026-01-01T00:00:00.{i % 1_000_000:06d}+00:00",
+        )
+
+
+def make_contacts(count: int, seed: int = 0) -> list[Contact]:
+    return list(iter_contacts(count, seed))
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    """Drop, double or swap one character, the way users mistype surnames."""
+    i = rng.randrange(1, len(word) - 1)
+    edit = rng.randrange(3)
+    if edit == 0:
+        return word[:i] + word[i + 1:]
+    if edit == 1:
+        return word[:i] + word[i] + word[i:]
+    return word[:i - 1] + word[i] + word[i - 1] + word[i + 1:]
@@ -1,6 +1,8 @@
 # main.py
 
-from app.cli import PhoneBookCLI
+import sys
+
+from app.cli import main
 
 if __name__ == "__main__":
-    PhoneBookCLI().run()
+    sys.exit(main())
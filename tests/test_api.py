@@ -1,8 +1,11 @@
 # tests/test_api.py
 
+import threading
+import time
+import pytest
 from app.api import PhoneBook
 from app.models import Contact
-from app.repository import ContactRepository
+from app.repository import ContactRepository, IncrementalRepository
 
 
 class FakeRepository(ContactRepository):
@@ -20,6 +23,36 @@ class FakeRepository(ContactRepository):
         self._contacts = list(contacts)
 
 
+class CountingRepository(FakeRepository):
+    """FakeRepository that counts full rewrites."""
+
+    saves = 0
+
+    def save_all(self, contacts):
+        self.saves += 1
+        super().save_all(contacts)
+
+
+class DeltaRepository(IncrementalRepository, FakeRepository):
+    """Incremental fake that records every apply_changes() delta."""
+
+    def __init__(self, initial_contacts=None):
+        super().__init__(initial_contacts)
+        self.deltas = []
+
+    def apply_changes(self, inserts, updates, deletes):
+        self.deltas.append((
+            [c.id for c in inserts],
+            [(c.id, set(c.dirty_fields)) for c in updates],
+            list(deletes),
+        ))
+
+    def insert(self, contact):
+        raise AssertionError("expected apply_changes()")
+
+    update = delete = insert
+
+
 def sample_contact(contact_id="1"):
     return Contact(
         first_name="Lesya",
@@ -117,3 +150,337 @@ def test_search_by_phone_partial():
 
     assert len(results) == 1
     assert results[0].phones["mobile"] == "987654"
+
+
+def test_find_by_id_uses_index():
+    c1 = sample_contact("1")
+    c2 = Contact("Ivan", "Franko", {"mobile": "999"}, contact_id="2")
+
+    phonebook = PhoneBook(FakeRepository([c1, c2]))
+
+    assert phonebook.find_by_id("2") is c2
+    assert phonebook.find_by_id("999") is None
+
+
+def test_secondary_indexes_follow_updates():
+    contact = sample_contact("1")
+    phonebook = PhoneBook(FakeRepository([contact]))
+
+    assert phonebook.find_by_city("kyiv") == [contact]
+
+    phonebook.update_contact("1", {"city": "Lviv", "job": "Dev"})
+
+    assert phonebook.find_by_city("Kyiv") == []
+    assert phonebook.find_by_city("lviv") == [contact]
+    assert phonebook.find_by_job("dev") == [contact]
+    assert phonebook.find_by_lastname("ukrainka") == [contact]
+
+
+def test_secondary_indexes_follow_delete():
+    contact = sample_contact("1")
+    phonebook = PhoneBook(FakeRepository([contact]))
+
+    phonebook.delete_contact("1")
+
+    assert phonebook.find_by_lastname("Ukrainka") == []
+    assert phonebook.find_by_city("Kyiv") == []
+
+
+def test_search_by_phone_follows_updates():
+    phonebook = PhoneBook(FakeRepository([sample_contact("1")]))
+
+    phonebook.update_contact("1", {"phones": {"mobile": "+380 67 555"}})
+
+    assert phonebook.search_by_phone("12345") == []
+    assert [c.id for c in phonebook.search_by_phone("067 5")] == ["1"]
+    assert [c.id for c in phonebook.search_by_phone_prefix("38067")] == ["1"]
+
+
+def test_search_by_lastname_follows_updates():
+    phonebook = PhoneBook(FakeRepository([sample_contact("1")]))
+
+    phonebook.update_contact("1", {"last_name": "Kosach"})
+
+    assert phonebook.search_by_lastname("ukrain") == []
+    assert [c.id for c in phonebook.search_by_lastname("kosac")] == ["1"]
+
+
+def test_search_results_are_cached_by_normalized_query():
+    phonebook = PhoneBook(FakeRepository([sample_contact("1")]))
+
+    phonebook.search_by_lastname("Ukrain")
+    phonebook.search_by_lastname("  ukrain ")
+    phonebook.search_by_phone("123")
+    phonebook.search_by_phone("1-2-3")
+
+    stats = phonebook.cache.stats()
+    assert (stats.hits, stats.misses) == (2, 2)
+
+
+def test_search_cache_invalidated_by_mutations():
+    phonebook = PhoneBook(FakeRepository([sample_contact("1")]))
+    assert [c.id for c in phonebook.search_by_phone_prefix("123")] == ["1"]
+    assert [c.id for c in phonebook.search_by_lastname("ukrain")] == ["1"]
+
+    phonebook.add_contact(sample_contact("2"))
+    assert sorted(c.id for c in phonebook.search_by_phone_prefix("123")) == ["1", "2"]
+
+    phonebook.delete_contact("1")
+    assert [c.id for c in phonebook.search_by_lastname("ukrain")] == ["2"]
+
+
+def test_update_invalidates_only_affected_searches():
+    phonebook = PhoneBook(FakeRepository([sample_contact("1")]))
+    phonebook.search_by_lastname("ukrain")
+    phonebook.search_by_phone("123")
+
+    phonebook.update_contact("1", {"city": "Lviv"})
+    phonebook.search_by_lastname("ukrain")
+    phonebook.search_by_phone("123")
+    assert phonebook.cache.stats().hits == 2
+
+    phonebook.update_contact("1", {"phones": {"mobile": "777"}})
+    assert phonebook.search_by_phone("123") == []
+    assert [c.id for c in phonebook.search_by_lastname("ukrain")] == ["1"]
+    assert phonebook.cache.stats().hits == 3
+
+
+def test_page_insertion_order_window():
+    contacts = [sample_contact(str(i)) for i in range(5)]
+    phonebook = PhoneBook(FakeRepository(contacts))
+
+    assert [c.id for c in phonebook.page(1, 2)] == ["1", "2"]
+    assert [c.id for c in phonebook.page(4)] == ["4"]
+    assert len(phonebook) == 5
+
+
+def test_page_sorted():
+    contacts = [
+        Contact("Ivan", "Franko", {}, contact_id="1"),
+        Contact("Lesya", "Ukrainka", {}, contact_id="2"),
+        Contact("Taras", "Shevchenko", {}, contact_id="3"),
+    ]
+    phonebook = PhoneBook(FakeRepository(contacts))
+
+    assert [c.id for c in phonebook.page(0, 2, sort_by="last_name")] == ["1", "3"]
+    assert [c.id for c in phonebook.page(1, 2, sort_by="last_name")] == ["3", "2"]
+    assert [c.id for c in phonebook.page(sort_by="first_name", reverse=True)] == ["3", "2", "1"]
+
+
+def test_add_many_validates_dedupes_and_commits_once():
+    repo = CountingRepository([sample_contact("1")])
+    phonebook = PhoneBook(repo)
+
+    report = phonebook.add_many([
+        Contact("Ivan", "Franko", {"mobile": "98765"}, contact_id="2"),
+        Contact("Taras", "Shevchenko", {"mobile": "12345"}, contact_id="3"),
+        Contact("Olena", "Pchilka", {"mobile": "98765"}, contact_id="4"),
+        Contact("Marko", "Vovchok", {"mobile": "12"}, contact_id="5"),
+        Contact("Ivan", "Franko", {"mobile": "55555"}, contact_id="1"),
+        Contact("Mykola", "Lysenko", {"mobile": "+38 050 111"}, contact_id="6"),
+    ])
+
+    assert report.added == 2
+    assert [row for row, _ in report.errors] == [2, 3, 4, 5]
+    assert repo.saves == 1
+    assert [c.id for c in repo.get_all()] == ["1", "2", "6"]
+
+
+def test_add_many_commits_one_delta_and_retries_failures():
+    class FailingOnceRepository(DeltaRepository):
+        def apply_changes(self, inserts, updates, deletes):
+            if not self.deltas and not getattr(self, "failed", False):
+                self.failed = True
+                raise OSError("disk full")
+            super().apply_changes(inserts, updates, deletes)
+
+    repo = FailingOnceRepository()
+    phonebook = PhoneBook(repo)
+
+    try:
+        phonebook.add_many([sample_contact("1"), Contact("Ivan", "Franko", {"mobile": "98765"}, contact_id="2")])
+    except OSError:
+        pass
+    assert phonebook.pending_changes().added == {"1", "2"}
+
+    phonebook.add_contact(Contact("Taras", "Shevchenko", {"mobile": "55555"}, contact_id="3"))
+
+    assert repo.deltas == [(["1", "2", "3"], [], [])]
+    assert not phonebook.pending_changes().added
+
+
+def test_bulk_import_reports_rows_across_batches():
+    phonebook = PhoneBook(FakeRepository())
+    rows = [
+        {"first_name": "A", "last_name": "B", "phones": {"mobile": f"1000{i}"}}
+        for i in range(5)
+    ]
+    rows[3]["last_name"] = ""
+
+    report = phonebook.bulk_import(rows, batch_size=2)
+
+    assert report.added == 4
+    assert report.errors == [(4, "first and last name are required")]
+
+
+def test_bulk_import_reports_malformed_rows():
+    phonebook = PhoneBook(FakeRepository())
+    rows = [
+        {"first_name": "A", "last_name": "B", "phones": {"mobile": "10001"}},
+        {"first_name": None, "last_name": "Ivan", "phones": {}},
+        {"first_name": "C", "last_name": "D", "phones": {"mobile": "10002"}},
+        {"first_name": "E", "last_name": "F", "phones": {"mobile": "10002"}},
+    ]
+
+    report = phonebook.bulk_import(rows, batch_size=3)
+
+    assert report.added == 2
+    assert [row for row, _ in report.errors] == [2, 4]
+    assert report.errors[0][1].startswith("malformed row")
+
+
+def test_transaction_flushes_once():
+    repo = CountingRepository([sample_contact("1")])
+    phonebook = PhoneBook(repo)
+
+    with phonebook.transaction():
+        phonebook.add_contact(sample_contact("2"))
+        phonebook.update_contact("1", {"city": "Lviv"})
+        phonebook.delete_contact("2")
+        assert repo.saves == 0
+
+    assert repo.saves == 1
+    assert [(c.id, c.city) for c in repo.get_all()] == [("1", "Lviv")]
+
+
+def test_transaction_rolls_back_on_error():
+    contact = sample_contact("1")
+    repo = CountingRepository([contact])
+    phonebook = PhoneBook(repo)
+
+    try:
+        with phonebook.batch():
+            phonebook.update_contact("1", {"city": "Lviv", "last_name": "Kosach"})
+            phonebook.add_contact(sample_contact("2"))
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    assert repo.saves == 0
+    assert [c.id for c in phonebook.contacts] == ["1"]
+    assert contact.city == "Kyiv"
+    assert phonebook.find_by_lastname("Ukrainka") == [contact]
+    assert phonebook.find_by_city("Lviv") == []
+
+
+def test_write_behind_flushes_after_max_dirty():
+    repo = CountingRepository()
+    phonebook = PhoneBook(repo)
+
+    phonebook.start_write_behind(max_dirty=2, interval=None)
+    phonebook.add_contact(sample_contact("1"))
+    assert repo.saves == 0
+    phonebook.add_contact(sample_contact("2"))
+    assert repo.saves == 1
+
+    phonebook.add_contact(sample_contact("3"))
+    phonebook.stop_write_behind()
+    assert repo.saves == 2
+    assert len(repo.get_all()) == 3
+
+
+def test_write_behind_timer_survives_unexpected_errors():
+    class FlakyRepository(CountingRepository):
+        def save_all(self, contacts):
+            if self.saves == 0:
+                self.saves += 1
+                raise TypeError("unexpected")
+            super().save_all(contacts)
+
+    repo = FlakyRepository()
+    phonebook = PhoneBook(repo)
+    phonebook.start_write_behind(max_dirty=0, interval=0.02)
+    phonebook.add_contact(sample_contact("1"))
+
+    deadline = time.monotonic() + 5
+    while not repo.get_all() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert repo.saves == 2
+    assert [c.id for c in repo.get_all()] == ["1"]
+    phonebook.stop_write_behind()
+
+
+@pytest.mark.parametrize("updates", [
+    {"phones": "555555", "city": "Lviv"},
+    {"phones": {"mobile": 555555}},
+    {"city": None},
+    ["city", "Lviv"],
+])
+def test_update_contact_rejects_invalid_values(updates):
+    phonebook = PhoneBook(FakeRepository([sample_contact("1")]))
+
+    with pytest.raises(TypeError):
+        phonebook.update_contact("1", updates)
+
+    contact = phonebook.find_by_id("1")
+    assert (contact.city, contact.phones) == ("Kyiv", {"mobile": "12345"})
+    assert phonebook.find_by_city("Kyiv") == [contact]
+    assert phonebook.search_by_phone("12345") == [contact]
+    assert not phonebook.pending_changes()
+
+
+def test_commits_pass_deltas_to_incremental_repository():
+    repo = DeltaRepository([sample_contact("1")])
+    phonebook = PhoneBook(repo)
+
+    phonebook.add_contact(sample_contact("2"))
+    phonebook.update_contact("1", {"city": "Lviv", "job": "Qa"})
+    phonebook.delete_contact("2")
+
+    assert repo.deltas == [(["2"], [], []), ([], [("1", {"city"})], []), ([], [], ["2"])]
+    assert phonebook.find_by_id("1").dirty_fields == frozenset()
+
+
+def test_update_without_changes_writes_nothing():
+    repo = CountingRepository([sample_contact("1")])
+    phonebook = PhoneBook(repo)
+
+    assert phonebook.update_contact("1", {"city": "Kyiv", "job": "Qa"}) is True
+    assert repo.saves == 0
+
+
+def test_pending_changes_collect_the_change_set():
+    phonebook = PhoneBook(FakeRepository([sample_contact("1"), sample_contact("2")]))
+
+    with phonebook.transaction():
+        phonebook.add_contact(sample_contact("3"))
+        phonebook.update_contact("1", {"city": "Lviv"})
+        phonebook.delete_contact("2")
+        changes = phonebook.pending_changes()
+
+    assert (changes.added, changes.modified, changes.deleted) == ({"3"}, {"1"}, {"2"})
+    assert not phonebook.pending_changes()
+
+
+def test_read_holds_lock_against_concurrent_mutations():
+    phonebook = PhoneBook(DeltaRepository())
+    errors = []
+    done = threading.Event()
+
+    def reader():
+        while not done.is_set():
+            try:
+                phonebook.read(lambda: list(phonebook.page(0, None)))
+            except RuntimeError as e:
+                errors.append(e)
+                return
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    for i in range(20000):
+        phonebook.add_contact(Contact("Name", "Surname", {"mobile": f"5{i:06d}"}, contact_id=str(i)))
+    done.set()
+    thread.join()
+
+    assert errors == []
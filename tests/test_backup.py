@@ -0,0 +1,89 @@
+# tests/test_backup.py
+
+import glob
+import os
+from app.backup import BackupManager, BackupPolicy
+from app.models import Contact
+from app.storage import JSONStorage
+
+TEST_FILE = "data/test_backup_phonebook.json"
+
+
+def teardown_function():
+    for path in glob.glob(f"{TEST_FILE}*"):
+        os.remove(path)
+
+
+def sample_contact(contact_id="1", city=""):
+    return Contact("Lesya", "Ukrainka", {"mobile": "12345"}, city=city, contact_id=contact_id)
+
+
+def test_backups_are_coalesced_within_window():
+    storage = JSONStorage(TEST_FILE, BackupPolicy(coalesce_window=60))
+
+    for i in range(5):
+        storage.save_all([sample_contact(str(i))])
+
+    assert len(storage.backups.list_backups()) == 1
+
+
+def test_backups_are_pruned_by_count():
+    storage = JSONStorage(TEST_FILE, BackupPolicy(keep=3, coalesce_window=0))
+
+    for i in range(6):
+        storage.save_all([sample_contact(str(i))])
+
+    assert len(storage.backups.list_backups()) == 3
+
+
+def test_compressed_backup_restores():
+    storage = JSONStorage(TEST_FILE, BackupPolicy(compress=True, coalesce_window=0))
+    storage.save_all([sample_contact("1")])
+    storage.save_all([sample_contact("2")])
+
+    [backup] = storage.backups.list_backups()
+    assert backup.endswith(".bak.gz")
+    assert [item["id"] for item in storage.backups.restore(backup)] == ["1"]
+
+
+def test_incremental_backups_store_only_changes():
+    policy = BackupPolicy(incremental=True, coalesce_window=0)
+    storage = JSONStorage(TEST_FILE, policy)
+
+    storage.save_all([sample_contact("1"), sample_contact("2")])
+    storage.save_all([sample_contact("1", city="Kyiv"), sample_contact("2")])
+    storage.save_all([sample_contact("1", city="Kyiv")])
+    storage.save_all([sample_contact("3")])
+
+    backups = storage.backups.list_backups()
+    assert [b.endswith(".delta") for b in backups] == [False, True, True]
+
+    restored = storage.backups.restore(backups[1])
+    assert {item["id"]: item["city"] for item in restored} == {"1": "Kyiv", "2": ""}
+    assert [item["id"] for item in storage.backups.restore(backups[2])] == ["1"]
+
+
+def test_prune_keeps_base_of_retained_delta():
+    policy = BackupPolicy(keep=1, incremental=True, coalesce_window=0)
+    storage = JSONStorage(TEST_FILE, policy)
+
+    storage.save_all([sample_contact("1")])
+    storage.save_all([sample_contact("2")])
+    storage.save_all([sample_contact("3")])
+
+    backups = storage.backups.list_backups()
+    assert len(backups) == 2
+    assert [item["id"] for item in storage.backups.restore(backups[-1])] == ["2"]
+
+
+def test_no_backup_for_missing_file():
+    assert BackupManager(TEST_FILE).backup() is None
+
+
+def test_disabled_policy_makes_no_backups():
+    storage = JSONStorage(TEST_FILE, BackupPolicy(enabled=False, coalesce_window=0))
+
+    storage.save_all([sample_contact("1")])
+    storage.save_all([sample_contact("2")])
+
+    assert storage.backups.list_backups() == []
@@ -0,0 +1,128 @@
+# tests/test_binary_storage.py
+
+import glob
+import os
+import pytest
+from app.api import PhoneBook
+from app.backup import BackupPolicy
+from app.binary_storage import BinaryStorage, binary_to_json, json_to_binary
+from app.models import Contact
+from app.storage import JSONStorage
+
+TEST_FILE = "data/test_phonebook.pbk"
+JSON_FILE = "data/test_binary.json"
+
+
+def teardown_function():
+    for path in glob.glob(f"{TEST_FILE}*") + glob.glob(f"{JSON_FILE}*"):
+        os.remove(path)
+
+
+def sample_contacts(count=3):
+    return [
+        Contact("Лариса", f"Косач{i}", {"mobile": f"+38067{i:07d}", "home": f"044{i:07d}"},
+                city="Kyiv" if i % 2 else "", job="Poet", contact_id=str(i))
+        for i in range(count)
+    ]
+
+
+def test_get_all_file_not_exists():
+    assert BinaryStorage("data/no_such_file.pbk").get_all() == []
+
+
+def test_save_all_and_get_all_contacts():
+    storage = BinaryStorage(TEST_FILE)
+    contacts = sample_contacts()
+
+    storage.save_all(contacts)
+    loaded = storage.get_all()
+
+    assert [c.to_dict() for c in loaded] == [c.to_dict() for c in contacts]
+
+
+def test_get_by_id_reads_single_record():
+    storage = BinaryStorage(TEST_FILE)
+    storage.save_all(sample_contacts(500))
+
+    assert storage.get_by_id("321").last_name == "Косач321"
+    assert storage.get_by_id("321").phones["home"] == "0440000321"
+    assert storage.get_by_id("missing") is None
+
+    storage.save_all(sample_contacts(2))
+    assert storage.get_by_id("321") is None
+    assert storage.get_by_id("1").city == "Kyiv"
+    storage.close()
+
+
+def test_empty_book_round_trip():
+    storage = BinaryStorage(TEST_FILE)
+    storage.save_all([])
+
+    assert storage.get_all() == []
+    assert storage.get_by_id("1") is None
+
+
+def test_corrupt_file_is_rejected():
+    with open(TEST_FILE, "wb") as f:
+        f.write(b"[not a binary phone book]")
+
+    storage = BinaryStorage(TEST_FILE)
+    assert storage.get_all() == []
+    with pytest.raises(ValueError):
+        storage.get_by_id("1")
+
+
+def test_nul_in_value_is_rejected():
+    contact = Contact("Lesya", "Ukra\x00inka", {"mobile": "123"}, contact_id="1")
+
+    with pytest.raises(ValueError):
+        BinaryStorage(TEST_FILE).save_all([contact])
+
+
+@pytest.mark.parametrize("city, job, label", [
+    ("Ky\x00iv", "Poet", "mobile"),
+    ("Kyiv", "Po\x00et", "mobile"),
+    ("Kyiv", "Poet", "mo\x00bile"),
+])
+def test_nul_in_string_table_value_is_rejected(city, job, label):
+    contact = Contact("Lesya", "Ukrainka", {label: "123"}, city=city, job=job, contact_id="1")
+
+    with pytest.raises(ValueError):
+        BinaryStorage(TEST_FILE).save_all([contact])
+
+
+def test_numeric_phone_values_are_stored_as_text():
+    contact = Contact.from_trusted("1", "Lesya", "Ukrainka", {"mobile": 380671234567}, "", "", None)
+    storage = BinaryStorage(TEST_FILE)
+
+    storage.save_all([contact])
+
+    assert storage.get_all()[0].phones == {"mobile": "380671234567"}
+
+
+def test_incremental_backups_are_rejected():
+    with pytest.raises(ValueError):
+        BinaryStorage(TEST_FILE, BackupPolicy(incremental=True))
+
+
+def test_json_conversion_round_trip():
+    contacts = sample_contacts(10)
+    JSONStorage(JSON_FILE).save_all(contacts)
+
+    assert json_to_binary(JSON_FILE, TEST_FILE) == 10
+    assert os.path.getsize(TEST_FILE) < os.path.getsize(JSON_FILE) / 2
+
+    os.remove(JSON_FILE)
+    assert binary_to_json(TEST_FILE, JSON_FILE) == 10
+    assert [c.to_dict() for c in JSONStorage(JSON_FILE).get_all()] == [c.to_dict() for c in contacts]
+
+
+def test_phonebook_on_binary_storage():
+    book = PhoneBook(BinaryStorage(TEST_FILE))
+    for contact in sample_contacts():
+        book.add_contact(contact)
+    book.delete_contact("1")
+
+    reloaded = PhoneBook(BinaryStorage(TEST_FILE))
+
+    assert sorted(c.id for c in reloaded.contacts) == ["0", "2"]
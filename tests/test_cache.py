@@ -0,0 +1,63 @@
+# tests/test_cache.py
+
+import time
+
+from app.cache import QueryCache
+
+
+def test_hit_and_miss_counted():
+    cache = QueryCache()
+
+    assert cache.get("phone", "067") is None
+    cache.put("phone", "067", ["1", "2"], cache.generation("phone"))
+
+    assert cache.get("phone", "067") == ("1", "2")
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries, stats.cost) == (1, 1, 1, 3)
+
+
+def test_invalidate_only_affects_its_kind():
+    cache = QueryCache()
+    cache.put("phone", "067", ["1"], 0)
+    cache.put("last_name", "kosach", ["2"], 0)
+
+    cache.invalidate("phone")
+
+    assert cache.get("phone", "067") is None
+    assert cache.get("last_name", "kosach") == ("2",)
+
+
+def test_result_computed_before_invalidation_is_not_cached():
+    cache = QueryCache()
+    generation = cache.generation("phone")
+    cache.invalidate("phone")
+
+    cache.put("phone", "067", ["1"], generation)
+
+    assert cache.get("phone", "067") is None
+
+
+def test_lru_eviction_by_entries_and_cost():
+    cache = QueryCache(max_entries=2, max_cost=10)
+    cache.put("phone", "a", ["1"], 0)
+    cache.put("phone", "b", ["2"], 0)
+    cache.get("phone", "a")
+    cache.put("phone", "c", ["3"], 0)
+
+    assert cache.get("phone", "b") is None
+    assert cache.get("phone", "a") == ("1",)
+
+    cache.put("phone", "big", [str(i) for i in range(8)], 0)
+    assert cache.stats().cost <= 10
+    assert cache.stats().evictions == 3
+    assert cache.get("phone", "big") is not None
+
+
+def test_ttl_expiry():
+    cache = QueryCache(ttl=0.01)
+    cache.put("phone", "067", ["1"], 0)
+
+    time.sleep(0.02)
+
+    assert cache.get("phone", "067") is None
+    assert cache.stats().entries == 0
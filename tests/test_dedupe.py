@@ -0,0 +1,72 @@
+# tests/test_dedupe.py
+
+from app.api import PhoneBook
+from app.dedupe import canonical_phone, find_duplicates, merged_fields
+from app.models import Contact
+from tests.test_api import CountingRepository, FakeRepository
+
+
+def contact(cid, first, last, phones, created="2026-01-0{}T00:00:00+00:00", **fields):
+    return Contact(first, last, phones, contact_id=cid, created_at=created.format(cid), **fields)
+
+
+def test_canonical_phone_ignores_country_and_trunk_prefix():
+    assert canonical_phone("+380 (67) 123-45-67") == "671234567"
+    assert canonical_phone("067 123 45 67") == "671234567"
+    assert canonical_phone("12345") == "12345"
+
+
+def test_find_duplicates_groups_by_phone_and_similar_name():
+    contacts = [
+        contact("1", "Lesya", "Ukrainka", {"mobile": "+380671234567"}),
+        contact("2", "Lesia", "Ukrainka", {"mobile": "0671234567", "home": "0441112233"}),
+        contact("3", "Ukrainka", "Lesya", {"home": "044 111 22 33"}),
+        contact("4", "Ivan", "Franko", {"mobile": "0671234567"}),
+        contact("5", "Taras", "Shevchenko", {"mobile": "0509999999"}),
+    ]
+
+    groups = find_duplicates(contacts)
+
+    assert len(groups) == 1
+    assert groups[0].contact_ids == ["1", "2", "3"]
+    assert groups[0].phones == {"671234567", "441112233"}
+
+
+def test_merged_fields_adds_new_phones_and_fills_blanks():
+    primary = contact("1", "Lesya", "Ukrainka", {"mobile": "0671234567"})
+    other = contact("2", "Lesia", "Ukrainka", {"mobile": "+380671234567", "home": "0441112233"},
+                    city="Kyiv")
+    other2 = contact("3", "Lesya", "Ukrainka", {"mobile": "0502223344"}, job="Poet")
+
+    updates = merged_fields(primary, [other, other2])
+
+    assert updates == {
+        "phones": {"mobile": "0671234567", "home": "0441112233", "mobile2": "0502223344"},
+        "city": "Kyiv",
+        "job": "Poet",
+    }
+
+
+def test_auto_merge_keeps_oldest_and_commits_once():
+    repo = CountingRepository([
+        contact("2", "Lesia", "Ukrainka", {"mobile": "0671234567"}, city="Kyiv"),
+        contact("1", "Lesya", "Ukrainka", {"mobile": "+380671234567"}),
+        contact("3", "Ivan", "Franko", {"mobile": "0501234567"}),
+    ])
+    phonebook = PhoneBook(repo)
+
+    report = phonebook.auto_merge()
+
+    assert report.merged == [("1", ["2"])]
+    assert report.removed == 1
+    assert repo.saves == 1
+    assert sorted(c.id for c in repo.get_all()) == ["1", "3"]
+    assert phonebook.find_by_id("1").city == "Kyiv"
+    assert phonebook.find_duplicates() == []
+
+
+def test_merge_contacts_needs_two_existing_contacts():
+    phonebook = PhoneBook(FakeRepository([contact("1", "Lesya", "Ukrainka", {})]))
+
+    assert phonebook.merge_contacts(["1", "missing"]) is None
+    assert len(phonebook) == 1
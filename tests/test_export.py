@@ -0,0 +1,77 @@
+# tests/test_export.py
+
+import gzip
+import json
+import pytest
+from app.export import export_contacts
+from app.models import Contact
+from app.utils import iter_csv
+
+
+def sample_contacts(count=3):
+    return [
+        Contact("Lesya", "Ukrainka", {"mobile": f"1234{i}", "home": "777"}, city="Kyiv", contact_id=str(i))
+        for i in range(count)
+    ]
+
+
+def test_csv_export_round_trips_through_import(tmp_path):
+    path = str(tmp_path / "out.csv")
+
+    count = export_contacts(iter(sample_contacts()), path, chunk_size=2)
+
+    rows = list(iter_csv(path))
+    assert count == 3
+    assert [r["id"] for r in rows] == ["0", "1", "2"]
+    assert rows[0]["phones"] == {"mobile": "12340", "home": "777"}
+
+
+def test_exploded_csv_has_row_per_phone(tmp_path):
+    path = str(tmp_path / "out.csv")
+
+    export_contacts(sample_contacts(2), path, fmt="csv-exploded")
+
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines[0] == "id,first_name,last_name,phone_type,phone,city,job,created_at"
+    assert len(lines) == 1 + 4
+
+
+def test_exploded_csv_keeps_contacts_without_phones(tmp_path):
+    path = str(tmp_path / "out.csv")
+    contacts = [Contact.from_trusted("9", "Ivan", "Franko", {}, "Lviv", "", "2024-01-01"), *sample_contacts(1)]
+
+    count = export_contacts(contacts, path, fmt="csv-exploded")
+
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert count == 2
+    assert lines[1] == "9,Ivan,Franko,,,Lviv,,2024-01-01"
+    assert len(lines) == 1 + 1 + 2
+
+
+def test_gzip_jsonl_export(tmp_path):
+    path = str(tmp_path / "out.jsonl.gz")
+
+    export_contacts(sample_contacts(), path, fmt="jsonl")
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [r["id"] for r in records] == ["0", "1", "2"]
+    assert records[0]["phones"]["home"] == "777"
+
+
+def test_parallel_export_keeps_order(tmp_path):
+    serial, parallel = str(tmp_path / "a.csv"), str(tmp_path / "b.csv")
+    contacts = sample_contacts(50)
+
+    export_contacts(contacts, serial, chunk_size=7)
+    export_contacts(contacts, parallel, chunk_size=7, workers=2)
+
+    with open(serial, encoding="utf-8") as a, open(parallel, encoding="utf-8") as b:
+        assert a.read() == b.read()
+
+
+def test_unknown_format_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        export_contacts([], str(tmp_path / "out.txt"), fmt="xml")
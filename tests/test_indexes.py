@@ -0,0 +1,103 @@
+# tests/test_indexes.py
+
+import difflib
+import random
+from app.indexes import FieldIndex, FuzzyIndex, PhoneIndex
+from app.models import Contact
+
+
+def test_field_index_add_get_remove():
+    index = FieldIndex("city")
+    contact = Contact("Lesya", "Ukrainka", {"mobile": "12345"}, city="Kyiv", contact_id="1")
+
+    index.add(contact)
+    assert index.get(" KYIV ") == {"1"}
+
+    index.remove(contact)
+    assert index.get("Kyiv") == set()
+    assert len(index) == 0
+
+
+def test_phone_index_prefix_and_substring():
+    index = PhoneIndex()
+    c1 = Contact("Lesya", "Ukrainka", {"mobile": "+380 50 123"}, contact_id="1")
+    c2 = Contact("Ivan", "Franko", {"mobile": "380671", "home": "44"}, contact_id="2")
+    index.add(c1)
+    index.add(c2)
+
+    assert index.prefix("38050") == {"1"}
+    assert index.prefix("380") == {"1", "2"}
+    assert index.search("0501") == {"1"}
+    assert index.search("67") == {"2"}
+    assert index.search("4") == {"2"}
+    assert index.search("0") == {"1", "2"}
+    assert index.search("abc") == set()
+
+    index.remove(c2)
+    assert index.search("67") == set()
+    assert index.prefix("44") == set()
+    assert len(index) == 1
+
+
+def test_phone_index_bulk_sorts_once_on_exit():
+    index = PhoneIndex()
+    contacts = [
+        Contact("Name", "Surname", {"mobile": f"38067{n:05d}"}, contact_id=str(n))
+        for n in (5, 1, 3, 2)
+    ]
+    with index.bulk():
+        for contact in contacts:
+            index.add(contact)
+        index.remove(contacts[2])
+
+    assert index.prefix("380670000") == {"5", "1", "2"}
+    assert index.prefix("3806700001") == {"1"}
+
+
+def test_fuzzy_index_search_and_remove():
+    index = FuzzyIndex("last_name")
+    c1 = Contact("Lesya", "Ukrainka", {"mobile": "12345"}, contact_id="1")
+    c2 = Contact("Ivan", "Franko", {"mobile": "999"}, contact_id="2")
+    c3 = Contact("Petro", "Franco", {"mobile": "998"}, contact_id="3")
+    for contact in (c1, c2, c3):
+        index.add(contact)
+
+    assert [key for _, key in index.search("frank")] == ["franko", "franco"]
+    assert [key for _, key in index.search("frank", limit=1)] == ["franko"]
+    assert index.search("frank", cutoff=0.95) == []
+
+    index.remove(c2)
+    assert [key for _, key in index.search("frank")] == ["franco"]
+    assert index.get("Franko") == set()
+
+
+def test_fuzzy_index_matches_difflib_on_surnames():
+    rng = random.Random(0)
+    suffixes = ["enko", "uk", "chuk", "iv", "ii", "ko", "ych", ""]
+
+    def surname():
+        syllables = rng.randrange(2, 4)
+        return "".join(rng.choice("bdhklmnprstvz") + rng.choice("aeiouy") for _ in range(syllables)) + rng.choice(suffixes)
+
+    keys = sorted({surname() for _ in range(3000)})
+    index = FuzzyIndex("last_name")
+    for i, key in enumerate(keys):
+        index.add(Contact.from_trusted(str(i), "A", key, {}, "", "", None))
+
+    def misspell(word):
+        i = rng.randrange(1, len(word) - 1)
+        return [word[:i] + word[i + 1:], word[:i] + word[i] + word[i:],
+                word[:i - 1] + word[i] + word[i - 1] + word[i + 1:]][rng.randrange(3)]
+
+    for query in [misspell(rng.choice(keys)) for _ in range(60)] + ["obndiv"]:
+        expected = difflib.get_close_matches(query, keys, n=3, cutoff=0.6)
+        scores = [round(difflib.SequenceMatcher(None, key, query).ratio(), 9) for key in expected]
+        assert [round(score, 9) for score, _ in index.search(query)] == sorted(scores, reverse=True), query
+
+
+def test_fuzzy_index_misses_values_without_shared_trigrams():
+    index = FuzzyIndex("last_name")
+    index.add(Contact.from_trusted("1", "A", "zabwcdv", {}, "", "", None))
+
+    assert difflib.get_close_matches("abxcdy", ["zabwcdv"]) == ["zabwcdv"]
+    assert index.search("abxcdy") == []
@@ -0,0 +1,245 @@
+# tests/test_journal.py
+
+import glob
+import multiprocessing
+import os
+import pytest
+from app.api import PhoneBook
+from app.journal import JournalStorage
+from app.models import Contact
+from app.repository import ConflictError
+
+TEST_FILE = "data/test_journal_phonebook.json"
+
+
+def teardown_function():
+    for path in glob.glob(f"{TEST_FILE}*"):
+        os.remove(path)
+
+
+def sample_contact(contact_id="1"):
+    return Contact("Lesya", "Ukrainka", {"mobile": "12345"}, contact_id=contact_id)
+
+
+def test_mutations_append_to_journal_only():
+    storage = JournalStorage(TEST_FILE)
+    phonebook = PhoneBook(storage)
+
+    phonebook.add_contact(sample_contact("1"))
+    phonebook.add_contact(sample_contact("2"))
+    phonebook.update_contact("1", {"city": "Lviv"})
+    phonebook.delete_contact("2")
+
+    assert not os.path.exists(TEST_FILE)
+    with open(storage.journal_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 4
+
+    loaded = JournalStorage(TEST_FILE).get_all()
+    assert [c.id for c in loaded] == ["1"]
+    assert loaded[0].city == "Lviv"
+
+
+def test_compact_folds_journal_into_snapshot():
+    storage = JournalStorage(TEST_FILE)
+    storage.insert(sample_contact("1"))
+    storage.insert(sample_contact("2"))
+    storage.delete("1")
+
+    storage.compact()
+
+    assert not os.path.exists(storage.journal_path)
+    assert [c.id for c in JournalStorage(TEST_FILE).get_all()] == ["2"]
+
+
+def test_auto_compaction_threshold():
+    storage = JournalStorage(TEST_FILE, compact_every=2)
+    storage.insert(sample_contact("1"))
+    storage.insert(sample_contact("2"))
+
+    assert not os.path.exists(storage.journal_path)
+    assert len(JournalStorage(TEST_FILE).get_all()) == 2
+
+
+def test_torn_journal_line_is_ignored():
+    storage = JournalStorage(TEST_FILE)
+    storage.insert(sample_contact("1"))
+    with open(storage.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"op": "add", "contact": {"id"')
+
+    assert [c.id for c in JournalStorage(TEST_FILE).get_all()] == ["1"]
+
+
+def test_torn_journal_line_is_dropped_before_next_append():
+    storage = JournalStorage(TEST_FILE)
+    storage.insert(sample_contact("1"))
+    with open(storage.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"op": "add"')
+
+    reopened = JournalStorage(TEST_FILE)
+    reopened.insert(sample_contact("2"))
+
+    assert [c.id for c in JournalStorage(TEST_FILE).get_all()] == ["1", "2"]
+
+
+def test_iter_all_merges_journal_into_streamed_snapshot():
+    storage = JournalStorage(TEST_FILE)
+    storage.save_all([sample_contact("1"), sample_contact("2"), sample_contact("3")])
+    updated = sample_contact("2")
+    updated.city = "Lviv"
+    storage.update(updated)
+    storage.delete("1")
+    storage.insert(sample_contact("4"))
+
+    contacts = list(JournalStorage(TEST_FILE).iter_all())
+
+    assert [c.id for c in contacts] == ["2", "3", "4"]
+    assert contacts[0].city == "Lviv"
+
+
+def test_insert_many_appends_one_record_per_contact():
+    storage = JournalStorage(TEST_FILE)
+
+    storage.insert_many([sample_contact("1"), sample_contact("2")])
+
+    with open(storage.journal_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 2
+    assert [c.id for c in JournalStorage(TEST_FILE).get_all()] == ["1", "2"]
+
+
+def test_transaction_collapses_changes_into_one_append():
+    storage = JournalStorage(TEST_FILE)
+    phonebook = PhoneBook(storage)
+
+    with phonebook.transaction():
+        phonebook.add_contact(sample_contact("1"))
+        phonebook.update_contact("1", {"city": "Lviv"})
+        phonebook.add_contact(sample_contact("2"))
+        phonebook.delete_contact("2")
+
+    with open(storage.journal_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 1
+    [loaded] = JournalStorage(TEST_FILE).get_all()
+    assert loaded.city == "Lviv"
+
+
+def test_writer_picks_up_other_instance_changes():
+    first = PhoneBook(JournalStorage(TEST_FILE))
+    second = PhoneBook(JournalStorage(TEST_FILE))
+
+    first.add_contact(sample_contact("1"))
+    second.update_contact("1", {"city": "Lviv"})
+    first.delete_contact("1")
+
+    assert second.find_by_id("1") is not None
+    second.refresh()
+    assert second.find_by_id("1") is None
+    assert JournalStorage(TEST_FILE).get_all() == []
+
+
+def test_refresh_follows_compaction_by_other_instance():
+    first_storage = JournalStorage(TEST_FILE)
+    first = PhoneBook(first_storage)
+    second = PhoneBook(JournalStorage(TEST_FILE))
+
+    first.add_contact(sample_contact("1"))
+    first.add_contact(sample_contact("2"))
+    first.delete_contact("1")
+    first_storage.compact()
+    second.refresh()
+
+    assert [c.id for c in second.contacts] == ["2"]
+
+
+def test_conflicting_transaction_is_rejected_and_rolled_back():
+    first = PhoneBook(JournalStorage(TEST_FILE))
+    first.add_contact(sample_contact("1"))
+    second = PhoneBook(JournalStorage(TEST_FILE))
+
+    with pytest.raises(ConflictError):
+        with second.transaction():
+            second.update_contact("1", {"city": "Lviv"})
+            second.add_contact(sample_contact("2"))
+            first.update_contact("1", {"city": "Odesa"})
+
+    assert second.find_by_id("1").city == "Odesa"
+    assert second.find_by_id("2") is None
+    assert [(c.id, c.city) for c in JournalStorage(TEST_FILE).get_all()] == [("1", "Odesa")]
+
+
+def test_non_conflicting_transaction_merges():
+    first = PhoneBook(JournalStorage(TEST_FILE))
+    first.add_contact(sample_contact("1"))
+    second = PhoneBook(JournalStorage(TEST_FILE))
+
+    with second.transaction():
+        second.add_contact(sample_contact("2"))
+        first.update_contact("1", {"city": "Odesa"})
+
+    assert second.find_by_id("1").city == "Odesa"
+    assert {c.id for c in JournalStorage(TEST_FILE).get_all()} == {"1", "2"}
+
+
+def _add_contacts(worker: int, count: int) -> None:
+    phonebook = PhoneBook(JournalStorage(TEST_FILE, compact_every=7))
+    for i in range(count):
+        phonebook.add_contact(sample_contact(f"{worker}-{i}"))
+
+
+def test_concurrent_processes_lose_no_writes():
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_add_contacts, args=(w, 20)) for w in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+
+    assert all(p.exitcode == 0 for p in workers)
+    assert len(JournalStorage(TEST_FILE).get_all()) == 80
+
+
+def test_write_behind_conflict_keeps_other_version_and_writes_the_rest():
+    first = PhoneBook(JournalStorage(TEST_FILE))
+    first.add_contact(sample_contact("1"))
+    second = PhoneBook(JournalStorage(TEST_FILE))
+
+    second.start_write_behind(max_dirty=100, interval=None)
+    second.update_contact("1", {"city": "Lviv"})
+    second.add_contact(sample_contact("2"))
+    first.update_contact("1", {"city": "Odesa"})
+
+    with pytest.raises(ConflictError) as error:
+        second.stop_write_behind()
+
+    assert error.value.contact_ids == ["1"]
+    assert second.find_by_id("1").city == "Odesa"
+    stored = {c.id: c.city for c in JournalStorage(TEST_FILE).get_all()}
+    assert stored == {"1": "Odesa", "2": ""}
+
+
+def test_compact_refuses_unreadable_snapshot():
+    storage = JournalStorage(TEST_FILE, compact_every=0)
+    storage.save_all([Contact("Name", f"Surname{i}", {"mobile": f"100{i}"}, contact_id=str(i)) for i in range(5)])
+    storage.insert(Contact("Lesya", "Ukrainka", {"mobile": "200"}, contact_id="j"))
+    with open(TEST_FILE, "rb+") as f:
+        f.truncate(os.path.getsize(TEST_FILE) - 20)
+    truncated = open(TEST_FILE, "rb").read()
+
+    with pytest.raises(ValueError):
+        JournalStorage(TEST_FILE).compact()
+
+    assert open(TEST_FILE, "rb").read() == truncated
+    assert os.path.exists(f"{TEST_FILE}.journal")
+
+
+def test_phones_edited_in_place_are_persisted_and_reindexed():
+    book = PhoneBook(JournalStorage(TEST_FILE))
+    book.add_contact(Contact("Lesya", "Ukrainka", {"mobile": "0671111111"}, contact_id="1"))
+
+    phones = book.find_by_id("1").phones
+    phones["mobile"] = "0502222222"
+    assert book.update_contact("1", {"phones": phones}) is True
+
+    assert book.search_by_phone("0671111111") == []
+    assert [c.id for c in book.search_by_phone("0502222222")] == ["1"]
+    reloaded = PhoneBook(JournalStorage(TEST_FILE))
+    assert reloaded.find_by_id("1").phones == {"mobile": "0502222222"}
@@ -0,0 +1,50 @@
+# tests/test_logger.py
+
+import glob
+import json
+import os
+from app.logger import logger, setup_logging, shutdown_logging
+
+TEST_FILE = "data/test_logger.log"
+
+
+def teardown_function():
+    shutdown_logging()
+    for path in glob.glob(f"{TEST_FILE}*"):
+        os.remove(path)
+
+
+def test_records_written_by_listener_on_shutdown():
+    setup_logging("INFO", log_file=TEST_FILE, console=False)
+    logger.debug("hidden")
+    logger.info("Imported %s contacts", 3)
+    shutdown_logging()
+
+    with open(TEST_FILE, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 1
+    assert lines[0].endswith("| PhoneBookApp | INFO | Imported 3 contacts")
+
+
+def test_json_format_includes_exception():
+    setup_logging("INFO", log_file=TEST_FILE, console=False, json_format=True)
+    try:
+        raise ValueError("bad row")
+    except ValueError:
+        logger.exception("Import failed")
+    shutdown_logging()
+
+    with open(TEST_FILE, encoding="utf-8") as f:
+        entry = json.loads(f.readline())
+    assert entry["level"] == "ERROR"
+    assert entry["message"] == "Import failed"
+    assert "ValueError: bad row" in entry["exception"]
+
+
+def test_file_rotated_by_size():
+    setup_logging("INFO", log_file=TEST_FILE, console=False, max_bytes=200, backup_count=2)
+    for i in range(50):
+        logger.info("message %s", i)
+    shutdown_logging()
+
+    assert sorted(glob.glob(f"{TEST_FILE}*")) == [TEST_FILE, f"{TEST_FILE}.1", f"{TEST_FILE}.2"]
@@ -0,0 +1,81 @@
+# tests/test_metrics.py
+
+import glob
+import os
+import pytest
+from app.api import PhoneBook
+from app.backup import BackupPolicy
+from app.metrics import measure, metrics, timed
+from app.models import Contact
+from app.storage import JSONStorage
+
+TEST_FILE = "data/test_metrics.json"
+
+
+def teardown_function():
+    metrics.disable()
+    metrics.reset()
+    for path in glob.glob(f"{TEST_FILE}*"):
+        os.remove(path)
+
+
+@timed("test.op")
+def operation(fail=False):
+    if fail:
+        raise ValueError("boom")
+    return 42
+
+
+def test_nothing_recorded_when_disabled():
+    assert operation() == 42
+    with measure("test.block"):
+        pass
+
+    assert metrics.snapshot()["operations"] == {}
+
+
+def test_timed_records_calls_and_errors():
+    metrics.enable()
+
+    operation()
+    with pytest.raises(ValueError):
+        operation(fail=True)
+    with measure("test.block"):
+        pass
+
+    ops = metrics.snapshot()["operations"]
+    assert ops["test.op"]["count"] == 2
+    assert ops["test.op"]["errors"] == 1
+    assert ops["test.block"]["count"] == 1
+
+
+def test_storage_and_phonebook_are_instrumented():
+    metrics.enable()
+    storage = JSONStorage(TEST_FILE, BackupPolicy(enabled=False))
+    phonebook = PhoneBook(storage)
+
+    phonebook.add_contact(Contact("Lesya", "Ukrainka", {"mobile": "12345"}))
+    phonebook.search_by_phone("123")
+    PhoneBook(storage)
+
+    data = metrics.snapshot()
+    for name in ("phonebook.load", "phonebook.commit", "json.save_all", "phonebook.search_by_phone"):
+        assert data["operations"][name]["count"] >= 1
+    size = os.path.getsize(TEST_FILE)
+    assert data["bytes"]["written"]["json"] == size
+    assert data["bytes"]["read"]["json"] == size
+
+
+def test_prometheus_text_and_summary():
+    metrics.enable()
+    operation()
+
+    text = metrics.render_prometheus()
+    assert 'phonebook_operation_seconds_bucket{operation="test.op",le="+Inf"} 1' in text
+    assert 'phonebook_operation_seconds_count{operation="test.op"} 1' in text
+    assert 'phonebook_operation_errors_total{operation="test.op"} 0' in text
+    assert metrics.summary().startswith("test.op: 1 calls, 0 errors")
+
+    metrics.write_prometheus(TEST_FILE + ".prom")
+    with open(TEST_FILE + ".prom", encoding="utf-8") as f:
+        assert f.read() == text
@@ -61,3 +61,51 @@ def test_contact_from_dict():
     assert contact.first_name == "Anna"
     assert contact.last_name == "Franko"
     assert contact.phones["mobile"] == "555"
+
+
+def test_contact_has_no_instance_dict():
+    contact = Contact("Test", "User", {"mobile": "999"})
+
+    assert not hasattr(contact, "__dict__")
+
+
+def test_contact_from_storage_skips_normalization_and_interns():
+    data = {
+        "id": "123",
+        "first_name": "McDonald",
+        "last_name": "O'neil",
+        "phones": {"mobile": "555"},
+        "city": "".join(["Ky", "iv"]),
+        "job": "QA",
+        "created_at": "2024-01-01T00:00:00",
+    }
+
+    c1 = Contact.from_storage(data)
+    c2 = Contact.from_storage(dict(data, city="".join(["Ky", "iv"])))
+
+    assert c1.to_dict() == data
+    assert c1.first_name == "McDonald"
+    assert c1.city is c2.city
+
+
+def test_contact_update_tracks_dirty_fields_and_version():
+    contact = Contact.from_storage({"id": "1", "first_name": "Lesya", "city": "Kyiv", "phones": {}})
+    assert contact.version == 0
+    assert contact.dirty_fields == frozenset()
+
+    assert contact.update({"city": "Kyiv", "id": "2", "unknown": 1}) == frozenset()
+    assert contact.version == 0
+
+    assert contact.update({"city": "Lviv", "job": "Poet"}) == {"city", "job"}
+    assert contact.update({"phones": {"mobile": "555"}}) == {"phones"}
+    assert contact.dirty_fields == {"city", "job", "phones"}
+    assert contact.version == 2
+    assert contact.id == "1"
+
+    contact.mark_clean()
+    assert contact.dirty_fields == frozenset()
+    assert contact.version == 2
+
+    contact.phones["mobile"] = "777"
+    assert contact.update({"phones": contact.phones}) == {"phones"}
+    assert contact.version == 3
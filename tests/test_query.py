@@ -0,0 +1,99 @@
+# tests/test_query.py
+
+import pytest
+from app.api import PhoneBook
+from app.models import Contact
+from app.query import Predicate, QueryError, matcher, parse_query, scan
+from tests.test_api import FakeRepository
+
+
+def make_book():
+    contacts = [
+        Contact("Lesya", "Ukrainka", {"mobile": "+380671234567"}, "Kyiv", "Poet", contact_id="1"),
+        Contact("Ivan", "Franko", {"mobile": "+380501112233"}, "Lviv", "Writer", contact_id="2"),
+        Contact("Olena", "Pchilka", {"home": "0441234567"}, "Kyiv", "Software Engineer", contact_id="3"),
+        Contact("Taras", "Shevchenko", {"mobile": "+380679998877"}, "Kyiv", "Data Engineer", contact_id="4"),
+        Contact("Marko", "Vovchok", {"mobile": "+380631112233"}, "Kharkiv", "Engineer", contact_id="5"),
+    ]
+    return PhoneBook(FakeRepository(contacts))
+
+
+def ids(contacts):
+    return sorted(c.id for c in contacts)
+
+
+def test_parse_query():
+    assert parse_query("city=Kyiv and job~Engineer AND phone^+380 67") == [
+        Predicate("city", "=", "kyiv"),
+        Predicate("job", "~", "engineer"),
+        Predicate("phone", "^", "38067"),
+    ]
+    assert parse_query('city="Ivano AND Frankivsk"') == [
+        Predicate("city", "=", "ivano and frankivsk")
+    ]
+
+
+@pytest.mark.parametrize("text", ["", "city", "age=3", "city=", "phone=abc"])
+def test_parse_query_rejects_invalid(text):
+    with pytest.raises(QueryError):
+        parse_query(text)
+
+
+def test_matcher_checks_every_predicate():
+    contact = Contact("Olena", "Pchilka", {"home": "0441234567"}, "Kyiv", "Software Engineer", contact_id="3")
+
+    assert matcher([])(contact)
+    assert matcher(parse_query("city=kyiv AND job~engineer AND phone^044 AND id=3"))(contact)
+    assert not matcher(parse_query("city=kyiv AND job^engineer"))(contact)
+    assert Predicate("last_name", "^", "pch").matches(contact)
+    with pytest.raises(QueryError):
+        matcher([Predicate("age", "=", "3")])
+
+
+def test_query_intersects_indexed_and_checks_the_rest():
+    book = make_book()
+
+    assert ids(book.query("city=kyiv AND job~engineer")) == ["3", "4"]
+    assert ids(book.query("city=Kyiv AND phone^38067")) == ["1", "4"]
+    assert ids(book.query("phone~1122 AND first_name^i")) == ["2"]
+    assert ids(book.query("id=5 AND job=engineer")) == ["5"]
+    assert ids(book.query("city=Odesa AND job~engineer")) == []
+
+
+def test_query_without_index_scans_in_insertion_order():
+    book = make_book()
+
+    assert [c.id for c in book.query("job~engineer")] == ["3", "4", "5"]
+
+
+def test_query_sorts_and_limits():
+    book = make_book()
+
+    result = book.query("job~engineer", sort_by="last_name", reverse=True, limit=2)
+
+    assert [c.last_name for c in result] == ["Vovchok", "Shevchenko"]
+    assert len(list(book.query("city=kyiv", limit=2))) == 2
+    with pytest.raises(ValueError):
+        book.query("city=kyiv", sort_by="phones")
+
+
+def test_query_sees_updates():
+    book = make_book()
+    book.update_contact("2", {"city": "Kyiv", "phones": {"mobile": "+380670000000"}})
+
+    assert ids(book.query("city=kyiv AND phone^38067")) == ["1", "2", "4"]
+
+
+def test_scan_in_process_pool_keeps_order():
+    contacts = [
+        Contact("Name", f"Last{i}", {"mobile": f"+38067{i:07d}"}, "Kyiv", "Engineer" if i % 3 else "Poet",
+                contact_id=str(i))
+        for i in range(50)
+    ]
+    predicates = parse_query("job~engineer")
+
+    expected = [c.id for c in scan(contacts, predicates)]
+    parallel = [c.id for c in scan(contacts, predicates, workers=2, chunk_size=7)]
+
+    assert parallel == expected
+    assert len(expected) == 33
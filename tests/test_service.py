@@ -0,0 +1,144 @@
+# tests/test_service.py
+
+import asyncio
+import json
+from app.api import PhoneBook
+from app.models import Contact
+from app.repository import ContactRepository
+from app.service import PhoneBookService
+
+
+class CountingRepository(ContactRepository):
+    """In-memory repository that counts full rewrites."""
+
+    def __init__(self):
+        self.saved = []
+        self.saves = 0
+
+    def get_all(self):
+        return list(self.saved)
+
+    def save_all(self, contacts):
+        self.saves += 1
+        self.saved = list(contacts)
+
+
+async def request(reader, writer, op, **args):
+    writer.write(json.dumps({"id": 1, "op": op, "args": args}).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+def run_service(scenario):
+    repo = CountingRepository()
+
+    async def main():
+        service = PhoneBookService(PhoneBook(repo))
+        server = await service.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await scenario(port)
+        finally:
+            await service.close()
+
+    return repo, asyncio.run(main())
+
+
+def test_crud_over_tcp():
+    async def scenario(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        contact = Contact("Lesya", "Ukrainka", {"mobile": "380501234"}, contact_id="1").to_dict()
+        results = [
+            await request(reader, writer, "add", contact=contact),
+            await request(reader, writer, "update", id="1", updates={"city": "Lviv"}),
+            await request(reader, writer, "search_by_phone", query="0501"),
+            await request(reader, writer, "bogus"),
+        ]
+        writer.close()
+        return results
+
+    repo, (added, updated, found, bogus) = run_service(scenario)
+
+    assert added["ok"] and added["result"] is True
+    assert updated["result"] is True
+    assert [c["city"] for c in found["result"]] == ["Lviv"]
+    assert bogus["ok"] is False
+    assert [c.city for c in repo.saved] == ["Lviv"]
+
+
+def test_concurrent_writes_share_commits():
+    async def client(port, i):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        contact = Contact("Name", "Surname", {"mobile": f"1000{i}"}, contact_id=str(i)).to_dict()
+        response = await request(reader, writer, "add", contact=contact)
+        writer.close()
+        return response["result"]
+
+    async def scenario(port):
+        return await asyncio.gather(*(client(port, i) for i in range(50)))
+
+    repo, results = run_service(scenario)
+
+    assert all(results)
+    assert len(repo.saved) == 50
+    assert repo.saves < 50
+
+
+def test_reads_run_concurrently_with_writes():
+    async def writer_client(port, n):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for i in range(100):
+            contact = Contact("Name", f"Surname{i}", {"mobile": f"5{n}{i:05d}"}).to_dict()
+            await request(reader, writer, "add", contact=contact)
+        writer.close()
+
+    async def reader_client(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        responses = []
+        for _ in range(100):
+            responses.append(await request(reader, writer, "list", limit=50))
+            responses.append(await request(reader, writer, "search_by_phone", query="5099"))
+        writer.close()
+        return responses
+
+    async def scenario(port):
+        results = await asyncio.gather(
+            *(writer_client(port, n) for n in range(4)), *(reader_client(port) for _ in range(4))
+        )
+        return [response for responses in results[4:] for response in responses]
+
+    repo, responses = run_service(scenario)
+
+    assert all(response["ok"] for response in responses)
+    assert len(repo.saved) == 400
+
+
+def test_unexpected_error_keeps_connection():
+    async def scenario(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        failed = await request(reader, writer, "list", sort_by=["not", "hashable"])
+        listed = await request(reader, writer, "list")
+        writer.close()
+        return failed, listed
+
+    _, (failed, listed) = run_service(scenario)
+
+    assert failed["ok"] is False
+    assert listed["ok"] is True
+
+
+def test_invalid_update_leaves_contact_untouched():
+    async def scenario(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        contact = Contact("Lesya", "Ukrainka", {"mobile": "380501234"}, "Kyiv", contact_id="1").to_dict()
+        await request(reader, writer, "add", contact=contact)
+        failed = await request(reader, writer, "update", id="1", updates={"phones": "555555", "city": "Lviv"})
+        found = await request(reader, writer, "search_by_phone", query="0501")
+        writer.close()
+        return failed, found
+
+    repo, (failed, found) = run_service(scenario)
+
+    assert failed["ok"] is False
+    assert [(c["city"], c["phones"]) for c in found["result"]] == [("Kyiv", {"mobile": "380501234"})]
+    assert [c.city for c in repo.saved] == ["Kyiv"]
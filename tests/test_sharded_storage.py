@@ -0,0 +1,140 @@
+# tests/test_sharded_storage.py
+
+import json
+import os
+import shutil
+import pytest
+from app.api import PhoneBook
+from app.models import Contact
+from app.sharded_storage import ShardedStorage
+
+TEST_DIR = "data/test_shards"
+
+
+def teardown_function():
+    shutil.rmtree(TEST_DIR, ignore_errors=True)
+
+
+def sample_contacts(count=20):
+    last_names = ["Ukrainka", "Franko", "Shevchenko", "Kostenko"]
+    return [
+        Contact("Lesya", last_names[i % 4], {"mobile": f"+38067{i:07d}"},
+                city="Kyiv" if i % 2 else "Lviv", contact_id=str(i))
+        for i in range(count)
+    ]
+
+
+def inodes():
+    return {
+        name: os.stat(os.path.join(TEST_DIR, name)).st_ino
+        for name in os.listdir(TEST_DIR) if name.startswith("shard-") and name.endswith(".json")
+    }
+
+
+def test_save_all_and_get_all_contacts():
+    storage = ShardedStorage(TEST_DIR, shards=4)
+    contacts = sample_contacts()
+
+    storage.save_all(contacts)
+    loaded = ShardedStorage(TEST_DIR, shards=4).get_all()
+
+    assert sorted(c.to_dict()["id"] for c in loaded) == sorted(c.id for c in contacts)
+    assert len([n for n in os.listdir(TEST_DIR) if n.endswith(".json")]) == 5
+
+
+def test_save_all_rewrites_only_changed_shards():
+    storage = ShardedStorage(TEST_DIR, shards=4)
+    contacts = sample_contacts()
+    storage.save_all(contacts)
+    before = inodes()
+
+    contacts[3].city = "Odesa"
+    storage.save_all(contacts)
+    after = inodes()
+
+    changed = [name for name in before if before[name] != after[name]]
+    assert changed == [f"shard-{storage.shard_of(contacts[3]):03d}.json"]
+
+
+def test_incremental_changes_and_moves_between_shards():
+    storage = ShardedStorage(TEST_DIR, shards=4, partition="initial")
+    contact = sample_contacts(1)[0]
+    storage.insert(contact)
+
+    contact.last_name = "Franko"
+    storage.update(contact)
+
+    reopened = ShardedStorage(TEST_DIR, shards=4, partition="initial")
+    assert [c.last_name for c in reopened.get_all()] == ["Franko"]
+    assert reopened.get_by_id("0").last_name == "Franko"
+
+    reopened.delete("0")
+    assert ShardedStorage(TEST_DIR, shards=4, partition="initial").get_all() == []
+
+
+def test_loaded_contacts_are_detached_from_storage():
+    storage = ShardedStorage(TEST_DIR, shards=2)
+    storage.save_all(sample_contacts(2))
+
+    storage.get_by_id("1").city = "Changed"
+
+    assert storage.get_by_id("1").city == "Kyiv"
+
+
+def test_searches_fan_out_and_prune():
+    ShardedStorage(TEST_DIR, shards=4, partition="initial").save_all(sample_contacts())
+    storage = ShardedStorage(TEST_DIR, shards=4, partition="initial")
+
+    assert sorted(c.id for c in storage.find_by_lastname("franko")) == ["1", "13", "17", "5", "9"]
+    assert sum(known is not None for known in storage._fingerprints) == 1
+
+    assert len(storage.find_by_city("Kyiv")) == 10
+    assert [c.id for c in storage.find_by_phone("+380670000012")] == ["12"]
+    assert sorted(c.id for c in storage.query("city=kyiv AND last_name^kos")) == [
+        "11", "15", "19", "3", "7"
+    ]
+
+
+def test_corrupt_shard_is_never_rewritten():
+    storage = ShardedStorage(TEST_DIR, shards=2)
+    storage.save_all(sample_contacts(10))
+    shard = storage.shards[0].filepath
+    with open(shard, "rb+") as f:
+        f.truncate(os.path.getsize(shard) // 2)
+    truncated = open(shard, "rb").read()
+    newcomer = next(
+        Contact("Ivan", "Franko", {"mobile": "0501112233"}, contact_id=str(i))
+        for i in range(100, 200) if storage.shard_of(Contact("I", "F", {}, contact_id=str(i))) == 0
+    )
+
+    reopened = ShardedStorage(TEST_DIR, shards=2)
+    with pytest.raises(json.JSONDecodeError):
+        PhoneBook(reopened)
+    with pytest.raises(json.JSONDecodeError):
+        reopened.insert(newcomer)
+    assert reopened.get_all() == []
+
+    assert open(shard, "rb").read() == truncated
+
+
+def test_manifest_mismatch_is_rejected():
+    ShardedStorage(TEST_DIR, shards=4)
+
+    with pytest.raises(ValueError):
+        ShardedStorage(TEST_DIR, shards=8)
+    with pytest.raises(ValueError):
+        ShardedStorage(TEST_DIR, shards=4, partition="initial")
+
+
+def test_phonebook_on_sharded_storage():
+    book = PhoneBook(ShardedStorage(TEST_DIR, shards=4))
+    with book.transaction():
+        for contact in sample_contacts(8):
+            book.add_contact(contact)
+    book.update_contact("2", {"city": "Odesa"})
+    book.delete_contact("3")
+
+    reloaded = PhoneBook(ShardedStorage(TEST_DIR, shards=4))
+
+    assert len(reloaded) == 7
+    assert reloaded.find_by_id("2").city == "Odesa"
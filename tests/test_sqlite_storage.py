@@ -0,0 +1,160 @@
+# tests/test_sqlite_storage.py
+
+import sqlite3
+import threading
+import time
+from app.api import PhoneBook
+from app.models import Contact
+from app.sqlite_storage import SQLiteStorage
+
+
+def sample_contact(contact_id="1", last_name="Ukrainka", phone="12345", city="Kyiv"):
+    return Contact("Lesya", last_name, {"mobile": phone}, city=city, contact_id=contact_id)
+
+
+def test_save_all_and_get_all_contacts():
+    storage = SQLiteStorage(":memory:")
+    storage.save_all([sample_contact("1"), sample_contact("2")])
+
+    loaded = storage.get_all()
+
+    assert [c.id for c in loaded] == ["1", "2"]
+    assert loaded[0].phones == {"mobile": "12345"}
+
+
+def test_incremental_crud():
+    storage = SQLiteStorage(":memory:")
+    contact = sample_contact("1")
+
+    storage.insert(contact)
+    contact.city = "Lviv"
+    contact.phones = {"work": "777"}
+    storage.update(contact)
+
+    loaded = storage.get_by_id("1")
+    assert loaded.city == "Lviv"
+    assert loaded.phones == {"work": "777"}
+
+    storage.delete("1")
+    assert storage.get_by_id("1") is None
+    assert storage.find_by_phone("777") == []
+
+
+def test_indexed_queries():
+    storage = SQLiteStorage(":memory:")
+    storage.insert(sample_contact("1", "Shevchenko", "380501", "Kyiv"))
+    storage.insert(sample_contact("2", "Franko", "380671", "Lviv"))
+
+    assert [c.id for c in storage.find_by_lastname("shevchenko")] == ["1"]
+    assert [c.id for c in storage.find_by_city("LVIV")] == ["2"]
+    assert [c.id for c in storage.find_by_phone("38067")] == ["2"]
+    assert [c.id for c in storage.find_by_phone("380")] == ["1", "2"]
+
+
+def test_phonebook_uses_incremental_operations():
+    storage = SQLiteStorage(":memory:")
+    phonebook = PhoneBook(storage)
+
+    phonebook.add_contact(sample_contact("1"))
+    phonebook.update_contact("1", {"city": "Odesa"})
+    phonebook.add_contact(sample_contact("2"))
+    phonebook.delete_contact("2")
+
+    assert [(c.id, c.city) for c in storage.get_all()] == [("1", "Odesa")]
+
+
+def test_iter_all_groups_phones_per_contact():
+    storage = SQLiteStorage(":memory:")
+    storage.insert(Contact("Lesya", "Ukrainka", {"mobile": "1", "home": "2"}, contact_id="1"))
+    storage.insert(Contact("Ivan", "Franko", {}, contact_id="2"))
+
+    contacts = list(storage.iter_all())
+
+    assert [(c.id, c.phones) for c in contacts] == [
+        ("1", {"mobile": "1", "home": "2"}),
+        ("2", {}),
+    ]
+
+
+def test_update_writes_only_dirty_tables():
+    storage = SQLiteStorage(":memory:")
+    contact = sample_contact("1")
+    storage.insert(contact)
+
+    contact.update({"city": "Lviv"})
+    before = storage._conn.total_changes
+    storage.update(contact)
+
+    assert storage._conn.total_changes - before == 1
+    assert storage.get_by_id("1").city == "Lviv"
+    assert storage.get_by_id("1").phones == {"mobile": "12345"}
+
+
+def test_storage_is_usable_from_other_threads(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "book.db"))
+    storage.insert(sample_contact("1"))
+    errors = []
+
+    def worker(contact_id):
+        try:
+            storage.insert(sample_contact(contact_id))
+            storage.get_by_id(contact_id)
+            list(storage.iter_all())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(str(i),)) for i in range(2, 6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(c.id for c in storage.get_all()) == ["1", "2", "3", "4", "5"]
+
+
+def test_write_behind_timer_flushes_to_sqlite(tmp_path):
+    path = str(tmp_path / "book.db")
+    book = PhoneBook(SQLiteStorage(path))
+    book.start_write_behind(max_dirty=0, interval=0.05)
+    book.add_contact(sample_contact("1"))
+
+    deadline = time.monotonic() + 5
+    while not SQLiteStorage(path).get_all() and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    assert [c.id for c in SQLiteStorage(path).get_all()] == ["1"]
+    book.stop_write_behind()
+
+
+def test_lookups_fold_cyrillic_case_and_phone_formatting():
+    storage = SQLiteStorage(":memory:")
+    storage.insert(Contact("Іван", "Франко", {"mobile": "+38 050 12345"}, city="Львів", contact_id="1"))
+
+    assert [c.id for c in storage.find_by_lastname("франко")] == ["1"]
+    assert [c.id for c in storage.find_by_city(" ЛЬВІВ ")] == ["1"]
+    assert [c.id for c in storage.find_by_phone("38050")] == ["1"]
+    assert [c.id for c in storage.find_by_phone("+38 (050) 1")] == ["1"]
+    assert storage.get_by_id("1").phones == {"mobile": "+38 050 12345"}
+
+
+def test_database_without_lookup_columns_is_upgraded(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE contacts (id TEXT PRIMARY KEY, first_name TEXT NOT NULL,
+            last_name TEXT NOT NULL, city TEXT NOT NULL DEFAULT '', job TEXT NOT NULL DEFAULT '',
+            created_at TEXT NOT NULL);
+        CREATE TABLE phones (contact_id TEXT NOT NULL, label TEXT NOT NULL, number TEXT NOT NULL,
+            PRIMARY KEY (contact_id, label));
+        INSERT INTO contacts VALUES ('1', 'Леся', 'Українка', 'Київ', '', '2024-01-01');
+        INSERT INTO phones VALUES ('1', 'mobile', '+38 067 1234567');
+    """)
+    conn.commit()
+    conn.close()
+
+    storage = SQLiteStorage(path)
+
+    assert [c.id for c in storage.find_by_lastname("українка")] == ["1"]
+    assert [c.id for c in storage.find_by_city("київ")] == ["1"]
+    assert [c.id for c in storage.find_by_phone("38067")] == ["1"]
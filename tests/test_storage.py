@@ -1,15 +1,20 @@
 # tests/test_storage.py
 
+import glob
+import io
+import json
 import os
-from app.storage import JSONStorage
+import pytest
+from app.snapshot import snapshot_path
+from app.storage import NEW_FILE_MODE, JSONStorage, iter_json_array
 from app.models import Contact
 
 TEST_FILE = "data/test_phonebook.json"
 
 
 def teardown_function():
-    if os.path.exists(TEST_FILE):
-        os.remove(TEST_FILE)
+    for path in glob.glob(f"{TEST_FILE}*"):
+        os.remove(path)
 
 
 def test_get_all_file_not_exists():
@@ -57,3 +62,98 @@ def test_get_all_invalid_json():
     result = storage.get_all()
 
     assert result == []
+
+
+def test_iter_all_streams_contacts_lazily():
+    storage = JSONStorage(TEST_FILE)
+    storage.save_all([Contact("Lesya", "Ukrainka", {}, contact_id=str(i)) for i in range(3)])
+
+    contacts = storage.iter_all()
+
+    assert next(contacts).id == "0"
+    assert [c.id for c in contacts] == ["1", "2"]
+
+
+def test_iter_json_array_across_chunk_boundaries():
+    data = [{"id": str(i), "name": "Леся"} for i in range(20)] + [12345, "x", None]
+    text = json.dumps(data, ensure_ascii=False, indent=2)
+
+    assert list(iter_json_array(io.StringIO(text), chunk_size=7)) == data
+
+
+@pytest.mark.parametrize("text", ["{}", "[1, 2", "[1 2]", "[1,]", ""])
+def test_iter_json_array_rejects_invalid_documents(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO(text), chunk_size=2))
+
+
+def test_save_all_is_atomic_when_serialization_fails():
+    storage = JSONStorage(TEST_FILE)
+    storage.save_all([Contact("Lesya", "Ukrainka", {}, contact_id="1")])
+
+    broken = Contact("Ivan", "Franko", {"mobile": object()}, contact_id="2")
+    with pytest.raises(TypeError):
+        storage.save_all([broken])
+
+    assert [c.id for c in storage.get_all()] == ["1"]
+    leftovers = [n for n in os.listdir("data") if n.endswith(".tmp")]
+    assert leftovers == []
+
+
+@pytest.mark.parametrize("durability", ["none", "fsync", "full"])
+def test_durability_levels_persist(durability):
+    storage = JSONStorage(TEST_FILE, durability=durability)
+    storage.save_all([Contact("Lesya", "Ukrainka", {}, contact_id="1")])
+
+    assert [c.id for c in JSONStorage(TEST_FILE).get_all()] == ["1"]
+
+
+def test_unknown_durability_rejected():
+    with pytest.raises(ValueError):
+        JSONStorage(TEST_FILE, durability="sometimes")
+
+
+def test_snapshot_cache_written_on_save_and_used_on_load():
+    storage = JSONStorage(TEST_FILE, snapshot_cache=True)
+    storage.save_all([Contact("Lesya", "Ukrainka", {"mobile": "12345"}, contact_id="1")])
+    assert os.path.exists(snapshot_path(TEST_FILE))
+
+    # Make the JSON unreadable without changing its identity: only the cache can serve it.
+    stat = os.stat(TEST_FILE)
+    with open(TEST_FILE, "r+", encoding="utf-8") as f:
+        f.write("X")
+    os.utime(TEST_FILE, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    contacts = JSONStorage(TEST_FILE, snapshot_cache=True).get_all()
+    assert [(c.id, c.phones) for c in contacts] == [("1", {"mobile": "12345"})]
+
+
+def test_snapshot_cache_ignored_when_json_changes():
+    JSONStorage(TEST_FILE, snapshot_cache=True).save_all([Contact("Lesya", "Ukrainka", {}, contact_id="1")])
+    JSONStorage(TEST_FILE).save_all([Contact("Ivan", "Franko", {}, contact_id="2")])
+
+    storage = JSONStorage(TEST_FILE, snapshot_cache=True)
+    assert [c.id for c in storage.get_all()] == ["2"]
+    # The miss refreshed the cache.
+    assert [c.id for c in storage.get_all()] == ["2"]
+
+
+def test_corrupt_snapshot_cache_falls_back_to_json():
+    JSONStorage(TEST_FILE, snapshot_cache=True).save_all([Contact("Lesya", "Ukrainka", {}, contact_id="1")])
+    with open(snapshot_path(TEST_FILE), "wb") as f:
+        f.write(b"garbage")
+
+    assert [c.id for c in JSONStorage(TEST_FILE, snapshot_cache=True).get_all()] == ["1"]
+
+
+def test_new_file_gets_default_mode_and_existing_mode_is_kept():
+    storage = JSONStorage(TEST_FILE)
+    umask = os.umask(0)
+    os.umask(umask)
+
+    storage.save_all([])
+    assert os.stat(TEST_FILE).st_mode & 0o777 == NEW_FILE_MODE == 0o666 & ~umask
+
+    os.chmod(TEST_FILE, 0o640)
+    storage.save_all([])
+    assert os.stat(TEST_FILE).st_mode & 0o777 == 0o640
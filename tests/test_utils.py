@@ -5,7 +5,11 @@ from app.utils import (
     normalize_text,
     fuzzy_match,
     format_contact,
+    iter_formatted,
+    export_to_csv,
+    iter_csv,
 )
+from app.models import Contact
 
 
 def test_is_valid_phone():
@@ -39,3 +43,33 @@ def test_format_contact_returns_string():
     assert isinstance(result, str)
     assert "Lesya Ukrainka" in result
     assert "12345" in result
+
+
+def test_iter_formatted_selected_fields():
+    contact = Contact("Lesya", "Ukrainka", {"mobile": "12345"}, city="Kyiv", contact_id="1")
+
+    blocks = list(iter_formatted([contact], ["last_name", "phones"]))
+
+    assert blocks == ["Прізвище: Ukrainka\nТелефони: mobile: 12345\n\n"]
+
+
+def test_csv_roundtrip_streams_rows(tmp_path):
+    path = str(tmp_path / "contacts.csv")
+    export_to_csv(
+        (c for c in [{"id": "1", "first_name": "Lesya", "phones": {"mobile": "12345", "home": "777"}}]),
+        path,
+    )
+
+    rows = iter_csv(path)
+
+    assert next(rows)["phones"] == {"mobile": "12345", "home": "777"}
+    assert next(rows, None) is None
+
+
+def test_iter_csv_fills_short_rows_with_empty_strings(tmp_path):
+    path = tmp_path / "short.csv"
+    path.write_text("id,first_name,last_name,phones,city\n,Ivan\n", encoding="utf-8")
+
+    row = next(iter_csv(str(path)))
+
+    assert row["last_name"] == "" and row["city"] == "" and row["phones"] == {}